@@ -0,0 +1,157 @@
+"""Benchmark the REST API against its latency targets at 100k streams.
+
+Requests go through the ASGI app (routing, JSON encoding, sync with the
+section directory) without a network. Exits with status 1 if a p99 latency
+misses its target in src.core.rest_api.LATENCY_TARGETS.
+
+Usage:
+    python -m benchmarks.bench_api [--streams 100000] [--requests 300]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI
+
+from src.core.rest_api import LATENCY_TARGETS, ConfigApi, register_api_routes
+from src.core.watcher import JsonDirWatcher
+from src.mtx_manager import MtxConfigManager
+
+
+def make_paths(count: int) -> dict:
+    paths = {}
+    for i in range(count):
+        host = f"10.{i // 62500}.{i // 250 % 250}.{i % 250}"
+        if i % 5 == 0:
+            paths[f"site{i % 100:02d}/cam{i:06d}"] = {
+                "runOnDemand": f"ffmpeg -i rtsp://{host}/live -c:v libx264 -f rtsp "
+                "rtsp://localhost:8554/$MTX_PATH"
+            }
+        else:
+            paths[f"site{i % 100:02d}/cam{i:06d}"] = {
+                "source": f"rtsp://{host}/ch1",
+                "sourceOnDemand": True,
+            }
+    return paths
+
+
+def p99(samples: list[float]) -> float:
+    return sorted(samples)[int(len(samples) * 0.99) - 1]
+
+
+async def measure(requests: int, call) -> list[float]:
+    samples = []
+    for i in range(requests):
+        start = time.perf_counter()
+        await call(i)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def run(args: argparse.Namespace, json_dir: Path) -> dict:
+    manager = MtxConfigManager(json_dir=json_dir, render_yaml=False)
+    # Journal compaction writes the sections like a save; both are excluded
+    manager.journal_compact_every = 0
+    start = time.perf_counter()
+    manager.load_data()
+    api = ConfigApi(manager, JsonDirWatcher(manager))
+    print(f"loaded and indexed in {time.perf_counter() - start:.1f} s")
+    app = FastAPI()
+    register_api_routes(app, api)
+    names = sorted(manager.data["paths.json"])
+    rng = random.Random(1)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+
+        async def listing(i: int) -> None:
+            params = [
+                {},
+                {"type": "runOnDemand"},
+                {"prefix": f"site{i % 100:02d}/"},
+                {"host": f"10.0.{i % 250}.{i % 7}", "type": "source"},
+                {"cursor": None},
+            ][i % 5]
+            if "cursor" in params:
+                params = {"cursor": cursor}
+            response = await client.get("/api/streams", params=params)
+            assert response.status_code == 200, response.text
+
+        first = (await client.get("/api/streams")).json()
+        cursor = first["next_cursor"]
+        etag = (await client.get(f"/api/streams/{names[0]}")).headers["etag"]
+
+        async def not_modified(i: int) -> None:
+            response = await client.get(
+                f"/api/streams/{names[0]}", headers={"If-None-Match": etag}
+            )
+            assert response.status_code == 304
+
+        async def get_stream(i: int) -> None:
+            response = await client.get(f"/api/streams/{rng.choice(names)}")
+            assert response.status_code == 200
+
+        async def put_stream(i: int) -> None:
+            response = await client.put(
+                f"/api/streams/{rng.choice(names)}",
+                json={"source": f"rtsp://172.16.0.{i % 250}/ch1"},
+            )
+            assert response.status_code == 200, response.text
+
+        async def batch(i: int) -> None:
+            body = {
+                f"batch{i}/cam{j:04d}": {"source": f"rtsp://192.168.{i}.{j % 250}/x"}
+                for j in range(1000)
+            }
+            response = await client.patch("/api/streams", json=body)
+            assert response.status_code == 200, response.text
+
+        return {
+            "list": await measure(args.requests, listing),
+            "not_modified": await measure(args.requests, not_modified),
+            "get_stream": await measure(args.requests, get_stream),
+            "put_stream": await measure(args.requests, put_stream),
+            "batch_1000": await measure(max(args.requests // 20, 5), batch),
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--streams", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+    for name in ("httpx", "src.core.log"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_dir = Path(tmp) / "json"
+        json_dir.mkdir()
+        (json_dir / "paths.json").write_text(json.dumps(make_paths(args.streams)))
+        (json_dir / "values_app.json").write_text(json.dumps({"logLevel": "info"}))
+        results = asyncio.run(run(args, json_dir))
+
+    print(f"streams: {args.streams}")
+    failed = False
+    for name, samples in results.items():
+        target = LATENCY_TARGETS[name]
+        worst = p99(samples)
+        ok = worst <= target
+        failed |= not ok
+        print(
+            f"{name:>13}: p50 {sorted(samples)[len(samples) // 2] * 1000:6.2f} ms, "
+            f"p99 {worst * 1000:6.2f} ms (target {target * 1000:.0f} ms) "
+            f"{'ok' if ok else 'MISSED'}"
+        )
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
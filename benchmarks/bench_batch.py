@@ -0,0 +1,59 @@
+"""Benchmark importing streams one by one vs in a manager.batch().
+
+The observer re-reads the whole paths.json on every notification, like a
+tab rebuilding its rows, so per-edit notification is O(n^2) overall.
+
+Usage:
+    python -m benchmarks.bench_batch [--streams 5000]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from src.mtx_manager import MtxConfigManager
+
+
+def make_manager(json_dir: Path) -> MtxConfigManager:
+    manager = MtxConfigManager(json_dir=json_dir)
+    manager.journal = None
+    manager.history = None
+    manager.data = {"paths.json": {}}
+
+    def rebuild_rows(key, value):
+        if key == "paths.json":
+            sorted(value)
+
+    manager.register_observer(rebuild_rows)
+    return manager
+
+
+def timed_import(manager: MtxConfigManager, count: int, batch: bool) -> float:
+    start = time.perf_counter()
+    if batch:
+        with manager.batch():
+            for i in range(count):
+                manager.add_stream(f"cam{i:06d}", "Source")
+    else:
+        for i in range(count):
+            manager.add_stream(f"cam{i:06d}", "Source")
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--streams", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        single = timed_import(make_manager(Path(tmp)), args.streams, batch=False)
+        batched = timed_import(make_manager(Path(tmp)), args.streams, batch=True)
+
+    print(f"streams: {args.streams}")
+    print(f"one by one: {single * 1000:.0f} ms")
+    print(f"batch:      {batched * 1000:.0f} ms ({single / batched:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Benchmark the structural diff on a large paths.json.
+
+Usage:
+    python -m benchmarks.bench_diff [--streams 100000] [--edits 100]
+"""
+
+import argparse
+import copy
+import random
+import time
+
+from benchmarks.bench_startup import make_paths
+from src.utils.diff_utils import diff_data, summarize
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--streams", type=int, default=100_000)
+    parser.add_argument("--edits", type=int, default=100)
+    args = parser.parse_args()
+
+    old = {"paths.json": make_paths(args.streams)}
+    new = copy.deepcopy(old)
+    rng = random.Random(0)
+    for name in rng.sample(list(new["paths.json"]), args.edits):
+        new["paths.json"][name]["source"] = "rtsp://edited/live"
+    del new["paths.json"][next(iter(new["paths.json"]))]
+    new["paths.json"]["added"] = {"source": "publisher"}
+
+    start = time.perf_counter()
+    changes = diff_data(old, new)
+    elapsed = time.perf_counter() - start
+
+    print(f"streams: {args.streams}, changes: {len(changes)}")
+    print(f"summary: {summarize(changes)}")
+    print(f"diff:    {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
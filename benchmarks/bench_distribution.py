@@ -0,0 +1,70 @@
+"""Benchmark config polling: conditional GETs of unchanged instance configs.
+
+Usage:
+    python -m benchmarks.bench_distribution [--instances 50] [--polls 20000]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.core.distribution import ConfigStore, config_response, register_config_routes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--instances", type=int, default=50)
+    parser.add_argument("--paths", type=int, default=2000)
+    parser.add_argument("--polls", type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        body = "paths:\n" + "".join(
+            f"  cam{i}:\n    source: rtsp://10.0.{i // 250}.{i % 250}/live\n"
+            for i in range(args.paths)
+        )
+        for n in range(args.instances):
+            (root / f"edge{n}.yml").write_text(f"# edge{n}\n{body}")
+        names = [f"edge{n}" for n in range(args.instances)]
+        store = ConfigStore(lambda name: root / f"{name}.yml", lambda: names)
+
+        start = time.perf_counter()
+        etags = {name: store.get(name).gzip_etag for name in names}
+        first = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for i in range(args.polls):
+            name = names[i % len(names)]
+            response = config_response(
+                store.get(name),
+                {"if-none-match": etags[name], "accept-encoding": "gzip"},
+            )
+            assert response.status_code == 304
+        handler = time.perf_counter() - start
+
+        app = FastAPI()
+        register_config_routes(app, store)
+        client = TestClient(app)
+        http_polls = args.polls // 10
+        start = time.perf_counter()
+        for i in range(http_polls):
+            name = names[i % len(names)]
+            client.get(f"/configs/{name}.yml", headers={"If-None-Match": etags[name]})
+        http = time.perf_counter() - start
+
+    print(f"instances: {args.instances}, config size {len(body) / 1024:.0f} KiB")
+    print(f"first load (read, hash, gzip): {first / args.instances * 1000:.2f} ms")
+    print(
+        f"304 in handler: {handler / args.polls * 1e6:.1f} us "
+        f"({args.polls / handler:.0f}/s), file reads {store.loads}"
+    )
+    print(f"304 over HTTP (test client): {http / http_polls * 1e6:.0f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark storage and latency of the configuration history.
+
+Each revision edits a few random paths of a large paths.json, then the
+pack size is compared with one uncompressed copy of the configuration.
+
+Usage:
+    python -m benchmarks.bench_history [--streams 100000] [--revisions 1000]
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.bench_startup import make_paths
+from src.core.history import ConfigHistory
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--streams", type=int, default=100_000)
+    parser.add_argument("--revisions", type=int, default=1000)
+    parser.add_argument(
+        "--edits", type=int, default=3, help="paths edited per revision"
+    )
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    data = {"paths.json": make_paths(args.streams), "paths.json_enabled": True}
+    names = list(data["paths.json"])
+    copy_size = len(json.dumps(data["paths.json"], indent=2).encode())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        history = ConfigHistory(Path(tmp))
+        start = time.perf_counter()
+        history.commit(data)
+        first = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for rev in range(args.revisions - 1):
+            for name in rng.sample(names, args.edits):
+                data["paths.json"][name]["source"] = f"rtsp://edited/{rev}"
+            history.commit(data)
+        commits = time.perf_counter() - start
+
+        revisions = history.revisions()
+        start = time.perf_counter()
+        history.diff_paths(revisions[-2]["rev"], revisions[-1]["rev"])
+        diff = time.perf_counter() - start
+        start = time.perf_counter()
+        history.checkout(revisions[0]["rev"])
+        checkout = time.perf_counter() - start
+
+        size = history.objects.size
+        print(f"streams:       {args.streams}, revisions: {len(revisions)}")
+        print(f"one copy:      {copy_size / 1e6:.1f} MB")
+        print(f"history size:  {size / 1e6:.1f} MB ({size / copy_size:.2f}x one copy)")
+        print(f"first commit:  {first * 1000:.0f} ms")
+        print(
+            f"next commits:  {commits / max(args.revisions - 1, 1) * 1000:.1f} ms avg"
+        )
+        print(f"diff latest:   {diff * 1000:.1f} ms")
+        print(f"checkout rev1: {checkout * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
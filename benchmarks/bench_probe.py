@@ -0,0 +1,49 @@
+"""Benchmark source probing throughput against a local RTSP stub.
+
+Sources are spread over loopback hosts 127.0.0.1..N so the per-host limit
+applies as with real cameras; delay simulates the camera's response time.
+
+Usage:
+    python -m benchmarks.bench_probe [--sources 3000] [--hosts 100] [--delay 0.02]
+"""
+
+import argparse
+import asyncio
+
+from src.clients.source_probe import SourceProber
+from tests.rtsp_stub import RtspStub
+
+
+async def run(args: argparse.Namespace) -> None:
+    streams = [f"cam{i}" for i in range(-(-args.sources // args.hosts))]
+    async with RtspStub(streams, delay=args.delay) as stub:
+        hosts = [f"127.0.{i // 250}.{i % 250 + 1}" for i in range(args.hosts)]
+        sources = [stub.url(s, host=h) for h in hosts for s in streams]
+        sources = sources[: args.sources]
+        prober = SourceProber(
+            concurrency=args.concurrency, per_host=args.per_host, timeout=5.0
+        )
+        probe_run = await prober.probe_all(sources)
+        cached = await prober.probe_all(sources)
+
+    print(f"sources: {len(sources)} on {args.hosts} hosts, delay {args.delay}s")
+    print(f"limits: {args.concurrency} total, {args.per_host} per host")
+    print(
+        f"probed: {probe_run.probed} in {probe_run.elapsed:.2f} s "
+        f"({probe_run.rate:.0f} probes/s), failed {len(probe_run.failed)}"
+    )
+    print(f"cached: {len(cached.results)} in {cached.elapsed * 1000:.0f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sources", type=int, default=3000)
+    parser.add_argument("--hosts", type=int, default=100)
+    parser.add_argument("--delay", type=float, default=0.02)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--per-host", type=int, default=4)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
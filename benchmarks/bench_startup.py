@@ -0,0 +1,61 @@
+"""Benchmark cold vs warm MtxConfigManager.load_data with the snapshot cache.
+
+Usage:
+    python -m benchmarks.bench_startup [--streams 100000] [--repeat 3]
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from src.mtx_manager import MtxConfigManager
+
+
+def make_paths(count: int) -> dict:
+    """Generate a synthetic paths.json with the given number of streams."""
+    return {
+        f"cam{i:06d}": {
+            "source": f"rtsp://10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}:554/live",
+            "rtspTransport": "tcp",
+            "sourceOnDemand": True,
+        }
+        for i in range(count)
+    }
+
+
+def timed_load(json_dir: Path) -> float:
+    start = time.perf_counter()
+    MtxConfigManager(json_dir=json_dir).load_data()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--streams", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_dir = Path(tmp) / "json"
+        json_dir.mkdir()
+        with open(json_dir / "paths.json", "w", encoding="utf-8") as f:
+            json.dump(make_paths(args.streams), f, indent=2)
+        (json_dir / "values_app.json").write_text(json.dumps({"logLevel": "info"}))
+
+        cache_file = Path(tmp) / ".json.snapshot"
+        cold, warm = [], []
+        for _ in range(args.repeat):
+            cache_file.unlink(missing_ok=True)
+            cold.append(timed_load(json_dir))
+            warm.append(timed_load(json_dir))
+
+        print(f"streams: {args.streams}")
+        print(f"cold load: {min(cold) * 1000:.1f} ms (best of {args.repeat})")
+        print(f"warm load: {min(warm) * 1000:.1f} ms (best of {args.repeat})")
+        print(f"speedup:   {min(cold) / min(warm):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,3 +17,9 @@ class ConfigClient(ABC):
     def save_config(self, data: Dict[str, Any]) -> None:
         """Сохраняет словарь с данными в источник конфигурации."""
         pass
+
+    def close(self) -> None:
+        """
+        Освобождает ресурсы клиента при вытеснении из пула; по умолчанию
+        освобождать нечего. Клиент остаётся пригодным к использованию.
+        """
@@ -1,8 +1,13 @@
-from functools import lru_cache
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Optional, Tuple
 
 from src.clients.abc_conf_client import ConfigClient
 from src.clients.json_client import JSONClient
 from src.clients.yaml_client import YAMLClient
+from src.core.config import get_settings
 from src.core.log import logger
 
 
@@ -12,16 +17,106 @@ _providers = {
     "YAML": YAMLClient,
 }
 
+# (провайдер, абсолютный путь директории)
+ClientKey = Tuple[str, str]
 
-@lru_cache()
-def get_config_client(provider_name: str) -> ConfigClient:
+
+class ClientPool:
+    """
+    Пул клиентов конфигурации с ключом (провайдер, директория).
+
+    Хранит не больше max_size клиентов: при переполнении вытесняется давно
+    не использовавшийся. Клиенты без обращений дольше idle_timeout секунд
+    (0 - без ограничения) вытесняются при следующем обращении к пулу.
+    Вытесненному клиенту вызывается close(); клиенты JSON и YAML состояния
+    не хранят, и следующее обращение просто создаёт новый.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 32,
+        idle_timeout: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.clock = clock
+        # Клиент и время последнего обращения, от давних к недавним
+        self._clients: "OrderedDict[ClientKey, Tuple[ConfigClient, float]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def get(self, provider_name: str, directory: Optional[Path] = None) -> ConfigClient:
+        """Клиент провайдера для директории (создаётся при первом обращении)."""
+        provider_class = _providers.get(provider_name)
+        if not provider_class:
+            raise ValueError(f"Unsupported provider: {provider_name}")
+
+        # Без directory - MTX_JSON_DIR, под тем же ключом, что и явный путь к ней
+        path = directory if directory is not None else get_settings().MTX_JSON_DIR
+        key = (provider_name, str(Path(path).resolve()))
+        now = self.clock()
+        with self._lock:
+            entry = self._clients.pop(key, None)
+            closing = self._expired(now)
+            if entry is None:
+                logger.debug(
+                    f"Providing instance of {provider_class.__name__} for {key[1]}"
+                )
+                client = (
+                    provider_class() if directory is None else provider_class(directory)
+                )
+            else:
+                client = entry[0]
+            self._clients[key] = (client, now)
+            while len(self._clients) > self.max_size:
+                closing.append(self._clients.popitem(last=False)[1][0])
+        for idle in closing:
+            idle.close()
+        return client
+
+    def _expired(self, now: float) -> list[ConfigClient]:
+        """Извлекает клиентов, простаивающих дольше idle_timeout."""
+        expired = []
+        if self.idle_timeout <= 0:
+            return expired
+        while self._clients:
+            key, (client, used) = next(iter(self._clients.items()))
+            if now - used < self.idle_timeout:
+                break
+            del self._clients[key]
+            expired.append(client)
+        return expired
+
+    def clear(self) -> None:
+        """Закрывает и удаляет все клиенты."""
+        with self._lock:
+            clients = [client for client, _ in self._clients.values()]
+            self._clients.clear()
+        for client in clients:
+            client.close()
+
+
+_pool = ClientPool(
+    max_size=get_settings().MTX_CLIENT_POOL_SIZE,
+    idle_timeout=get_settings().MTX_CLIENT_IDLE_TIMEOUT,
+)
+
+
+def get_config_client(
+    provider_name: str, directory: Optional[Path] = None
+) -> ConfigClient:
     """
     Фабричная функция для получения экземпляра клиента конфигурации.
-    Использует кэширование для возврата одного и того же экземпляра.
+    Для одной пары (провайдер, директория) возвращает один и тот же
+    экземпляр, пока он в пуле; без directory - клиент для MTX_JSON_DIR.
     """
-    provider_class = _providers.get(provider_name)
-    if not provider_class:
-        raise ValueError(f"Unsupported provider: {provider_name}")
+    return _pool.get(provider_name, directory)
+
 
-    logger.debug(f"Providing instance of {provider_class.__name__}")
-    return provider_class()
+# Совместимость с прежним @lru_cache: сбрасывает пул клиентов
+get_config_client.cache_clear = _pool.clear
@@ -1,10 +1,11 @@
 import json
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Dict, Optional
 
 from src.clients.abc_conf_client import ConfigClient
 from src.core.config import get_settings as get_settings_func
 from src.core.log import logger
+from src.utils.fs_utils import atomic_write_many
 
 
 # --- реализация для JSON ---
@@ -14,8 +15,11 @@ class JSONClient(ConfigClient):
     Отвечает за чтение и запись отдельных JSON-файлов.
     """
 
-    def __init__(self):
-        self.json_dir: Path = get_settings_func().MTX_JSON_DIR
+    def __init__(self, json_dir: Optional[Path] = None):
+        # Без json_dir - директория из настроек (MTX_JSON_DIR)
+        self.json_dir: Path = (
+            Path(json_dir) if json_dir is not None else get_settings_func().MTX_JSON_DIR
+        )
 
     def load_config(self) -> Dict[str, Any]:
         """
@@ -29,40 +33,59 @@ class JSONClient(ConfigClient):
             return data
 
         for json_file in self.json_dir.glob("*.json"):
-            try:
-                with open(json_file, "r", encoding="utf-8") as f:
-                    content = json.load(f)
-                    if not content:
-                        logger.warning(f"File {json_file.name} is empty, skipping.")
-                        continue
-                data[json_file.name] = content
-                # Мы можем не добавлять _enabled флаг здесь, т.к. это логика приложения,
-                # а не самого процесса загрузки. Но оставим для совместимости.
-                data[f"{json_file.name}_enabled"] = True
-            except json.JSONDecodeError:
-                logger.error(f"Error decoding JSON from {json_file}", exc_info=True)
-            except IOError:
-                logger.error(f"Error reading file {json_file}", exc_info=True)
+            content = self.load_section(json_file.name)
+            if content is None:
+                continue
+            data[json_file.name] = content
+            # Мы можем не добавлять _enabled флаг здесь, т.к. это логика приложения,
+            # а не самого процесса загрузки. Но оставим для совместимости.
+            data[f"{json_file.name}_enabled"] = True
 
         logger.info("JSONClient: Configuration data loaded successfully.")
         return data
 
+    def load_section(self, name: str) -> Optional[Any]:
+        """
+        Загружает один JSON-файл секции по имени.
+        Возвращает None, если файл пуст, отсутствует или не читается.
+        """
+        json_file = self.json_dir / name
+        try:
+            with open(json_file, "r", encoding="utf-8") as f:
+                content = json.load(f)
+        except json.JSONDecodeError:
+            logger.error(f"Error decoding JSON from {json_file}", exc_info=True)
+            return None
+        except IOError:
+            logger.error(f"Error reading file {json_file}", exc_info=True)
+            return None
+
+        if not content:
+            logger.warning(f"File {json_file.name} is empty, skipping.")
+            return None
+        return content
+
     def save_config(self, data: Dict[str, Any]) -> None:
         """
         Сохраняет данные из словаря в отдельные JSON-файлы.
+        Файлы пишутся атомарно (временный файл + os.replace), fsync для всех
+        файлов выполняется одним пакетом. Ошибка записи пробрасывается:
+        вызывающий код не должен считать данные сохранёнными.
         """
         logger.debug(f"JSONClient: Saving data to {self.json_dir}")
+        contents = {}
         for key, content in data.items():
             # Сохраняем только те ключи, которые соответствуют именам файлов
             if key.endswith(".json"):
-                file_path = self.json_dir / key
-                try:
-                    if not content:
-                        logger.info(f"Skipping write for empty content: {key}")
-                        continue
-                    with open(file_path, "w", encoding="utf-8") as f:
-                        json.dump(content, f, indent=2, ensure_ascii=False)
-                except IOError:
-                    logger.error(f"Error writing to {file_path}", exc_info=True)
-                    # Можно пробросить исключение дальше, если это критично
-                    # raise
+                if not content:
+                    logger.info(f"Skipping write for empty content: {key}")
+                    continue
+                contents[self.json_dir / key] = json.dumps(
+                    content, indent=2, ensure_ascii=False
+                )
+
+        try:
+            atomic_write_many(contents)
+        except IOError:
+            logger.error(f"Error writing to {self.json_dir}", exc_info=True)
+            raise
@@ -0,0 +1,241 @@
+import asyncio
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, NamedTuple, Optional, Tuple
+
+import httpx
+
+from src.core.config import get_settings as get_settings_func
+from src.core.log import logger
+
+# Метрики mediamtx с меткой name пути, которые собираются
+PATH_METRICS = {
+    "paths_bytes_received": "bytes_received",
+    "paths_bytes_sent": "bytes_sent",
+    "paths_readers": "readers",
+}
+
+
+class Sample(NamedTuple):
+    """Одно значение в текстовом формате Prometheus."""
+
+    name: str
+    labels: Dict[str, str]
+    value: float
+
+
+class PathPoint(NamedTuple):
+    """Значения счётчиков пути в момент сбора."""
+
+    time: float
+    bytes_received: float
+    bytes_sent: float
+    readers: float
+
+
+_ESCAPES = {"n": "\n", "\\": "\\", '"': '"'}
+
+
+def _parse_labels(text: str, pos: int) -> Tuple[Dict[str, str], int]:
+    """Разбирает {a="1",b="2"} начиная с pos (после "{"); возвращает конец."""
+    labels: Dict[str, str] = {}
+    length = len(text)
+    while True:
+        while pos < length and text[pos] in " ,":
+            pos += 1
+        if pos < length and text[pos] == "}":
+            return labels, pos + 1
+        eq = text.index("=", pos)
+        key = text[pos:eq].strip()
+        pos = text.index('"', eq) + 1
+        value = []
+        while text[pos] != '"':
+            char = text[pos]
+            if char == "\\":
+                pos += 1
+                char = _ESCAPES.get(text[pos], "\\" + text[pos])
+            value.append(char)
+            pos += 1
+        labels[key] = "".join(value)
+        pos += 1
+
+
+def parse_sample(line: str) -> Optional[Sample]:
+    """
+    Разбирает одну строку текстового формата Prometheus. Комментарии,
+    пустые и некорректные строки дают None.
+    """
+    line = line.strip()
+    if not line or line[0] == "#":
+        return None
+    try:
+        brace = line.find("{")
+        space = line.find(" ")
+        if brace != -1 and (space == -1 or brace < space):
+            name = line[:brace]
+            labels, pos = _parse_labels(line, brace + 1)
+            rest = line[pos:].split()
+        else:
+            name, *rest = line.split()
+            labels = {}
+        # Необязательная метка времени после значения не используется
+        return Sample(name, labels, float(rest[0]))
+    except (ValueError, IndexError):
+        return None
+
+
+def parse_metrics(lines: Iterable[str]) -> Iterable[Sample]:
+    """Значения из строк текстового формата Prometheus по мере чтения."""
+    for line in lines:
+        sample = parse_sample(line)
+        if sample is not None:
+            yield sample
+
+
+def collect_paths_into(paths: Dict[str, Dict[str, float]], sample: Sample) -> None:
+    """Добавляет значение sample к счётчикам его пути в paths."""
+    field = PATH_METRICS.get(sample.name)
+    path = sample.labels.get("name")
+    if field is None or path is None:
+        return
+    values = paths.setdefault(path, {})
+    values[field] = values.get(field, 0.0) + sample.value
+
+
+def collect_paths(samples: Iterable[Sample]) -> Dict[str, Dict[str, float]]:
+    """Счётчики PATH_METRICS по имени пути."""
+    paths: Dict[str, Dict[str, float]] = {}
+    for sample in samples:
+        collect_paths_into(paths, sample)
+    return paths
+
+
+def throughput(points: Iterable[PathPoint]) -> list[float]:
+    """
+    Скорость приёма (байт/с) между соседними точками. Сброс счётчика
+    (перезапуск mediamtx) даёт 0.
+    """
+    rates = []
+    previous = None
+    for point in points:
+        if previous is not None:
+            elapsed = point.time - previous.time
+            delta = point.bytes_received - previous.bytes_received
+            rates.append(delta / elapsed if elapsed > 0 and delta >= 0 else 0.0)
+        previous = point
+    return rates
+
+
+# --- сборщик метрик ---
+class MetricsCollector:
+    """
+    Периодический сбор метрик mediamtx (/metrics) по путям.
+
+    Ответ разбирается построчно по мере получения, без чтения тела целиком.
+    Для каждого пути хранится кольцевой буфер из history последних точек;
+    пути, пропавшие из метрик, удаляются. Повторный сбор раньше чем через
+    interval секунд не выполняется, одновременные вызовы ждут один запрос.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        history: int = 60,
+        interval: float = 5.0,
+        timeout: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.url = url
+        self.history = history
+        self.interval = interval
+        self.clock = clock
+        self.series: Dict[str, deque[PathPoint]] = {}
+        # Увеличивается с каждым успешным сбором
+        self.version = 0
+        self.scraped_at: Optional[float] = None
+        self.error: Optional[str] = None
+        self._client = httpx.AsyncClient(timeout=timeout)
+        self._inflight: Optional[asyncio.Future] = None
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def _lines(self):
+        async with self._client.stream("GET", self.url) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                yield line
+
+    async def scrape(self) -> int:
+        """Собирает метрики и добавляет точки в буферы; возвращает число путей."""
+        paths: Dict[str, Dict[str, float]] = {}
+        async for line in self._lines():
+            sample = parse_sample(line)
+            if sample is not None:
+                collect_paths_into(paths, sample)
+        now = self.clock()
+        for name in self.series.keys() - paths.keys():
+            del self.series[name]
+        for name, values in paths.items():
+            points = self.series.get(name)
+            if points is None:
+                points = self.series[name] = deque(maxlen=self.history)
+            points.append(
+                PathPoint(
+                    now,
+                    values.get("bytes_received", 0.0),
+                    values.get("bytes_sent", 0.0),
+                    values.get("readers", 0.0),
+                )
+            )
+        self.version += 1
+        return len(paths)
+
+    async def refresh(self) -> int:
+        """Собирает метрики, если прошлый сбор старше interval; возвращает version."""
+        if self.scraped_at is not None and (
+            self.clock() - self.scraped_at < self.interval
+        ):
+            return self.version
+        if self._inflight is None:
+            self._inflight = asyncio.ensure_future(self._refresh())
+        await asyncio.shield(self._inflight)
+        return self.version
+
+    async def _refresh(self) -> None:
+        try:
+            await self.scrape()
+            self.error = None
+        except (httpx.HTTPError, OSError) as e:
+            if self.error is None:
+                logger.warning(f"Metrics scrape of {self.url} failed: {e!r}")
+            self.error = str(e) or repr(e)
+        finally:
+            self.scraped_at = self.clock()
+            self._inflight = None
+
+    def throughput(self, name: str) -> list[float]:
+        """Скорость приёма пути (байт/с) по точкам буфера."""
+        return throughput(self.series.get(name, ()))
+
+    def readers(self, name: str) -> Optional[int]:
+        """Число читателей пути по последнему сбору."""
+        points = self.series.get(name)
+        return int(points[-1].readers) if points else None
+
+
+@lru_cache()
+def get_metrics_collector() -> Optional[MetricsCollector]:
+    """
+    Общий для процесса сборщик по настройкам MTX_METRICS_*
+    (None, если MTX_METRICS_URL не задан).
+    """
+    settings = get_settings_func()
+    if not settings.MTX_METRICS_URL:
+        return None
+    return MetricsCollector(
+        settings.MTX_METRICS_URL,
+        history=settings.MTX_METRICS_HISTORY,
+        interval=settings.MTX_METRICS_INTERVAL,
+    )
@@ -0,0 +1,316 @@
+import asyncio
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional
+from urllib.parse import quote
+
+import httpx
+
+from src.core.config import get_settings as get_settings_func
+from src.core.log import logger
+from src.utils.json_utils import MISSING
+
+# Пауза перед первым повтором запроса (удваивается с каждой попыткой)
+RETRY_DELAY = 0.2
+# Размер страницы при чтении списков
+PAGE_SIZE = 1000
+# Методы, повтор которых не меняет результат
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "PATCH", "DELETE"})
+
+
+class DeployResult(NamedTuple):
+    """Итог применения конфигурации к работающему mediamtx."""
+
+    added: list[str]
+    patched: list[str]
+    deleted: list[str]
+    # Разделы верхнего уровня, изменённые через patch ("global", "pathDefaults")
+    sections: list[str]
+    errors: list[str]
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    @property
+    def changed(self) -> int:
+        return len(self.added) + len(self.patched) + len(self.deleted)
+
+
+def changed_fields(current: Dict[str, Any], desired: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Поля desired, значения которых отличаются от current.
+    Сервер возвращает конфигурацию со всеми значениями по умолчанию, поэтому
+    сравниваются только поля, заданные в desired.
+    """
+    return {
+        key: value
+        for key, value in desired.items()
+        if current.get(key, MISSING) != value
+    }
+
+
+# --- клиент Control API mediamtx ---
+class MtxApiClient:
+    """
+    Асинхронный клиент HTTP API mediamtx (/v3).
+
+    Все запросы идут через один пул keep-alive соединений; одновременно
+    выполняется не больше concurrency запросов. Сетевые ошибки и ответы 5xx
+    повторяются до retries раз с экспоненциальной паузой, ответы 4xx - нет.
+    Неидемпотентные запросы (POST) повторяются, только если можно проверить,
+    выполнил ли сервер предыдущую попытку (applied).
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        concurrency: int = 8,
+        retries: int = 3,
+        timeout: float = 5.0,
+        auth: Optional[httpx.Auth] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.retries = retries
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=timeout,
+            auth=auth,
+            limits=httpx.Limits(
+                max_connections=concurrency, max_keepalive_connections=concurrency
+            ),
+        )
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def __aenter__(self) -> "MtxApiClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        json: Any = None,
+        params: Any = None,
+        applied: Optional[Callable[[], Awaitable[bool]]] = None,
+    ) -> httpx.Response:
+        """
+        Выполняет запрос с ограничением параллельности и повторами.
+
+        Сетевая ошибка или 5xx не говорят, выполнен ли запрос. Если повтор
+        получил 4xx ("путь уже существует" у add, "не найден" у delete),
+        applied проверяет состояние сервера: запрос, выполненный предыдущей
+        попыткой, считается успешным, иначе ошибка 4xx возвращается как есть.
+        """
+        retries = self.retries if method in IDEMPOTENT_METHODS or applied else 0
+        delay = RETRY_DELAY
+        for attempt in range(retries + 1):
+            try:
+                async with self._semaphore:
+                    response = await self._client.request(
+                        method, url, json=json, params=params
+                    )
+                if (
+                    attempt
+                    and applied is not None
+                    and 400 <= response.status_code < 500
+                    and await applied()
+                ):
+                    logger.info(
+                        f"mediamtx API {method} {url}: HTTP {response.status_code}"
+                        " on retry, already applied"
+                    )
+                    return response
+                if response.status_code < 500 or attempt == retries:
+                    response.raise_for_status()
+                    return response
+                logger.warning(
+                    f"mediamtx API {method} {url}: HTTP {response.status_code}, retrying"
+                )
+            except httpx.TransportError as e:
+                if attempt == retries:
+                    raise
+                logger.warning(f"mediamtx API {method} {url}: {e!r}, retrying")
+            await asyncio.sleep(delay)
+            delay *= 2
+        raise AssertionError("unreachable")
+
+    async def list_items(self, url: str, page_size: int = PAGE_SIZE) -> list[Any]:
+        """
+        Читает все страницы списка (/v3/.../list). Первая страница сообщает
+        pageCount, остальные запрашиваются параллельно.
+        """
+        first = (
+            await self.request(
+                "GET", url, params={"page": 0, "itemsPerPage": page_size}
+            )
+        ).json()
+        items = list(first.get("items") or [])
+        pages = await asyncio.gather(
+            *(
+                self.request("GET", url, params={"page": p, "itemsPerPage": page_size})
+                for p in range(1, first.get("pageCount", 1))
+            )
+        )
+        for page in pages:
+            items.extend(page.json().get("items") or [])
+        return items
+
+    async def get_paths_config(self) -> Dict[str, Dict[str, Any]]:
+        """Конфигурации путей работающего сервера по имени."""
+        items = await self.list_items("/v3/config/paths/list")
+        return {item["name"]: item for item in items}
+
+    async def get_paths(self, page_size: int = PAGE_SIZE) -> Dict[str, Dict[str, Any]]:
+        """Состояние путей работающего сервера (/v3/paths/list) по имени."""
+        items = await self.list_items("/v3/paths/list", page_size)
+        return {item["name"]: item for item in items}
+
+    @staticmethod
+    def _path_url(action: str, name: str) -> str:
+        return f"/v3/config/paths/{action}/{quote(name, safe='/')}"
+
+    async def path_exists(self, name: str) -> bool:
+        """Есть ли путь в конфигурации работающего сервера."""
+        try:
+            await self.request("GET", self._path_url("get", name))
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                return False
+            raise
+        return True
+
+    async def add_path(self, name: str, conf: Dict[str, Any]) -> None:
+        await self.request(
+            "POST",
+            self._path_url("add", name),
+            json=conf,
+            applied=lambda: self.path_exists(name),
+        )
+
+    async def patch_path(self, name: str, conf: Dict[str, Any]) -> None:
+        await self.request("PATCH", self._path_url("patch", name), json=conf)
+
+    async def delete_path(self, name: str) -> None:
+        async def deleted() -> bool:
+            return not await self.path_exists(name)
+
+        await self.request("DELETE", self._path_url("delete", name), applied=deleted)
+
+    async def get_global(self) -> Dict[str, Any]:
+        return (await self.request("GET", "/v3/config/global/get")).json()
+
+    async def patch_global(self, conf: Dict[str, Any]) -> None:
+        await self.request("PATCH", "/v3/config/global/patch", json=conf)
+
+    async def get_path_defaults(self) -> Dict[str, Any]:
+        return (await self.request("GET", "/v3/config/pathdefaults/get")).json()
+
+    async def patch_path_defaults(self, conf: Dict[str, Any]) -> None:
+        await self.request("PATCH", "/v3/config/pathdefaults/patch", json=conf)
+
+    async def deploy(self, config: Dict[str, Any]) -> DeployResult:
+        """
+        Применяет итоговую конфигурацию (см. build_final_config) к работающему
+        серверу, изменяя только то, что отличается от его текущей конфигурации:
+        новые пути добавляются, у изменённых патчатся отличающиеся поля,
+        отсутствующие в config пути удаляются. Глобальные параметры и
+        pathDefaults патчатся только отличающимися полями.
+
+        Поля, удалённые из секций, на сервере не сбрасываются: сервер хранит
+        их значения по умолчанию, и отличить их нельзя.
+        """
+        paths: Dict[str, Any] = config.get("paths") or {}
+        global_conf = {
+            key: value
+            for key, value in config.items()
+            if key not in ("paths", "pathDefaults")
+        }
+        result = DeployResult([], [], [], [], [])
+
+        async def apply(kind: list[str], name: str, coro) -> None:
+            try:
+                await coro
+                kind.append(name)
+            except httpx.HTTPError as e:
+                result.errors.append(f"{name}: {_describe(e)}")
+
+        running = await self.get_paths_config()
+        tasks = []
+        for name, conf in paths.items():
+            current = running.get(name)
+            if current is None:
+                tasks.append(apply(result.added, name, self.add_path(name, conf)))
+                continue
+            changed = changed_fields(current, conf)
+            if changed:
+                tasks.append(
+                    apply(result.patched, name, self.patch_path(name, changed))
+                )
+        for name in running.keys() - paths.keys():
+            tasks.append(apply(result.deleted, name, self.delete_path(name)))
+
+        if global_conf:
+            changed = changed_fields(await self.get_global(), global_conf)
+            if changed:
+                tasks.append(
+                    apply(result.sections, "global", self.patch_global(changed))
+                )
+        if config.get("pathDefaults"):
+            changed = changed_fields(
+                await self.get_path_defaults(), config["pathDefaults"]
+            )
+            if changed:
+                tasks.append(
+                    apply(
+                        result.sections,
+                        "pathDefaults",
+                        self.patch_path_defaults(changed),
+                    )
+                )
+
+        await asyncio.gather(*tasks)
+        logger.info(
+            f"Deployed to {self.base_url}: {len(result.added)} added, "
+            f"{len(result.patched)} patched, {len(result.deleted)} deleted, "
+            f"sections {result.sections}, {len(result.errors)} error(s)"
+        )
+        return result
+
+
+def _describe(error: httpx.HTTPError) -> str:
+    if isinstance(error, httpx.HTTPStatusError):
+        response = error.response
+        try:
+            detail = response.json().get("error", response.text)
+        except ValueError:
+            detail = response.text
+        return f"HTTP {response.status_code}: {detail}"
+    return repr(error)
+
+
+@lru_cache()
+def get_mtx_api_client() -> Optional[MtxApiClient]:
+    """
+    Общий для процесса клиент API по настройкам MTX_API_*
+    (None, если MTX_API_URL не задан).
+    """
+    settings = get_settings_func()
+    if not settings.MTX_API_URL:
+        return None
+    auth = (
+        httpx.BasicAuth(settings.MTX_API_USER, settings.MTX_API_PASSWORD)
+        if settings.MTX_API_USER
+        else None
+    )
+    return MtxApiClient(
+        settings.MTX_API_URL,
+        concurrency=settings.MTX_API_CONCURRENCY,
+        retries=settings.MTX_API_RETRIES,
+        timeout=settings.MTX_API_TIMEOUT,
+        auth=auth,
+    )
@@ -0,0 +1,334 @@
+import asyncio
+import base64
+import hashlib
+import os
+import re
+import ssl
+import time
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional, Tuple
+from urllib.parse import unquote, urlsplit, urlunsplit
+
+from src.core.config import get_settings as get_settings_func
+from src.core.log import logger
+
+# Порт по умолчанию для каждой схемы источника
+DEFAULT_PORTS = {
+    "rtsp": 554,
+    "rtsps": 322,
+    "rtmp": 1935,
+    "rtmps": 443,
+    "http": 80,
+    "https": 443,
+    "whep": 80,
+    "wheps": 443,
+}
+RTSP_SCHEMES = ("rtsp", "rtsps")
+USER_AGENT = "mtx-config"
+
+
+class ProbeResult(NamedTuple):
+    """Результат проверки одного источника."""
+
+    ok: bool
+    # Краткое описание: "RTSP 200", "timeout", "ConnectionRefusedError"...
+    detail: str
+    # Время проверки, секунды
+    latency: float
+    checked_at: float
+
+
+class ProbeTarget(NamedTuple):
+    scheme: str
+    host: str
+    port: int
+    # URL без учётных данных, для строки запроса RTSP
+    url: str
+    user: Optional[str]
+    password: Optional[str]
+
+
+class ProbeRun(NamedTuple):
+    """Итог проверки набора источников."""
+
+    results: Dict[str, ProbeResult]
+    # Выполнено проверок (без результатов из кэша) и затраченное время
+    probed: int
+    elapsed: float
+
+    @property
+    def rate(self) -> float:
+        """Проверок в секунду."""
+        return self.probed / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def failed(self) -> list[str]:
+        return [url for url, result in self.results.items() if not result.ok]
+
+
+def parse_source(source: Any) -> Optional[ProbeTarget]:
+    """
+    Адрес для проверки источника пути или None, если источник нельзя
+    проверить подключением (publisher, redirect, udp://, srt:// и т.п.).
+    """
+    if not isinstance(source, str):
+        return None
+    try:
+        parts = urlsplit(source)
+        port = parts.port
+    except ValueError:
+        return None
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.hostname:
+        return None
+    netloc = parts.hostname if ":" not in parts.hostname else f"[{parts.hostname}]"
+    if port is not None:
+        netloc = f"{netloc}:{port}"
+    return ProbeTarget(
+        scheme=scheme,
+        host=parts.hostname,
+        port=port or DEFAULT_PORTS[scheme],
+        url=urlunsplit((parts.scheme, netloc, parts.path or "/", parts.query, "")),
+        user=unquote(parts.username) if parts.username else None,
+        password=unquote(parts.password) if parts.password else None,
+    )
+
+
+# --- RTSP ---
+def _md5(text: str) -> str:
+    return hashlib.md5(text.encode()).hexdigest()
+
+
+def _challenges(headers: list[Tuple[str, str]]) -> Dict[str, Dict[str, str]]:
+    """Параметры заголовков WWW-Authenticate по схеме ("digest", "basic")."""
+    result = {}
+    for name, value in headers:
+        if name.lower() != "www-authenticate":
+            continue
+        scheme, _, rest = value.partition(" ")
+        result[scheme.lower()] = dict(re.findall(r'(\w+)="?([^",]*)"?', rest))
+    return result
+
+
+def rtsp_authorization(
+    headers: list[Tuple[str, str]], method: str, target: ProbeTarget
+) -> Optional[str]:
+    """
+    Заголовок Authorization для ответа 401 (Digest, если сервер его
+    предлагает, иначе Basic) или None, если учётных данных нет.
+    """
+    if target.user is None:
+        return None
+    challenges = _challenges(headers)
+    password = target.password or ""
+    digest = challenges.get("digest")
+    if digest is not None:
+        realm, nonce = digest.get("realm", ""), digest.get("nonce", "")
+        ha1 = _md5(f"{target.user}:{realm}:{password}")
+        ha2 = _md5(f"{method}:{target.url}")
+        fields = (
+            f'username="{target.user}", realm="{realm}", nonce="{nonce}", '
+            f'uri="{target.url}"'
+        )
+        if "auth" in digest.get("qop", "").split(","):
+            cnonce = os.urandom(8).hex()
+            response = _md5(f"{ha1}:{nonce}:00000001:{cnonce}:auth:{ha2}")
+            fields += f', qop=auth, nc=00000001, cnonce="{cnonce}"'
+        else:
+            response = _md5(f"{ha1}:{nonce}:{ha2}")
+        return f'Digest {fields}, response="{response}"'
+    if "basic" in challenges:
+        token = base64.b64encode(f"{target.user}:{password}".encode()).decode()
+        return f"Basic {token}"
+    return None
+
+
+async def _rtsp_request(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    method: str,
+    target: ProbeTarget,
+    cseq: int,
+    extra: Iterable[str] = (),
+) -> Tuple[int, list[Tuple[str, str]]]:
+    lines = [f"{method} {target.url} RTSP/1.0", f"CSeq: {cseq}"]
+    lines += [f"User-Agent: {USER_AGENT}", *extra]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode())
+    await writer.drain()
+
+    head = await reader.readuntil(b"\r\n\r\n")
+    status_line, *header_lines = head.decode("latin-1").split("\r\n")
+    protocol, _, rest = status_line.partition(" ")
+    if not protocol.startswith("RTSP/"):
+        raise ValueError(f"not an RTSP response: {status_line[:40]!r}")
+    status = int(rest.split(" ", 1)[0])
+    headers = [
+        (name.strip(), value.strip())
+        for name, _, value in (line.partition(":") for line in header_lines if line)
+    ]
+    length = next(
+        (int(value) for name, value in headers if name.lower() == "content-length"), 0
+    )
+    if length:
+        # Тело (SDP) не нужно, но соединение используется повторно
+        await reader.readexactly(length)
+    return status, headers
+
+
+async def probe_rtsp(target: ProbeTarget) -> Tuple[bool, str]:
+    """
+    OPTIONS, затем DESCRIBE (с авторизацией при ответе 401). Источник
+    доступен, если DESCRIBE вернул 200.
+    """
+    context = None
+    if target.scheme == "rtsps":
+        # У камер обычно самоподписанные сертификаты
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    reader, writer = await asyncio.open_connection(
+        target.host, target.port, ssl=context
+    )
+    try:
+        status, _ = await _rtsp_request(reader, writer, "OPTIONS", target, 1)
+        if status != 200:
+            return False, f"RTSP OPTIONS {status}"
+        accept = "Accept: application/sdp"
+        status, headers = await _rtsp_request(
+            reader, writer, "DESCRIBE", target, 2, [accept]
+        )
+        if status == 401:
+            authorization = rtsp_authorization(headers, "DESCRIBE", target)
+            if authorization is not None:
+                status, _ = await _rtsp_request(
+                    reader,
+                    writer,
+                    "DESCRIBE",
+                    target,
+                    3,
+                    [accept, f"Authorization: {authorization}"],
+                )
+        return status == 200, f"RTSP {status}"
+    finally:
+        writer.close()
+
+
+async def probe_tcp(target: ProbeTarget) -> Tuple[bool, str]:
+    """Проверка, что порт источника принимает TCP-соединения."""
+    _, writer = await asyncio.open_connection(target.host, target.port)
+    writer.close()
+    return True, "TCP connect"
+
+
+# --- проверка множества источников ---
+class SourceProber:
+    """
+    Параллельная проверка доступности источников путей.
+
+    Одновременно выполняется не больше concurrency проверок и не больше
+    per_host к одному хосту; каждая проверка ограничена timeout секунд.
+    Результаты кэшируются по URL на ttl секунд.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 200,
+        per_host: int = 4,
+        timeout: float = 3.0,
+        ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.per_host = per_host
+        self.timeout = timeout
+        self.ttl = ttl
+        self.clock = clock
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._hosts: Dict[str, asyncio.Semaphore] = {}
+        self._host_waiters: Dict[str, int] = {}
+        self.cache: Dict[str, ProbeResult] = {}
+
+    def cached(self, source: str) -> Optional[ProbeResult]:
+        result = self.cache.get(source)
+        if result is not None and self.clock() - result.checked_at < self.ttl:
+            return result
+        return None
+
+    async def probe(self, source: str) -> Optional[ProbeResult]:
+        """Проверяет один источник (None, если его нельзя проверить)."""
+        result = self.cached(source)
+        if result is not None:
+            return result
+        target = parse_source(source)
+        if target is None:
+            return None
+
+        host = target.host.lower()
+        semaphore = self._hosts.setdefault(host, asyncio.Semaphore(self.per_host))
+        self._host_waiters[host] = self._host_waiters.get(host, 0) + 1
+        try:
+            # Сначала лимит хоста: ожидающие его задачи не занимают общие слоты
+            async with semaphore, self._semaphore:
+                result = await self._check(target)
+        finally:
+            self._host_waiters[host] -= 1
+            if not self._host_waiters[host]:
+                del self._host_waiters[host]
+                del self._hosts[host]
+        self.cache[source] = result
+        return result
+
+    async def _check(self, target: ProbeTarget) -> ProbeResult:
+        start = self.clock()
+        check = probe_rtsp if target.scheme in RTSP_SCHEMES else probe_tcp
+        try:
+            ok, detail = await asyncio.wait_for(check(target), self.timeout)
+        except asyncio.TimeoutError:
+            ok, detail = False, "timeout"
+        except (OSError, ValueError, asyncio.IncompleteReadError) as e:
+            ok, detail = False, type(e).__name__
+        end = self.clock()
+        return ProbeResult(ok, detail, end - start, end)
+
+    async def probe_all(
+        self,
+        sources: Iterable[str],
+        on_result: Optional[Callable[[str, ProbeResult], None]] = None,
+    ) -> ProbeRun:
+        """
+        Проверяет все источники параллельно; on_result вызывается по мере
+        готовности каждого результата.
+        """
+        start = time.perf_counter()
+        probed = 0
+        results: Dict[str, ProbeResult] = {}
+
+        async def run(source: str) -> None:
+            nonlocal probed
+            fresh = self.cached(source) is None
+            result = await self.probe(source)
+            if result is None:
+                return
+            probed += fresh
+            results[source] = result
+            if on_result is not None:
+                on_result(source, result)
+
+        await asyncio.gather(*(run(source) for source in set(sources)))
+        run_result = ProbeRun(results, probed, time.perf_counter() - start)
+        logger.info(
+            f"Probed {run_result.probed} sources in {run_result.elapsed:.2f}s "
+            f"({run_result.rate:.0f}/s), {len(run_result.failed)} unreachable"
+        )
+        return run_result
+
+
+@lru_cache()
+def get_source_prober() -> SourceProber:
+    """Общий для процесса SourceProber по настройкам MTX_PROBE_*."""
+    settings = get_settings_func()
+    return SourceProber(
+        concurrency=settings.MTX_PROBE_CONCURRENCY,
+        per_host=settings.MTX_PROBE_PER_HOST,
+        timeout=settings.MTX_PROBE_TIMEOUT,
+        ttl=settings.MTX_PROBE_TTL,
+    )
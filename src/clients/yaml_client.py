@@ -1,13 +1,166 @@
-import shutil
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Dict, Mapping, NamedTuple, Optional
 
 import yaml
 
 from src.clients.abc_conf_client import ConfigClient
 from src.clients.json_client import JSONClient
 from src.core.config import get_settings as get_settings_func
+from src.core.effective import same_value
 from src.core.log import logger
+from src.utils.fs_utils import atomic_write_many
+from src.utils.json_utils import MISSING
+
+# Загрузчик на libyaml, если он есть (в разы быстрее на больших файлах)
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Всегда пишутся целиком: неточность таблицы встроенных значений здесь
+# изменила бы права доступа
+ALWAYS_WRITTEN = frozenset({"authInternalUsers"})
+
+
+def build_final_config(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Собирает итоговую конфигурацию mediamtx из секций (включённых и непустых):
+    paths.json -> paths, values_pathDefaults.json -> pathDefaults,
+    остальные секции - глобальные параметры верхнего уровня.
+    """
+    final_config: Dict[str, Any] = {}
+    for key, content in data.items():
+        if not key.endswith(".json") or not data.get(f"{key}_enabled", True):
+            continue
+
+        if not content:
+            continue
+
+        if key == "paths.json":
+            final_config["paths"] = content
+        elif key == "values_pathDefaults.json":
+            final_config["pathDefaults"] = content
+        else:
+            final_config.update(content)
+    return final_config
+
+
+class BuiltinDefaults(NamedTuple):
+    """Встроенные значения mediamtx: глобальные параметры и pathDefaults."""
+
+    settings: Dict[str, Any]
+    path_defaults: Dict[str, Any]
+
+
+@lru_cache()
+def load_builtin_defaults(defaults_file: Path) -> BuiltinDefaults:
+    """
+    Таблица встроенных значений из конфигурации mediamtx по умолчанию
+    (MTX_DEFAULTS_FILE). Читается один раз на файл и переиспользуется всеми
+    сохранениями. paths и ключи ALWAYS_WRITTEN в таблицу не входят.
+    """
+    with open(defaults_file, encoding="utf-8") as f:
+        # Файл - JSON с висячими запятыми, его читает YAML-парсер
+        raw = yaml.load(f, Loader=_Loader) or {}
+    path_defaults = raw.pop("pathDefaults", None) or {}
+    raw.pop("paths", None)
+    for key in ALWAYS_WRITTEN:
+        raw.pop(key, None)
+    return BuiltinDefaults(raw, path_defaults)
+
+
+def _is_default(table: Mapping[str, Any], key: str, value: Any) -> bool:
+    default = table.get(key, MISSING)
+    return default is not MISSING and same_value(value, default)
+
+
+def compact_config(config: Dict[str, Any], defaults: BuiltinDefaults) -> Dict[str, Any]:
+    """
+    Итоговая конфигурация без ключей, равных встроенным значениям mediamtx.
+
+    Ключ потока опускается, только если он равен и встроенному значению, и
+    действующему с учётом pathDefaults; сами потоки остаются все.
+    """
+    compact: Dict[str, Any] = {}
+    for key, value in config.items():
+        if key in ("paths", "pathDefaults"):
+            compact[key] = value
+        elif not _is_default(defaults.settings, key, value):
+            compact[key] = value
+
+    own_defaults = config.get("pathDefaults") or {}
+    path_defaults = {
+        key: value
+        for key, value in own_defaults.items()
+        if not _is_default(defaults.path_defaults, key, value)
+    }
+    if path_defaults:
+        compact["pathDefaults"] = path_defaults
+    else:
+        compact.pop("pathDefaults", None)
+    # Значения, действующие для потоков
+    effective = {**defaults.path_defaults, **own_defaults}
+
+    if "paths" in config:
+        compact["paths"] = {
+            name: (
+                {
+                    key: value
+                    for key, value in conf.items()
+                    if not (
+                        _is_default(defaults.path_defaults, key, value)
+                        and _is_default(effective, key, value)
+                    )
+                }
+                if isinstance(conf, dict)
+                else conf
+            )
+            for name, conf in config["paths"].items()
+        }
+    return compact
+
+
+def config_differences(
+    full: Mapping[str, Any], compact: Mapping[str, Any], defaults: BuiltinDefaults
+) -> list[str]:
+    """
+    Ключи, действующие значения которых (с учётом встроенных) у двух
+    конфигураций различаются; пустой список - конфигурации равносильны.
+    """
+    differences = []
+
+    def resolved(config: Mapping[str, Any], key: str, table: Mapping[str, Any]):
+        return config.get(key, table.get(key, MISSING))
+
+    for key in full.keys() | compact.keys():
+        if key in ("paths", "pathDefaults"):
+            continue
+        if not same_value(
+            resolved(full, key, defaults.settings),
+            resolved(compact, key, defaults.settings),
+        ):
+            differences.append(key)
+
+    full_defaults = {**defaults.path_defaults, **(full.get("pathDefaults") or {})}
+    compact_defaults = {
+        **defaults.path_defaults,
+        **(compact.get("pathDefaults") or {}),
+    }
+    if not same_value(full_defaults, compact_defaults):
+        differences.append("pathDefaults")
+
+    full_paths = full.get("paths") or {}
+    compact_paths = compact.get("paths") or {}
+    for name in full_paths.keys() | compact_paths.keys():
+        if name not in full_paths or name not in compact_paths:
+            differences.append(f"paths/{name}")
+            continue
+        a = full_paths[name] if isinstance(full_paths[name], dict) else {}
+        b = compact_paths[name] if isinstance(compact_paths[name], dict) else {}
+        for key in a.keys() | b.keys():
+            if not same_value(
+                resolved(a, key, full_defaults), resolved(b, key, compact_defaults)
+            ):
+                differences.append(f"paths/{name}/{key}")
+    return differences
 
 
 # --- реализация для YAML ---
@@ -17,12 +170,22 @@ class YAMLClient(ConfigClient):
     Отвечает за сборку и сохранение mediamtx.yml.
     """
 
-    def __init__(self):
+    def __init__(self, json_dir: Optional[Path] = None):
         settings = get_settings_func()
         self.yaml_file: Path = settings.MTX_YAML_FILE
         self.yaml_backup_file: Path = settings.MTX_YAML_BACKUP_FILE
+        if json_dir is not None and (
+            Path(json_dir).resolve() != Path(settings.MTX_JSON_DIR).resolve()
+        ):
+            # Для другой директории YAML пишется рядом с ней: <dir>.yml
+            json_dir = Path(json_dir)
+            self.yaml_file = json_dir.parent / f"{json_dir.name}.yml"
+            self.yaml_backup_file = json_dir.parent / f"{json_dir.name}.yml.bak"
         # Этот клиент также должен уметь работать с JSON-источниками
-        self.json_client = JSONClient()
+        self.json_client = JSONClient(json_dir)
+
+    def close(self) -> None:
+        self.json_client.close()
 
     def load_config(self) -> Dict[str, Any]:
         """
@@ -34,53 +197,69 @@ class YAMLClient(ConfigClient):
             "This application's workflow is based on reading source JSON files, not the final YAML."
         )
 
-    def save_config(self, data: Dict[str, Any]) -> None:
+    def save_config(self, data: Dict[str, Any], compact: bool = False) -> None:
         """
         Собирает данные из словаря в единый YAML-файл.
         Эта функция — ваша бывшая `save_data()` из yaml_utils.
+
+        С compact=True ключи, равные встроенным значениям mediamtx, не
+        пишутся (см. compact_config); JSON-секции сохраняются полностью.
         """
         logger.debug(f"YAMLClient: Saving final config to {self.yaml_file}")
 
         # Шаг 1: Сохраняем JSON-файлы (делегируем JSONClient)
         self.json_client.save_config(data)
 
-        # Шаг 2: Создаем бэкап
-        if self.yaml_file.exists():
-            try:
-                shutil.copy(self.yaml_file, self.yaml_backup_file)
-                logger.info(f"Backup created: {self.yaml_backup_file}")
-            except IOError:
-                logger.error("Failed to create configuration backup.", exc_info=True)
-                raise
-
-        # Шаг 3: Собираем финальную конфигурацию из словаря `data`
-        final_config = {}
-        for key, content in data.items():
-            if not key.endswith(".json") or not data.get(f"{key}_enabled", True):
-                continue
-
-            if not content:
-                continue
-
-            # Логика сборки, как у вас и была
-            if key == "paths.json":
-                final_config["paths"] = content
-            elif key == "values_pathDefaults.json":
-                final_config["pathDefaults"] = content
-            else:
-                final_config.update(content)
-
-        # Шаг 4: Записываем финальный YAML
+        # Шаг 2: Собираем финальную конфигурацию из словаря `data`
+        final_config = build_final_config(data)
+
+        # Шаг 3: Записываем финальный YAML во временный файл и атомарно
+        # подменяем им рабочий. Бэкап - жесткая ссылка на предыдущую версию.
         try:
-            with open(self.yaml_file, "w", encoding="utf-8") as f:
-                yaml.dump(
-                    final_config,
-                    f,
-                    default_flow_style=False,
-                    sort_keys=False,
-                    allow_unicode=True,
-                )
+            yaml_text = (
+                self._compact_yaml(final_config)
+                if compact
+                else self._dump(final_config)
+            )
+            atomic_write_many(
+                {self.yaml_file: yaml_text},
+                backups={self.yaml_file: self.yaml_backup_file},
+            )
             logger.info(f"Configuration successfully saved to {self.yaml_file}")
         except (IOError, yaml.YAMLError) as e:
             logger.error(f"Failed to write final YAML file: {e}", exc_info=True)
             raise
+
+    @staticmethod
+    def _dump(config: Dict[str, Any]) -> str:
+        return yaml.dump(
+            config,
+            default_flow_style=False,
+            sort_keys=False,
+            allow_unicode=True,
+        )
+
+    def _compact_yaml(self, final_config: Dict[str, Any]) -> str:
+        """
+        Компактный YAML, проверенный обратным чтением: прочитанный файл
+        должен давать те же действующие значения, что и полная конфигурация.
+        Иначе (или без таблицы встроенных значений) пишется полный YAML.
+        """
+        try:
+            defaults = load_builtin_defaults(
+                Path(get_settings_func().MTX_DEFAULTS_FILE)
+            )
+        except (OSError, yaml.YAMLError) as e:
+            logger.error(f"Built-in defaults unavailable, writing full YAML: {e}")
+            return self._dump(final_config)
+        yaml_text = self._dump(compact_config(final_config, defaults))
+        differences = config_differences(
+            final_config, yaml.load(yaml_text, Loader=_Loader) or {}, defaults
+        )
+        if differences:
+            logger.error(
+                f"Compact YAML differs from the full config at {differences[:10]}, "
+                "writing full YAML"
+            )
+            return self._dump(final_config)
+        return yaml_text
@@ -1,6 +1,7 @@
 import json
 import warnings
 from pathlib import Path
+from typing import Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -23,6 +24,68 @@ class Settings(BaseSettings):
     MTX_YAML_FILE: Path = env_dir / "work/mediamtx01.yml"
     MTX_YAML_BACKUP_FILE: Path = env_dir / "work/mediamtx01.yml.bak"
     log_level: str = "INFO"
+    # Интервал опроса MTX_JSON_DIR на внешние изменения (секунды, 0 - выключено)
+    MTX_WATCH_INTERVAL: float = 2.0
+    # Кэш разобранных и проверенных секций рядом с MTX_JSON_DIR
+    MTX_SNAPSHOT_CACHE: bool = True
+    # Автосохранение через N секунд без правок (0 - выключено)
+    MTX_AUTOSAVE_DELAY: float = 0.0
+    # Журнал правок (write-ahead) для восстановления после сбоя
+    MTX_JOURNAL: bool = True
+    # Сжатие журнала в файлы секций после N записей (0 - только при сохранении)
+    MTX_JOURNAL_COMPACT_EVERY: int = 1000
+    # История сохранённых конфигураций в MTX_WORK_DIR/history
+    MTX_HISTORY: bool = True
+    # Глубина истории отмены (Ctrl+Z / Ctrl+Y), 0 - отключить
+    MTX_UNDO_DEPTH: int = 100
+    # HTTP API работающего mediamtx, например http://127.0.0.1:9997 (пусто - выключено)
+    MTX_API_URL: str = ""
+    MTX_API_USER: str = ""
+    MTX_API_PASSWORD: str = ""
+    # Применять сохранённые изменения путей через API вместо перечитывания файла
+    MTX_API_DEPLOY: bool = False
+    # Параллельных запросов к API, повторов при ошибках, таймаут (секунды)
+    MTX_API_CONCURRENCY: int = 8
+    MTX_API_RETRIES: int = 3
+    MTX_API_TIMEOUT: float = 5.0
+    # Опрос состояния путей через API для вкладки Paths (секунды, 0 - выключено)
+    MTX_STATUS_INTERVAL: float = 5.0
+    # Сколько секунд результат опроса переиспользуется всеми сессиями
+    MTX_STATUS_TTL: float = 4.0
+    # Проверка источников: всего параллельно, на один хост, таймаут и
+    # время жизни результата (секунды)
+    MTX_PROBE_CONCURRENCY: int = 200
+    MTX_PROBE_PER_HOST: int = 4
+    MTX_PROBE_TIMEOUT: float = 3.0
+    MTX_PROBE_TTL: float = 60.0
+    # Метрики Prometheus mediamtx, например http://127.0.0.1:9998/metrics
+    # (пусто - выключено), интервал сбора и число хранимых точек на путь
+    MTX_METRICS_URL: str = ""
+    MTX_METRICS_INTERVAL: float = 5.0
+    MTX_METRICS_HISTORY: int = 60
+    # Каталог нескольких инстансов (common/, instances/<имя>/, out/),
+    # пусто - один инстанс в MTX_JSON_DIR
+    MTX_WORKSPACE_DIR: Optional[Path] = None
+    # Процессов для параллельного рендеринга инстансов (0 - по числу CPU)
+    MTX_WORKSPACE_WORKERS: int = 0
+    # Пул клиентов конфигурации по директориям: размер и время простоя
+    # (секунды, 0 - без ограничения), после которого клиент удаляется из пула
+    MTX_CLIENT_POOL_SIZE: int = 32
+    MTX_CLIENT_IDLE_TIMEOUT: float = 600.0
+    # Раздача отрендеренных конфигураций узлам по HTTP (/configs/<инстанс>.yml).
+    # Без аутентификации и с паролями authInternalUsers - включать только
+    # в доверенной сети
+    MTX_SERVE_CONFIGS: bool = False
+    # REST API для чтения и изменения секций и потоков (/api/...).
+    # Изменяющие запросы не требуют аутентификации - включать только
+    # в доверенной сети
+    MTX_REST_API: bool = False
+    # Удалять при сохранении ключи потоков, совпадающие с pathDefaults
+    MTX_MINIMIZE_ON_SAVE: bool = False
+    # Не писать в mediamtx.yml ключи, равные встроенным значениям mediamtx
+    MTX_YAML_COMPACT: bool = False
+    # Конфигурация mediamtx по умолчанию - таблица встроенных значений
+    MTX_DEFAULTS_FILE: Path = env_dir / "doc/mediamtx01.yml.json"
 
 
 # --- Вспомогательная функция для отладки ---
@@ -0,0 +1,239 @@
+"""Serve the rendered mediamtx configs to fleet nodes over HTTP.
+
+GET /configs/<instance>.yml returns the rendered config of an instance (in
+single-instance mode the only instance is named after MTX_YAML_FILE), and
+GET /configs lists the instances with their ETags. Nodes poll with
+If-None-Match and get 304 while the config is unchanged.
+
+A file is read, hashed and compressed once per change of its stat data;
+configs rendered by the workspace reuse the render hash. Every other
+request only stats the file.
+"""
+
+import gzip
+import hashlib
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Mapping, NamedTuple, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+
+from src.core.config import get_settings
+from src.core.watcher import FileStat
+from src.core.workspace import get_workspace
+
+CONFIG_ROUTE = "/configs"
+MEDIA_TYPE = "application/yaml"
+# Instance names usable in a URL (no separators, no leading dot)
+_NAME_RE = re.compile(r"^[A-Za-z0-9_-][A-Za-z0-9_.-]*$")
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class ConfigEntry(NamedTuple):
+    """A config file as last read, with its strong ETag and gzip body."""
+
+    stat: FileStat
+    digest: str
+    body: bytes
+    gzipped: bytes
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.digest}"'
+
+    @property
+    def gzip_etag(self) -> str:
+        # Each content coding is its own representation with its own tag
+        return f'"{self.digest}-gzip"'
+
+
+class ConfigStore:
+    """Rendered configs by instance name, cached until their file changes.
+
+    Args:
+        locate: File of an instance config (None for unknown instances)
+        names: Names of all instances
+        known_digest: SHA-1 of a file with the given stat if already known
+            (the workspace render cache), saving the hash of the body
+    """
+
+    def __init__(
+        self,
+        locate: Callable[[str], Optional[Path]],
+        names: Callable[[], Iterable[str]],
+        known_digest: Callable[[str, FileStat], Optional[str]] = lambda n, s: None,
+    ):
+        self.locate = locate
+        self.names = names
+        self.known_digest = known_digest
+        self._entries: Dict[str, ConfigEntry] = {}
+        # Number of times a file was (re)read, for monitoring and tests
+        self.loads = 0
+
+    def get(self, name: str) -> Optional[ConfigEntry]:
+        """Current config of an instance, or None if it has none."""
+        path = self.locate(name) if _NAME_RE.match(name) else None
+        if path is None:
+            return None
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            self._entries.pop(name, None)
+            return None
+        entry = self._entries.get(name)
+        if entry is not None and entry.stat == (st.st_mtime_ns, st.st_size):
+            return entry
+        try:
+            with open(path, "rb") as f:
+                # Stat of the opened file: a concurrent atomic replace
+                # cannot pair the new stat with the old body
+                st = os.fstat(f.fileno())
+                body = f.read()
+        except FileNotFoundError:
+            return None
+        stat = (st.st_mtime_ns, st.st_size)
+        digest = self.known_digest(name, stat) or hashlib.sha1(body).hexdigest()
+        entry = ConfigEntry(stat, digest, body, gzip.compress(body, mtime=0))
+        self._entries[name] = entry
+        self.loads += 1
+        return entry
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip."""
+    for coding in accept_encoding.split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() not in ("gzip", "*"):
+            continue
+        q = params.strip().lower()
+        if q.startswith("q="):
+            try:
+                return float(q[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+def parse_range(header: str, length: int) -> Optional[Tuple[int, int]]:
+    """(first, last) byte of a single-range header.
+
+    Returns None to serve the whole body (malformed or multiple ranges) and
+    raises ValueError for a range outside the body.
+    """
+    match = _RANGE_RE.match(header.strip())
+    if match is None or not any(match.groups()):
+        return None
+    first, last = match.groups()
+    if not first:
+        # Suffix range: the last N bytes
+        if int(last) == 0:
+            raise ValueError(header)
+        return max(length - int(last), 0), length - 1
+    first = int(first)
+    last = min(int(last), length - 1) if last else length - 1
+    if first >= length or first > last:
+        raise ValueError(header)
+    return first, last
+
+
+def etag_matches(header: str, etags: Iterable[str]) -> bool:
+    """If-None-Match comparison (weak, so W/ prefixes are ignored)."""
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in tags or not tags.isdisjoint(etags)
+
+
+def config_response(entry: ConfigEntry, headers: Mapping[str, str]) -> Response:
+    """Response to a GET of a config honouring conditional and range headers."""
+    range_header = headers.get("range")
+    use_gzip = not range_header and accepts_gzip(headers.get("accept-encoding", ""))
+    etag = entry.gzip_etag if use_gzip else entry.etag
+    common = {
+        "ETag": etag,
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+        "Accept-Ranges": "bytes",
+    }
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None and etag_matches(
+        if_none_match, (entry.etag, entry.gzip_etag)
+    ):
+        return Response(status_code=304, headers=common)
+    # A Range with a stale If-Range validator gets the whole body
+    if range_header and headers.get("if-range", entry.etag) == entry.etag:
+        try:
+            byte_range = parse_range(range_header, len(entry.body))
+        except ValueError:
+            return Response(
+                status_code=416,
+                headers={**common, "Content-Range": f"bytes */{len(entry.body)}"},
+            )
+        if byte_range is not None:
+            first, last = byte_range
+            return Response(
+                entry.body[first : last + 1],
+                status_code=206,
+                media_type=MEDIA_TYPE,
+                headers={
+                    **common,
+                    "Content-Range": f"bytes {first}-{last}/{len(entry.body)}",
+                },
+            )
+    if use_gzip:
+        return Response(
+            entry.gzipped,
+            media_type=MEDIA_TYPE,
+            headers={**common, "Content-Encoding": "gzip"},
+        )
+    return Response(entry.body, media_type=MEDIA_TYPE, headers=common)
+
+
+def register_config_routes(app: FastAPI, store: ConfigStore) -> None:
+    """Add the config distribution routes to app."""
+
+    def get_config(name: str, request: Request) -> Response:
+        entry = store.get(name)
+        if entry is None:
+            return Response(f"Unknown instance: {name}\n", status_code=404)
+        return config_response(entry, request.headers)
+
+    def list_configs() -> JSONResponse:
+        configs = {}
+        for name in store.names():
+            entry = store.get(name)
+            if entry is not None:
+                configs[name] = {
+                    "url": f"{CONFIG_ROUTE}/{name}.yml",
+                    "etag": entry.etag,
+                    "size": len(entry.body),
+                }
+        return JSONResponse(configs, headers={"Cache-Control": "no-cache"})
+
+    app.add_api_route(CONFIG_ROUTE + "/{name}.yml", get_config, methods=["GET", "HEAD"])
+    app.add_api_route(CONFIG_ROUTE, list_configs, methods=["GET"])
+
+
+@lru_cache()
+def get_config_store() -> ConfigStore:
+    """Store of the workspace instances, or of MTX_YAML_FILE without one."""
+    workspace = get_workspace()
+    if workspace is not None:
+        return ConfigStore(
+            workspace.output_file, workspace.instances, workspace.rendered_digest
+        )
+    yaml_file = Path(get_settings().MTX_YAML_FILE)
+    return ConfigStore(
+        lambda name: yaml_file if name == yaml_file.stem else None,
+        lambda: [yaml_file.stem],
+    )
+
+
+@lru_cache()
+def mount_config_routes() -> None:
+    """Serve the configs from the NiceGUI app (once per process)."""
+    from nicegui import app
+
+    register_config_routes(app, get_config_store())
@@ -0,0 +1,147 @@
+"""Effective configuration of paths: pathDefaults overlaid with path keys.
+
+mediamtx starts every path from pathDefaults and replaces the keys the path
+sets itself (whole values, lists and maps are not merged). A disabled or
+empty pathDefaults section is not written, so nothing is inherited then.
+"""
+
+import json
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, NamedTuple, Optional
+
+from src.core.events import ChangeEvent
+
+PATHS = "paths.json"
+DEFAULTS = "values_pathDefaults.json"
+
+
+def path_defaults(data: Mapping[str, Any]) -> Mapping[str, Any]:
+    """pathDefaults as written to mediamtx.yml ({} if disabled)."""
+    defaults = data.get(DEFAULTS)
+    if not isinstance(defaults, dict) or not data.get(f"{DEFAULTS}_enabled", True):
+        return {}
+    return defaults
+
+
+def effective_config(defaults: Mapping[str, Any], conf: Any) -> Dict[str, Any]:
+    """Config a path resolves to (conf: its entry of paths.json)."""
+    if not isinstance(conf, dict):
+        # A path written as "name:" (null) takes all defaults
+        return dict(defaults)
+    return {**defaults, **conf}
+
+
+def same_value(a: Any, b: Any) -> bool:
+    """Equality of JSON values that also tells true from 1 and 1.0 from 1."""
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(same_value(a[k], b[k]) for k in a)
+    if isinstance(a, list):
+        return len(a) == len(b) and all(map(same_value, a, b))
+    return a == b
+
+
+def redundant_keys(
+    paths: Mapping[str, Any], defaults: Mapping[str, Any]
+) -> Dict[str, list[str]]:
+    """Keys of each path equal to the pathDefaults value (one pass over paths)."""
+    if not defaults:
+        return {}
+    redundant = {}
+    for name, conf in paths.items():
+        if not isinstance(conf, dict):
+            continue
+        keys = [
+            key
+            for key, value in conf.items()
+            if key in defaults and same_value(value, defaults[key])
+        ]
+        if keys:
+            redundant[name] = keys
+    return redundant
+
+
+def stored_size(conf: Any) -> int:
+    """Bytes of a path entry in paths.json as JSONClient writes it (indent 2)."""
+    text = json.dumps(conf, indent=2, ensure_ascii=False)
+    # Entries are nested one level, so every following line is indented by 2
+    return len(text.encode()) + 2 * text.count("\n")
+
+
+class MinimizeReport(NamedTuple):
+    """Outcome of removing per-path keys redundant with pathDefaults."""
+
+    # Paths that had redundant keys, and the keys removed from them
+    paths: int
+    keys: int
+    # Size reduction of paths.json as stored
+    bytes_saved: int
+
+
+class EffectiveResolver:
+    """Memoized effective configs of the paths of live configuration data.
+
+    Feed it the change events of the data (invalidate()): a change of a
+    path drops only that path; a change of a pathDefaults key drops the
+    paths inheriting that key, those overriding it keep their result.
+    Results are read-only views and must not be kept across edits.
+
+    Args:
+        get_data: Current configuration data (sections by file name)
+    """
+
+    def __init__(self, get_data: Callable[[], Mapping[str, Any]]):
+        self.get_data = get_data
+        self._cache: Dict[str, Mapping[str, Any]] = {}
+        # Number of configs computed (not served from the memo), for tests
+        self.computed = 0
+
+    def resolve(self, name: str) -> Optional[Mapping[str, Any]]:
+        """Effective config of a path, or None if there is no such path."""
+        result = self._cache.get(name)
+        if result is not None:
+            return result
+        data = self.get_data()
+        paths = data.get(PATHS)
+        if not isinstance(paths, dict) or name not in paths:
+            return None
+        result = MappingProxyType(effective_config(path_defaults(data), paths[name]))
+        self._cache[name] = result
+        self.computed += 1
+        return result
+
+    def inherited(self, name: str) -> list[str]:
+        """Keys of the effective config of a path taken from pathDefaults."""
+        data = self.get_data()
+        conf = (data.get(PATHS) or {}).get(name)
+        own = conf if isinstance(conf, dict) else {}
+        return [key for key in self.resolve(name) or {} if key not in own]
+
+    def clear(self) -> None:
+        """Forget all results (after the data was replaced as a whole)."""
+        self._cache.clear()
+
+    def invalidate(self, events: list[ChangeEvent]) -> None:
+        """Drop the results affected by change events (manager.subscribe)."""
+        if not self._cache:
+            return
+        for event in events:
+            key = str(event.path[0])
+            if key == PATHS:
+                if len(event.path) == 1:
+                    self._cache.clear()
+                    return
+                self._cache.pop(str(event.path[1]), None)
+            elif key == DEFAULTS and len(event.path) > 1:
+                self._drop_inheriting(str(event.path[1]))
+            elif key in (DEFAULTS, f"{DEFAULTS}_enabled"):
+                self._cache.clear()
+                return
+
+    def _drop_inheriting(self, setting: str) -> None:
+        paths = self.get_data().get(PATHS) or {}
+        for name in list(self._cache):
+            conf = paths.get(name)
+            if not isinstance(conf, dict) or setting not in conf:
+                del self._cache[name]
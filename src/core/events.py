@@ -0,0 +1,180 @@
+"""Fine-grained change events with prefix subscriptions and coalescing."""
+
+import asyncio
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional, Tuple, Union
+
+from src.core.log import logger
+from src.utils.json_utils import EditPath
+
+# Default coalescing window of async subscribers (one UI frame)
+FRAME = 1 / 60
+
+
+class ChangeEvent(NamedTuple):
+    """One change of the configuration data.
+
+    op is SET, DELETE or INSERT (see json_utils); path starts with the
+    section key. value is the new value (None for DELETE).
+    """
+
+    op: str
+    path: Tuple[Any, ...]
+    value: Any = None
+
+    @property
+    def pointer(self) -> str:
+        """JSON-pointer-style location, e.g. "paths.json/cam042/source"."""
+        return to_pointer(self.path)
+
+
+ChangeCallback = Callable[[list[ChangeEvent]], None]
+Prefix = Union[str, EditPath]
+
+
+def to_pointer(path: EditPath) -> str:
+    """Join path parts with "/", escaping "~" and "/" as in RFC 6901."""
+    return "/".join(str(p).replace("~", "~0").replace("/", "~1") for p in path)
+
+
+def from_pointer(pointer: str) -> Tuple[str, ...]:
+    """Split a pointer produced by to_pointer() back into (string) parts."""
+    if not pointer:
+        return ()
+    return tuple(
+        p.replace("~1", "/").replace("~0", "~") for p in pointer.strip("/").split("/")
+    )
+
+
+def _key(prefix: Prefix) -> Tuple[str, ...]:
+    """Subscription key: list indexes and keys are compared as strings."""
+    if isinstance(prefix, str):
+        return from_pointer(prefix)
+    return tuple(str(p) for p in prefix)
+
+
+class _Subscriber:
+    def __init__(self, callback: ChangeCallback, coalesce: bool):
+        self.callback = callback
+        self.coalesce = coalesce
+        # Coalesced events waiting for the next frame, by path
+        self.pending: Dict[Tuple[str, ...], ChangeEvent] = {}
+        # Longest pending path, to skip the search for superseded changes
+        self.depth = 0
+
+
+class EventBus:
+    """Deliver change events to subscribers of a path prefix.
+
+    A subscriber of "paths.json/cam042" receives changes at or below that
+    path and changes of its parents ("paths.json" replaced as a whole).
+    Lookup costs O(path depth + matching subscribers) per event, so many
+    per-row subscriptions stay cheap.
+
+    Subscribers are called synchronously with the list of matching events
+    of each publish() call. With coalesce=True, events are collected and
+    delivered once per frame from the event loop instead; repeated changes
+    of one path are merged into the latest, and a change of a parent
+    replaces pending changes below it.
+    """
+
+    def __init__(self, frame: float = FRAME):
+        self.frame = frame
+        self._subscribers: Dict[Tuple[str, ...], list[_Subscriber]] = {}
+        # Subscribed prefixes below each ancestor prefix
+        self._below: Dict[Tuple[str, ...], set[Tuple[str, ...]]] = {}
+        self._dirty: list[_Subscriber] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+    def subscribe(
+        self, callback: ChangeCallback, prefix: Prefix = "", coalesce: bool = False
+    ) -> None:
+        """Call callback with the events at or above/below prefix."""
+        key = _key(prefix)
+        self._subscribers.setdefault(key, []).append(_Subscriber(callback, coalesce))
+        for i in range(len(key)):
+            self._below.setdefault(key[:i], set()).add(key)
+
+    def unsubscribe(self, callback: ChangeCallback, prefix: Prefix = "") -> None:
+        key = _key(prefix)
+        subscribers = [
+            s for s in self._subscribers.get(key, []) if s.callback != callback
+        ]
+        if subscribers:
+            self._subscribers[key] = subscribers
+            return
+        self._subscribers.pop(key, None)
+        for i in range(len(key)):
+            below = self._below.get(key[:i])
+            if below is not None:
+                below.discard(key)
+                if not below:
+                    del self._below[key[:i]]
+
+    def _matching(self, path: Tuple[str, ...]) -> Iterable[_Subscriber]:
+        for i in range(len(path) + 1):
+            yield from self._subscribers.get(path[:i], ())
+        for key in self._below.get(path, ()):
+            yield from self._subscribers[key]
+
+    def publish(self, events: Iterable[ChangeEvent]) -> None:
+        """Deliver events to the subscribers whose prefix they touch."""
+        batches: Dict[int, Tuple[_Subscriber, list[ChangeEvent]]] = {}
+        for event in events:
+            path = _key(event.path)
+            for subscriber in self._matching(path):
+                if subscriber.coalesce:
+                    self._queue(subscriber, path, event)
+                else:
+                    batches.setdefault(id(subscriber), (subscriber, []))[1].append(
+                        event
+                    )
+        for subscriber, matched in batches.values():
+            self._call(subscriber, matched)
+        if self._dirty:
+            self._schedule_flush()
+
+    def _queue(
+        self, subscriber: _Subscriber, path: Tuple[str, ...], event: ChangeEvent
+    ) -> None:
+        pending = subscriber.pending
+        if not pending:
+            self._dirty.append(subscriber)
+            subscriber.depth = 0
+        if len(path) < subscriber.depth:
+            # A change of a parent supersedes pending changes below it
+            for queued in [p for p in pending if p[: len(path)] == path]:
+                del pending[queued]
+        else:
+            pending.pop(path, None)
+        subscriber.depth = max(subscriber.depth, len(path))
+        # Re-inserted so the order follows the latest change
+        pending[path] = event
+
+    def _schedule_flush(self) -> None:
+        if self._flush_handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop (scripts, tests): deliver right away
+            self.flush()
+            return
+        self._flush_handle = loop.call_later(self.frame, self.flush)
+
+    def flush(self) -> None:
+        """Deliver all coalesced events now."""
+        self._flush_handle = None
+        dirty, self._dirty = self._dirty, []
+        for subscriber in dirty:
+            events = list(subscriber.pending.values())
+            subscriber.pending.clear()
+            if events:
+                self._call(subscriber, events)
+
+    @staticmethod
+    def _call(subscriber: _Subscriber, events: list[ChangeEvent]) -> None:
+        try:
+            subscriber.callback(events)
+        except Exception as e:
+            name = getattr(subscriber.callback, "__name__", subscriber.callback)
+            logger.error(f"Error in change subscriber {name}: {e}", exc_info=True)
@@ -0,0 +1,356 @@
+"""Content-addressed, compressed history of saved configurations."""
+
+import hashlib
+import json
+import os
+import struct
+import threading
+import zlib
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from src.core.log import logger
+from src.utils.diff_utils import ADDED, MODIFIED, REMOVED, Change, diff_values
+
+# Average chunk sizes of the content-defined chunking (must be powers of two)
+PATHS_PER_CHUNK = 64
+YAML_LINES_PER_CHUNK = 256
+MAX_CHUNK_ITEMS = 4096
+
+
+class ObjectStore:
+    """Append-only pack of zlib-compressed objects keyed by content digest.
+
+    objects.pack holds the compressed objects back to back; objects.idx holds
+    fixed-size (digest, offset, length) records and is loaded into memory.
+    Records pointing past the end of the pack (torn writes) are ignored.
+    """
+
+    RECORD = struct.Struct("<20sQI")
+
+    def __init__(self, root: Path):
+        self.pack_file = root / "objects.pack"
+        self.idx_file = root / "objects.idx"
+        self._index: Dict[bytes, Tuple[int, int]] = {}
+        self._lock = threading.Lock()
+        self._load_index()
+
+    def _load_index(self) -> None:
+        try:
+            raw = self.idx_file.read_bytes()
+            pack_size = self.pack_file.stat().st_size
+        except FileNotFoundError:
+            return
+        usable = len(raw) - len(raw) % self.RECORD.size
+        for digest, offset, length in self.RECORD.iter_unpack(raw[:usable]):
+            if offset + length <= pack_size:
+                self._index[digest] = (offset, length)
+
+    def __contains__(self, oid: str) -> bool:
+        return bytes.fromhex(oid) in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def put_many(self, objects: Iterable[bytes]) -> list[str]:
+        """Store objects that are not present yet and return all their ids."""
+        ids: list[str] = []
+        new: Dict[bytes, bytes] = {}
+        for raw in objects:
+            digest = hashlib.blake2b(raw, digest_size=20).digest()
+            ids.append(digest.hex())
+            if digest not in self._index and digest not in new:
+                new[digest] = raw
+        if not new:
+            return ids
+
+        with self._lock:
+            with open(self.pack_file, "ab") as pack, open(self.idx_file, "ab") as idx:
+                offset = pack.tell()
+                records = []
+                for digest, raw in new.items():
+                    blob = zlib.compress(raw, 6)
+                    pack.write(blob)
+                    records.append((digest, offset, len(blob)))
+                    offset += len(blob)
+                pack.flush()
+                os.fsync(pack.fileno())
+                idx.write(b"".join(self.RECORD.pack(*r) for r in records))
+                idx.flush()
+                os.fsync(idx.fileno())
+            for digest, offset, length in records:
+                self._index[digest] = (offset, length)
+        return ids
+
+    def put(self, raw: bytes) -> str:
+        return self.put_many([raw])[0]
+
+    def get_many(self, oids: Iterable[str]) -> Iterator[bytes]:
+        """Yield decompressed objects in the given order."""
+        with open(self.pack_file, "rb") as pack:
+            for oid in oids:
+                offset, length = self._index[bytes.fromhex(oid)]
+                pack.seek(offset)
+                yield zlib.decompress(pack.read(length))
+
+    def get(self, oid: str) -> bytes:
+        return next(self.get_many([oid]))
+
+    @property
+    def size(self) -> int:
+        """Bytes used on disk by the pack and its index."""
+        return sum(
+            f.stat().st_size for f in (self.pack_file, self.idx_file) if f.exists()
+        )
+
+
+def _chunk(items: list, boundary: Iterable[bool]) -> Iterator[list]:
+    """Split items into content-defined chunks ending where boundary is True."""
+    chunk: list = []
+    for item, is_boundary in zip(items, boundary):
+        chunk.append(item)
+        if is_boundary or len(chunk) >= MAX_CHUNK_ITEMS:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class ConfigHistory:
+    """Revision store for mediamtx.yml and its section files.
+
+    Small sections are stored as one object each. paths.json is split into
+    groups of consecutive paths whose boundaries depend on path names only,
+    and mediamtx.yml into groups of lines, so an edit touches one or two
+    chunks and everything else is shared with earlier revisions. Each
+    revision is one line in revisions.jsonl referencing object ids.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.objects = ObjectStore(self.root)
+        self.revisions_file = self.root / "revisions.jsonl"
+        self._revisions: list[Dict[str, Any]] = self._read_revisions()
+        # Sessions save (and commit) from their own worker threads
+        self._lock = threading.Lock()
+
+    def _read_revisions(self) -> list[Dict[str, Any]]:
+        revisions = []
+        try:
+            with open(self.revisions_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        revision = json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.warning("Skipping corrupt revision record in history")
+                        continue
+                    revisions.append(revision)
+        except FileNotFoundError:
+            pass
+        return revisions
+
+    # --- Writing ---
+
+    def _put_json(self, content: Any) -> str:
+        return self.objects.put(
+            json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+        )
+
+    def _put_paths(self, paths: Dict[str, Any]) -> str:
+        names = list(paths)
+        mask = PATHS_PER_CHUNK - 1
+        boundary = (zlib.crc32(name.encode()) & mask == 0 for name in names)
+        chunks = (
+            json.dumps(
+                {name: paths[name] for name in chunk},
+                ensure_ascii=False,
+                separators=(",", ":"),
+            ).encode()
+            for chunk in _chunk(names, boundary)
+        )
+        return self._put_json(self.objects.put_many(chunks))
+
+    def _put_text(self, text: str) -> str:
+        lines = text.splitlines(keepends=True)
+        mask = YAML_LINES_PER_CHUNK - 1
+        boundary = (zlib.crc32(line.encode()) & mask == 0 for line in lines)
+        chunks = ("".join(chunk).encode() for chunk in _chunk(lines, boundary))
+        return self._put_json(self.objects.put_many(chunks))
+
+    def commit(
+        self, data: Dict[str, Any], yaml_text: Optional[str] = None, message: str = ""
+    ) -> int:
+        """Store a revision of the sections (and rendered YAML).
+
+        Returns the new revision number, or the latest one if nothing changed.
+        """
+        sections: Dict[str, str] = {}
+        enabled: Dict[str, bool] = {}
+        for key, content in data.items():
+            if not key.endswith(".json"):
+                continue
+            enabled[key] = bool(data.get(f"{key}_enabled", True))
+            if key == "paths.json" and isinstance(content, dict):
+                sections[key] = self._put_paths(content)
+            else:
+                sections[key] = self._put_json(content)
+        yaml_id = self._put_text(yaml_text) if yaml_text is not None else None
+
+        with self._lock:
+            latest = self._revisions[-1] if self._revisions else None
+            if (
+                latest is not None
+                and latest["sections"] == sections
+                and latest["enabled"] == enabled
+                and latest.get("yaml") == yaml_id
+            ):
+                logger.debug("History: configuration unchanged, no new revision")
+                return latest["rev"]
+
+            revision = {
+                "rev": latest["rev"] + 1 if latest else 1,
+                "time": datetime.now().isoformat(timespec="seconds"),
+                "message": message,
+                "sections": sections,
+                "enabled": enabled,
+                "yaml": yaml_id,
+            }
+            with open(self.revisions_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(revision) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._revisions.append(revision)
+        logger.info(f"History: stored revision {revision['rev']}")
+        return revision["rev"]
+
+    # --- Reading ---
+
+    def revisions(self) -> list[Dict[str, Any]]:
+        """Revision summaries, oldest first."""
+        return [
+            {k: r[k] for k in ("rev", "time", "message")}
+            | {"sections": list(r["sections"])}
+            for r in self._revisions
+        ]
+
+    def get_revision(self, rev: int) -> Dict[str, Any]:
+        for revision in reversed(self._revisions):
+            if revision["rev"] == rev:
+                return revision
+        raise KeyError(f"Unknown revision: {rev}")
+
+    def _get_json(self, oid: str) -> Any:
+        return json.loads(self.objects.get(oid))
+
+    def _get_paths(self, manifest_id: str) -> Dict[str, Any]:
+        paths: Dict[str, Any] = {}
+        for raw in self.objects.get_many(self._get_json(manifest_id)):
+            paths.update(json.loads(raw))
+        return paths
+
+    def load_section(self, rev: int, key: str) -> Any:
+        """Decode one section of a revision."""
+        oid = self.get_revision(rev)["sections"][key]
+        return self._get_paths(oid) if key == "paths.json" else self._get_json(oid)
+
+    def checkout(self, rev: int) -> Dict[str, Any]:
+        """Rebuild the manager data dict (sections and *_enabled flags)."""
+        revision = self.get_revision(rev)
+        data: Dict[str, Any] = {}
+        for key in revision["sections"]:
+            data[key] = self.load_section(rev, key)
+            data[f"{key}_enabled"] = revision["enabled"].get(key, True)
+        return data
+
+    def yaml_text(self, rev: int) -> Optional[str]:
+        """Rendered mediamtx.yml of a revision, if it was stored."""
+        manifest_id = self.get_revision(rev).get("yaml")
+        if manifest_id is None:
+            return None
+        return b"".join(self.objects.get_many(self._get_json(manifest_id))).decode()
+
+    def changed_sections(self, rev_a: int, rev_b: int) -> list[str]:
+        """Sections whose content differs between two revisions (by object id)."""
+        a = self.get_revision(rev_a)["sections"]
+        b = self.get_revision(rev_b)["sections"]
+        return sorted(key for key in a.keys() | b.keys() if a.get(key) != b.get(key))
+
+    def _changed_paths(
+        self, rev_a: int, rev_b: int
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Decode only the paths.json chunks not shared by two revisions."""
+        manifests = []
+        for rev in (rev_a, rev_b):
+            oid = self.get_revision(rev)["sections"].get("paths.json")
+            manifests.append(self._get_json(oid) if oid else [])
+        shared = set(manifests[0]) & set(manifests[1])
+
+        sides = []
+        for manifest in manifests:
+            paths: Dict[str, Any] = {}
+            for raw in self.objects.get_many(c for c in manifest if c not in shared):
+                paths.update(json.loads(raw))
+            sides.append(paths)
+        return sides[0], sides[1]
+
+    def diff_paths(self, rev_a: int, rev_b: int) -> Dict[str, list[str]]:
+        """Added, removed and modified path names between two revisions.
+
+        Chunks shared by both revisions are skipped without decoding.
+        """
+        old, new = self._changed_paths(rev_a, rev_b)
+        # A path moving between chunks shows up on both sides unchanged
+        return {
+            "added": sorted(new.keys() - old.keys()),
+            "removed": sorted(old.keys() - new.keys()),
+            "modified": sorted(k for k in old.keys() & new.keys() if old[k] != new[k]),
+        }
+
+    def diff(self, rev_a: int, rev_b: int) -> list[Change]:
+        """Field-level changes between two revisions.
+
+        Only sections with different object ids are decoded, and of paths.json
+        only the chunks that are not shared.
+        """
+        a, b = self.get_revision(rev_a), self.get_revision(rev_b)
+        changes: list[Change] = []
+        for key in sorted(a["sections"].keys() | b["sections"].keys()):
+            old_id, new_id = a["sections"].get(key), b["sections"].get(key)
+            if old_id == new_id:
+                pass
+            elif old_id is None:
+                changes.append(
+                    Change(ADDED, (key,), None, self.load_section(rev_b, key))
+                )
+            elif new_id is None:
+                changes.append(Change(REMOVED, (key,), self.load_section(rev_a, key)))
+            elif key == "paths.json":
+                old, new = self._changed_paths(rev_a, rev_b)
+                changes.extend(diff_values(old, new, (key,)))
+            else:
+                changes.extend(
+                    diff_values(
+                        self.load_section(rev_a, key),
+                        self.load_section(rev_b, key),
+                        (key,),
+                    )
+                )
+            flag = f"{key}_enabled"
+            old_flag = a["enabled"].get(key, True) if old_id else None
+            new_flag = b["enabled"].get(key, True) if new_id else None
+            if old_id and new_id and old_flag != new_flag:
+                changes.append(Change(MODIFIED, (flag,), old_flag, new_flag))
+        return changes
+
+
+def get_history(root: Path) -> ConfigHistory:
+    """History stored in root, shared by all managers (sessions) of the process."""
+    return _get_history(Path(root).resolve())
+
+
+@lru_cache()
+def _get_history(root: Path) -> ConfigHistory:
+    return ConfigHistory(root)
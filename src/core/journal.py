@@ -0,0 +1,216 @@
+"""Write-ahead journal of configuration edits."""
+
+import json
+import os
+import threading
+import uuid
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from src.core.log import logger
+from src.utils.json_utils import EditPath, apply_edit
+
+# (op, path, value)
+JournalEntry = Tuple[str, list, Any]
+
+
+class EditJournal:
+    """Append-only, line-oriented journal of edits beside MTX_JSON_DIR.
+
+    Every edit is one compact JSON line [op, path, value], flushed and
+    fsynced on append. On startup the journal is replayed over the loaded
+    sections; compaction writes the sections and truncates the journal.
+    """
+
+    def __init__(
+        self, json_dir: Path, journal_file: Optional[Path] = None, fsync: bool = True
+    ):
+        json_dir = Path(json_dir)
+        self.journal_file = journal_file or (
+            json_dir.parent / f".{json_dir.name}.journal"
+        )
+        self.fsync = fsync
+        self.entries = 0
+        self._lock = threading.Lock()
+        self._fh = None
+
+    @staticmethod
+    def encode(op: str, path: EditPath, value: Any = None) -> str:
+        """Journal line of one edit."""
+        return json.dumps([op, list(path), value], ensure_ascii=False, default=str)
+
+    def append(self, op: str, path: EditPath, value: Any = None) -> None:
+        """Durably append one edit."""
+        self.append_lines([self.encode(op, path, value)])
+
+    def append_lines(self, lines: list[str]) -> None:
+        """Durably append encoded edits with a single fsync (group commit)."""
+        if not lines:
+            return
+        with self._lock:
+            if self._fh is None:
+                self._fh = open(self.journal_file, "a", encoding="utf-8")
+            self._fh.write("\n".join(lines) + "\n")
+            self._fh.flush()
+            if self.fsync:
+                os.fsync(self._fh.fileno())
+            self.entries += len(lines)
+
+    def read(self) -> list[JournalEntry]:
+        """Read all journaled edits, ignoring a torn trailing line."""
+        return self._decode(self._lines())
+
+    def _lines(self) -> list[str]:
+        """Non-empty lines of the journal file, the unit truncate() counts."""
+        try:
+            with open(self.journal_file, "r", encoding="utf-8") as f:
+                return [line for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    def _decode(self, lines: list[str]) -> list[JournalEntry]:
+        entries: list[JournalEntry] = []
+        for line_no, line in enumerate(lines, start=1):
+            try:
+                op, path, value = json.loads(line)
+            except (json.JSONDecodeError, ValueError):
+                logger.warning(
+                    f"Skipping corrupt journal line {line_no} in {self.journal_file}"
+                )
+                continue
+            entries.append((op, path, value))
+        return entries
+
+    def replay(
+        self, data: Dict[str, Any], entries: Optional[list[JournalEntry]] = None
+    ) -> int:
+        """Apply journaled edits (or the given entries, one per line) to data.
+
+        Returns:
+            Number of edits applied
+        """
+        if entries is None:
+            lines = self._lines()
+            entries = self._decode(lines)
+            count = len(lines)
+        else:
+            count = len(entries)
+        applied = 0
+        for op, path, value in entries:
+            try:
+                apply_edit(data, op, path, value)
+                applied += 1
+            except (KeyError, IndexError, TypeError, ValueError) as e:
+                logger.warning(f"Cannot replay journal edit {op} {path}: {e}")
+        # The mark of truncate(): lines read, skipped or not
+        self.entries = count
+        return applied
+
+    def truncate(self, count: Optional[int] = None) -> None:
+        """Drop the first count journaled edits (all of them by default).
+
+        Edits appended after count was taken, e.g. while a save was running in
+        another thread, are kept.
+        """
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+            remaining: list[str] = []
+            if count is not None and count < self.entries:
+                remaining = self._lines()[count:]
+            self._replace(remaining)
+
+    def rewrite(self, entries: list[JournalEntry]) -> None:
+        """Atomically replace the journal content with entries."""
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+            self._replace([self.encode(*entry) + "\n" for entry in entries])
+
+    def _replace(self, lines: list[str]) -> None:
+        self.entries = len(lines)
+        if not lines:
+            # No empty files left behind by the journals of past sessions
+            self.journal_file.unlink(missing_ok=True)
+            return
+        tmp_file = self.journal_file.with_name(self.journal_file.name + ".tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_file, self.journal_file)
+
+    def close(self) -> None:
+        """Close the journal file handle."""
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+
+# Files of the session journals opened by this process
+_session_files: set[Path] = set()
+_session_lock = threading.Lock()
+
+
+def get_journal(json_dir: Path) -> EditJournal:
+    """Journal of json_dir for a manager editing it without a session."""
+    return _get_journal(Path(json_dir).resolve())
+
+
+def session_journal(json_dir: Path) -> EditJournal:
+    """New journal of one session editing json_dir.
+
+    Each session journals only its own edits, so a save or compaction of one
+    session never drops the uncommitted edits of another.
+    """
+    json_dir = Path(json_dir).resolve()
+    journal = EditJournal(
+        json_dir,
+        json_dir.parent / f".{json_dir.name}.journal.{uuid.uuid4().hex[:12]}",
+    )
+    with _session_lock:
+        _session_files.add(journal.journal_file)
+    return journal
+
+
+def release_session_journal(journal: EditJournal) -> None:
+    """Stop using the journal of a session that has ended.
+
+    The file is removed if it holds no edits; otherwise it is left for the
+    next start of the application to recover.
+    """
+    journal.close()
+    with _session_lock:
+        _session_files.discard(journal.journal_file)
+    if not journal.read():
+        journal.journal_file.unlink(missing_ok=True)
+
+
+def recoverable_journals(json_dir: Path) -> list[Path]:
+    """Journal files of json_dir not in use by a live session, oldest first.
+
+    These hold the unsaved edits of a previous run of the application.
+    """
+    json_dir = Path(json_dir).resolve()
+    name = f".{json_dir.name}.journal"
+    with _session_lock:
+        live = set(_session_files)
+    files = [
+        file
+        for file in json_dir.parent.glob(name + "*")
+        if (file.name == name or file.name.startswith(name + "."))
+        and not file.name.endswith(".tmp")
+        and file not in live
+    ]
+    return sorted(files, key=lambda file: (file.stat().st_mtime_ns, file.name))
+
+
+@lru_cache()
+def _get_journal(json_dir: Path) -> EditJournal:
+    return EditJournal(json_dir)
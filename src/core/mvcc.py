@@ -0,0 +1,76 @@
+"""Immutable, versioned snapshots of live configuration data."""
+
+import copy
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from src.utils.json_utils import EditPath, get_in, set_in_copy
+
+
+class ConfigSnapshot(NamedTuple):
+    """One published version of the configuration.
+
+    data must be treated as read-only; it shares unchanged containers with
+    other versions and can be read from any thread.
+    """
+
+    version: int
+    data: Dict[str, Any]
+
+
+class SnapshotPublisher:
+    """Publish versions of mutable live data by copying only what changed.
+
+    Writers report the paths they modified with mark_dirty(). publish()
+    starts from the previous version and path-copies the dirty paths from
+    the live data, so a new version costs the size of the changes and
+    readers pinning an older version are never affected.
+    """
+
+    def __init__(self) -> None:
+        self.version = 0
+        self._current: Optional[ConfigSnapshot] = None
+        self._dirty: set[Tuple[Any, ...]] = set()
+
+    def reset(self) -> None:
+        """Copy the live data in full on the next publish (after a reload)."""
+        self._current = None
+        self._dirty.clear()
+
+    def mark_dirty(self, path: EditPath) -> None:
+        """Report a modification of the live data at path."""
+        path = tuple(path)
+        # List items shift on insert/delete, so lists are copied as a whole
+        for i, key in enumerate(path):
+            if isinstance(key, int):
+                path = path[:i]
+                break
+        if path:
+            self._dirty.add(path)
+        else:
+            self.reset()
+
+    def publish(self, live: Dict[str, Any]) -> ConfigSnapshot:
+        """Return the current version, creating a new one if data changed.
+
+        Must be called from the thread that modifies live.
+        """
+        if self._current is not None and not self._dirty:
+            return self._current
+
+        if self._current is None:
+            data = copy.deepcopy(live)
+        else:
+            data = dict(self._current.data)
+            copied = {id(data)}
+            done: set[Tuple[Any, ...]] = set()
+            for path in sorted(self._dirty, key=len):
+                if any(path[:i] in done for i in range(1, len(path))):
+                    # A parent was already copied as a whole
+                    continue
+                set_in_copy(data, path, get_in(live, path), copied)
+                done.add(path)
+
+        self._dirty.clear()
+        self.version += 1
+        self._current = ConfigSnapshot(self.version, data)
+        return self._current
@@ -0,0 +1,218 @@
+"""Copy-on-write session overlays on top of a shared configuration base."""
+
+import copy
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple
+
+from src.core.log import logger
+from src.utils.json_utils import (
+    DELETE,
+    MISSING,
+    SET,
+    EditPath,
+    apply_edit,
+    get_in,
+    set_in_copy,
+)
+
+Path_ = Tuple[Any, ...]
+
+
+class CommitResult(NamedTuple):
+    """Outcome of merging a session overlay into the shared base."""
+
+    version: int
+    applied: list[Path_]
+    conflicts: list[Path_]
+
+
+def _prefixes(path: Path_) -> Iterable[Path_]:
+    """All non-empty prefixes of path, including path itself."""
+    return (path[:i] for i in range(1, len(path) + 1))
+
+
+def _shallow_copy(value: Any) -> Any:
+    return dict(value) if isinstance(value, dict) else list(value)
+
+
+class SharedBase:
+    """Versioned configuration shared by all sessions of the process.
+
+    The base data is never mutated in place. A commit copies only the
+    containers along the changed paths and publishes a new version, so
+    objects handed out earlier stay valid, unchanged snapshots.
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+        self.version = 0
+        # (version, path, author) of every committed change
+        self._log: list[Tuple[int, Path_, Any]] = []
+        self._lock = threading.Lock()
+
+    def changed_since(self, version: int, author: Any = None) -> list[Path_]:
+        """Paths committed by others after the given version, oldest first."""
+        with self._lock:
+            return [
+                path
+                for v, path, by in self._log
+                if v > version and (author is None or by != author)
+            ]
+
+    def commit(
+        self,
+        changes: Dict[Path_, Any],
+        base_version: int,
+        force: bool = False,
+        author: Any = None,
+    ) -> CommitResult:
+        """Merge changes made on top of base_version into a new version.
+
+        A change conflicts when a path committed by another author after
+        base_version is the same as, inside of, or a parent of the changed
+        path and the base now holds a different value there. Conflicting
+        changes are skipped unless force is set. A MISSING value deletes
+        the path.
+        """
+        with self._lock:
+            touched = {
+                path
+                for v, path, by in self._log
+                if v > base_version and (author is None or by != author)
+            }
+            touched_parents = {p for path in touched for p in _prefixes(path)}
+
+            applied: list[Path_] = []
+            conflicts: list[Path_] = []
+            data = dict(self.data)
+            copied = {id(data)}
+            for path, value in changes.items():
+                overlaps = path in touched_parents or any(
+                    p in touched for p in _prefixes(path)
+                )
+                if overlaps and not force and get_in(self.data, path) != value:
+                    conflicts.append(path)
+                    continue
+                # The session keeps editing its own objects, so the base gets copies
+                if not set_in_copy(data, path, value, copied):
+                    conflicts.append(path)
+                    continue
+                applied.append(path)
+
+            if applied:
+                self.version += 1
+                self.data = data
+                self._log.extend((self.version, path, author) for path in applied)
+            return CommitResult(self.version, applied, conflicts)
+
+
+class SessionOverlay:
+    """Per-session view of a SharedBase that copies containers on write.
+
+    data starts as a copy of the base's top-level dict only; sections and
+    nested containers stay shared with the base until own() copies the ones
+    along a path the session is about to modify or bind to. Only the paths
+    the session changed are recorded, and commit() merges them into the base.
+    """
+
+    def __init__(self, base: SharedBase):
+        self.base = base
+        self.base_version = base.version
+        self.data: Dict[str, Any] = dict(base.data)
+        self.changed: set[Path_] = set()
+        # Containers copied by this session, by id (values keep ids alive)
+        self._owned: Dict[int, Any] = {id(self.data): self.data}
+
+    def own(self, path: EditPath) -> Any:
+        """Return the container at path, copying shared ones on the way.
+
+        Missing dicts along the path are created.
+        """
+        container: Any = self.data
+        for key in path:
+            try:
+                child = container[key]
+            except KeyError:
+                child = {}
+            except (IndexError, TypeError):
+                raise KeyError(f"Cannot own {tuple(path)}: missing {key!r}")
+            if not isinstance(child, (dict, list)):
+                raise TypeError(f"Cannot own {tuple(path)}: {key!r} is not a container")
+            if id(child) not in self._owned:
+                child = _shallow_copy(child)
+                self._owned[id(child)] = child
+                container[key] = child
+            container = child
+        return container
+
+    def record(self, path: EditPath) -> None:
+        """Remember that the value at path was changed by this session."""
+        path = tuple(path)
+        if any(p in self.changed for p in _prefixes(path)):
+            # Already covered by a recorded parent
+            return
+        self.changed = {p for p in self.changed if p[: len(path)] != path}
+        self.changed.add(path)
+
+    def changes(self) -> Dict[Path_, Any]:
+        """Current values of the changed paths (MISSING for deletions)."""
+        return {path: get_in(self.data, path) for path in self.changed}
+
+    def commit(self, force: bool = False) -> CommitResult:
+        """Merge this session's changes into the base and pick up other commits."""
+        result = self.base.commit(
+            self.changes(), self.base_version, force, author=id(self)
+        )
+        self.changed.difference_update(result.applied)
+        self.pull()
+        if result.conflicts:
+            logger.warning(f"Commit conflicts: {result.conflicts}")
+        return result
+
+    def pull(self) -> list[Path_]:
+        """Bring changes committed by other sessions into this view.
+
+        Paths that overlap this session's own uncommitted changes are left
+        alone; they are reported as conflicts on the next commit.
+
+        Returns:
+            Paths that were updated
+        """
+        updated: list[Path_] = []
+        skipped = False
+        version = self.base.version
+        for path in self.base.changed_since(self.base_version, author=id(self)):
+            if any(p in self.changed for p in _prefixes(path)) or any(
+                c[: len(path)] == path for c in self.changed
+            ):
+                skipped = True
+                continue
+            value = get_in(self.base.data, path)
+            if get_in(self.data, path) == value:
+                continue
+            parent = self.own(path[:-1])
+            if value is MISSING:
+                apply_edit(parent, DELETE, path[-1:])
+            else:
+                apply_edit(parent, SET, path[-1:], copy.deepcopy(value))
+            updated.append(path)
+        if not skipped:
+            self.base_version = version
+        return updated
+
+
+_bases: Dict[str, SharedBase] = {}
+_bases_lock = threading.Lock()
+
+
+def get_shared_base(json_dir: Path) -> Optional[SharedBase]:
+    """Shared base registered for json_dir, if any."""
+    with _bases_lock:
+        return _bases.get(str(Path(json_dir).resolve()))
+
+
+def publish_shared_base(json_dir: Path, data: Dict[str, Any]) -> SharedBase:
+    """Register data as the shared base for json_dir unless one exists."""
+    with _bases_lock:
+        return _bases.setdefault(str(Path(json_dir).resolve()), SharedBase(data))
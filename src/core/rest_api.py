@@ -0,0 +1,424 @@
+"""REST API over the configuration, mounted on the editor's app.
+
+Routes (JSON bodies; NAME may contain "/"):
+
+    GET    /api/sections              section keys with their ETags
+    GET    /api/sections/KEY          section content
+    PUT    /api/sections/KEY          replace a section
+    GET    /api/streams               page of streams: ?type= &host= &prefix=
+                                      &limit= (max MAX_LIMIT) &cursor= (from
+                                      the previous page's next_cursor)
+    PATCH  /api/streams               batch upsert {name: config, name: null}
+                                      (null deletes); all or nothing
+    GET    /api/streams/NAME          one stream
+    PUT    /api/streams/NAME          create or replace a stream
+    DELETE /api/streams/NAME          remove a stream
+
+Every resource has an ETag from a revision counter bumped by the change
+events of the manager: a stream's tag changes only when that stream
+changes, a section's when anything in it changes, and the stream listing's
+when paths.json changes. GET honours If-None-Match (304); writes honour
+If-Match and If-None-Match: * (412). Writes are journaled at once and saved
+in the background.
+
+Latency targets with 100k streams (p99, checked by
+benchmarks/bench_api.py):
+
+    GET /api/streams page of 100 (any filters)   10 ms
+    conditional GET answered with 304             2 ms
+    GET /api/streams/NAME                          2 ms
+    PUT /api/streams/NAME                         10 ms
+    PATCH /api/streams with 1000 streams         300 ms
+"""
+
+import asyncio
+import base64
+import binascii
+import secrets
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+
+from src.core.distribution import etag_matches
+from src.core.events import ChangeEvent
+from src.core.log import logger
+from src.core.overlay import get_shared_base, publish_shared_base
+from src.core.save_scheduler import SaveScheduler, get_save_lock
+from src.core.stream_index import STREAM_TYPES, StreamIndex
+from src.core.watcher import JsonDirWatcher
+from src.mtx_manager import MtxConfigManager
+
+API_ROUTE = "/api"
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+PATHS = "paths.json"
+
+# Latency targets at 100k streams (p99, seconds), see the module docstring
+LATENCY_TARGETS = {
+    "list": 0.010,
+    "not_modified": 0.002,
+    "get_stream": 0.002,
+    "put_stream": 0.010,
+    "batch_1000": 0.300,
+}
+
+
+class ApiError(Exception):
+    """Error answered with an HTTP status and a JSON message."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def encode_cursor(name: str) -> str:
+    return base64.urlsafe_b64encode(name.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return base64.b64decode(padded, altchars=b"-_", validate=True).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        raise ApiError(400, "Invalid cursor")
+
+
+class Revisions:
+    """Revision counters of sections and streams, fed by change events."""
+
+    def __init__(self) -> None:
+        # Tags of an earlier process must never match the same counters
+        self.epoch = secrets.token_hex(4)
+        self.revision = 0
+        self.sections: Dict[str, int] = {}
+        self.streams: Dict[str, int] = {}
+        # Revision at which paths.json was last replaced as a whole
+        self.paths_reset = 0
+
+    def tag(self, revision: int) -> str:
+        return f'"{self.epoch}.{revision}"'
+
+    def section_tag(self, key: str) -> str:
+        return self.tag(self.sections.get(key, 0))
+
+    def stream_tag(self, name: str) -> str:
+        return self.tag(max(self.streams.get(name, 0), self.paths_reset))
+
+    def record(self, events: list[ChangeEvent]) -> tuple[set[str], bool]:
+        """Bump the revisions of the changed resources.
+
+        Returns:
+            Tuple of (changed stream names, whether paths.json was replaced)
+        """
+        self.revision += 1
+        streams: set[str] = set()
+        replaced = False
+        for event in events:
+            key = str(event.path[0])
+            self.sections[key] = self.revision
+            if key != PATHS:
+                continue
+            if len(event.path) == 1:
+                self.paths_reset = self.revision
+                replaced = True
+            else:
+                name = str(event.path[1])
+                self.streams[name] = self.revision
+                streams.add(name)
+        return streams, replaced
+
+
+def _check_preconditions(
+    headers: Mapping[str, str], etag: Optional[str], exists: bool = True
+) -> None:
+    """Raise 412 unless If-Match / If-None-Match of a write hold."""
+    if_match = headers.get("if-match")
+    if if_match is not None and not (
+        exists and (if_match.strip() == "*" or etag_matches(if_match, [etag]))
+    ):
+        raise ApiError(412, "If-Match precondition failed")
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None and exists:
+        if if_none_match.strip() == "*" or etag_matches(if_none_match, [etag]):
+            raise ApiError(412, "If-None-Match precondition failed")
+
+
+def _json(content: Any, etag: Optional[str] = None, status: int = 200) -> Response:
+    headers = {"Cache-Control": "no-cache"}
+    if etag is not None:
+        headers["ETag"] = etag
+    return JSONResponse(content, status_code=status, headers=headers)
+
+
+def _not_modified(headers: Mapping[str, str], etag: str) -> bool:
+    if_none_match = headers.get("if-none-match")
+    return if_none_match is not None and etag_matches(if_none_match, [etag])
+
+
+class ConfigApi:
+    """REST resources over one MtxConfigManager.
+
+    Handlers run on the event loop (the thread editing the manager). Before
+    each request the manager pulls what UI sessions committed and reloads
+    section files changed on disk.
+    """
+
+    def __init__(
+        self,
+        manager: MtxConfigManager,
+        watcher: Optional[JsonDirWatcher] = None,
+        scheduler: Optional[SaveScheduler] = None,
+    ):
+        self.manager = manager
+        self.watcher = watcher
+        self.scheduler = scheduler
+        self.revisions = Revisions()
+        self.index = StreamIndex(manager.data.get(PATHS, {}))
+        self._saves: set[asyncio.Future] = set()
+        manager.subscribe(self._on_change)
+
+    def _on_change(self, events: list[ChangeEvent]) -> None:
+        streams, replaced = self.revisions.record(events)
+        paths = self.manager.data.get(PATHS, {})
+        if replaced:
+            self.index.rebuild(paths)
+        elif streams:
+            self.index.update_many(streams, paths)
+
+    def sync(self) -> None:
+        """Apply changes made by other sessions and on disk."""
+        self.manager.pull_session()
+        if self.watcher is not None:
+            self.watcher.poll()
+
+    def _save(self) -> None:
+        """Persist the applied write in the background."""
+        if self.scheduler is None:
+            return
+        future = asyncio.ensure_future(self.scheduler.request_save())
+        self._saves.add(future)
+        future.add_done_callback(self._saves.discard)
+
+    @property
+    def paths(self) -> Dict[str, Any]:
+        return self.manager.data.get(PATHS, {})
+
+    # --- sections ---
+    def list_sections(self, headers: Mapping[str, str]) -> Response:
+        data = self.manager.data
+        return _json(
+            {
+                key: {
+                    "etag": self.revisions.section_tag(key),
+                    "enabled": data.get(f"{key}_enabled", True),
+                }
+                for key in data
+                if key.endswith(".json")
+            }
+        )
+
+    def get_section(self, key: str, headers: Mapping[str, str]) -> Response:
+        if key not in self.manager.data or not key.endswith(".json"):
+            raise ApiError(404, f"Unknown section: {key}")
+        etag = self.revisions.section_tag(key)
+        if _not_modified(headers, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        return _json(self.manager.data[key], etag)
+
+    def put_section(self, key: str, body: Any, headers: Mapping[str, str]) -> Response:
+        if key not in self.manager.data or not key.endswith(".json"):
+            raise ApiError(404, f"Unknown section: {key}")
+        _check_preconditions(headers, self.revisions.section_tag(key))
+        if not self.manager.set(key, body):
+            raise ApiError(422, f"Invalid content of {key}")
+        self._save()
+        return _json({"etag": self.revisions.section_tag(key)})
+
+    # --- streams ---
+    def _stream_item(self, name: str) -> Dict[str, Any]:
+        meta = self.index.meta[name]
+        return {
+            "name": name,
+            "type": meta.type,
+            "host": meta.host,
+            "etag": self.revisions.stream_tag(name),
+            "config": self.paths[name],
+        }
+
+    def list_streams(
+        self, params: Mapping[str, str], headers: Mapping[str, str]
+    ) -> Response:
+        etag = self.revisions.section_tag(PATHS)
+        if _not_modified(headers, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        stream_type = params.get("type") or None
+        if stream_type is not None and stream_type not in STREAM_TYPES:
+            raise ApiError(400, f"Unknown type, expected one of {STREAM_TYPES}")
+        try:
+            limit = int(params.get("limit", DEFAULT_LIMIT))
+        except ValueError:
+            raise ApiError(400, "Invalid limit")
+        if not 1 <= limit <= MAX_LIMIT:
+            raise ApiError(400, f"limit must be within 1..{MAX_LIMIT}")
+        cursor = params.get("cursor")
+        page = self.index.query(
+            type=stream_type,
+            host=params.get("host") or None,
+            prefix=params.get("prefix", ""),
+            after=decode_cursor(cursor) if cursor else None,
+            limit=limit,
+        )
+        return _json(
+            {
+                "items": [self._stream_item(name) for name in page.names],
+                "next_cursor": (
+                    encode_cursor(page.next_after) if page.next_after else None
+                ),
+            },
+            etag,
+        )
+
+    def get_stream(self, name: str, headers: Mapping[str, str]) -> Response:
+        if name not in self.paths:
+            raise ApiError(404, f"Unknown stream: {name}")
+        etag = self.revisions.stream_tag(name)
+        if _not_modified(headers, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        return _json(self._stream_item(name), etag)
+
+    def _apply(self, changes: Mapping[str, Any]) -> None:
+        """Upsert (config) or delete (None) streams in one transaction."""
+        for name, config in changes.items():
+            if config is not None and not isinstance(config, dict):
+                raise ApiError(422, f"Config of {name} must be an object")
+        try:
+            with self.manager.batch():
+                for name, config in changes.items():
+                    if config is None:
+                        self.manager.remove_stream(name)
+                    else:
+                        self.manager.put_stream(name, config)
+        except ValueError as e:
+            raise ApiError(422, str(e))
+
+    def put_stream(self, name: str, body: Any, headers: Mapping[str, str]) -> Response:
+        exists = name in self.paths
+        _check_preconditions(headers, self.revisions.stream_tag(name), exists)
+        if body is None:
+            raise ApiError(422, "Stream config must be an object")
+        self._apply({name: body})
+        self._save()
+        return _json(
+            {"etag": self.revisions.stream_tag(name)}, status=200 if exists else 201
+        )
+
+    def delete_stream(self, name: str, headers: Mapping[str, str]) -> Response:
+        if name not in self.paths:
+            raise ApiError(404, f"Unknown stream: {name}")
+        _check_preconditions(headers, self.revisions.stream_tag(name))
+        self._apply({name: None})
+        self._save()
+        return Response(status_code=204)
+
+    def patch_streams(self, body: Any, headers: Mapping[str, str]) -> Response:
+        if not isinstance(body, dict):
+            raise ApiError(422, "Body must map stream names to configs or null")
+        _check_preconditions(headers, self.revisions.section_tag(PATHS))
+        missing = [n for n, c in body.items() if c is None and n not in self.paths]
+        if missing:
+            raise ApiError(404, f"Unknown streams: {', '.join(missing[:10])}")
+        self._apply(body)
+        if body:
+            self._save()
+        deleted = sum(1 for config in body.values() if config is None)
+        return _json(
+            {
+                "upserted": len(body) - deleted,
+                "deleted": deleted,
+                "etag": self.revisions.section_tag(PATHS),
+            }
+        )
+
+
+def register_api_routes(app: FastAPI, api: ConfigApi) -> None:
+    """Add the REST API routes to app."""
+
+    async def body_of(request: Request) -> Any:
+        try:
+            return await request.json()
+        except ValueError:
+            raise ApiError(400, "Body must be JSON")
+
+    def route(method: str, path: str):
+        def decorator(handler):
+            async def endpoint(request: Request) -> Response:
+                try:
+                    api.sync()
+                    return await handler(request, **request.path_params)
+                except ApiError as e:
+                    return _json({"error": str(e)}, status=e.status)
+
+            app.add_api_route(API_ROUTE + path, endpoint, methods=[method])
+            return handler
+
+        return decorator
+
+    @route("GET", "/sections")
+    async def list_sections(request):
+        return api.list_sections(request.headers)
+
+    @route("GET", "/sections/{key}")
+    async def get_section(request, key):
+        return api.get_section(key, request.headers)
+
+    @route("PUT", "/sections/{key}")
+    async def put_section(request, key):
+        return api.put_section(key, await body_of(request), request.headers)
+
+    @route("GET", "/streams")
+    async def list_streams(request):
+        return api.list_streams(request.query_params, request.headers)
+
+    @route("PATCH", "/streams")
+    async def patch_streams(request):
+        return api.patch_streams(await body_of(request), request.headers)
+
+    @route("GET", "/streams/{name:path}")
+    async def get_stream(request, name):
+        return api.get_stream(name, request.headers)
+
+    @route("PUT", "/streams/{name:path}")
+    async def put_stream(request, name):
+        return api.put_stream(name, await body_of(request), request.headers)
+
+    @route("DELETE", "/streams/{name:path}")
+    async def delete_stream(request, name):
+        return api.delete_stream(name, request.headers)
+
+
+@lru_cache()
+def get_config_api() -> ConfigApi:
+    """API over MTX_JSON_DIR, sharing its base with the UI sessions."""
+    manager = MtxConfigManager()
+    base = get_shared_base(manager.json_dir)
+    if base is None:
+        manager.load_data()
+        base = publish_shared_base(manager.json_dir, manager.data)
+    manager.attach_session(base)
+    scheduler = SaveScheduler(
+        manager.save_data,
+        prepare=manager.prepare_save,
+        lock=get_save_lock(manager.json_dir),
+    )
+    logger.info(f"REST API serving {len(manager.data.get(PATHS, {}))} streams")
+    return ConfigApi(manager, JsonDirWatcher(manager), scheduler)
+
+
+@lru_cache()
+def mount_api_routes() -> None:
+    """Serve the REST API from the NiceGUI app (once per process)."""
+    from nicegui import app
+
+    register_api_routes(app, get_config_api())
@@ -0,0 +1,101 @@
+"""Runtime state of the paths of a running mediamtx, polled with a TTL cache."""
+
+import asyncio
+import time
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional
+
+from src.clients.mtx_api_client import get_mtx_api_client
+from src.core.config import get_settings
+from src.core.log import logger
+
+
+class PathStatus(NamedTuple):
+    """State of one path as reported by /v3/paths/list."""
+
+    ready: bool
+    readers: int
+    bytes_received: int
+
+    @classmethod
+    def from_item(cls, item: Dict[str, Any]) -> "PathStatus":
+        readers = item.get("readers") or []
+        return cls(
+            ready=bool(item.get("ready")),
+            readers=len(readers) if isinstance(readers, list) else int(readers),
+            bytes_received=int(item.get("bytesReceived") or 0),
+        )
+
+
+StatusMap = Dict[str, PathStatus]
+
+
+def diff_status(old: StatusMap, new: StatusMap) -> Dict[str, Optional[PathStatus]]:
+    """Paths whose status differs between old and new (None: no longer reported)."""
+    changed: Dict[str, Optional[PathStatus]] = {
+        name: status for name, status in new.items() if old.get(name) != status
+    }
+    changed.update((name, None) for name in old.keys() - new.keys())
+    return changed
+
+
+class StatusPoller:
+    """Fetch path states on demand, sharing results for ttl seconds.
+
+    Every session asks get() on its own timer; all requests within the TTL
+    are served from one fetch, and concurrent callers wait for the fetch
+    already in flight instead of starting their own. On errors the last
+    known states are kept and error is set.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], Awaitable[Dict[str, Dict[str, Any]]]],
+        ttl: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.clock = clock
+        self.status: StatusMap = {}
+        self.fetched_at: Optional[float] = None
+        self.error: Optional[str] = None
+        self._inflight: Optional[asyncio.Future] = None
+
+    def fresh(self) -> bool:
+        return self.fetched_at is not None and self.clock() - self.fetched_at < self.ttl
+
+    async def get(self) -> StatusMap:
+        """Current path states, fetched only when the cached ones expired."""
+        if self.fresh():
+            return self.status
+        if self._inflight is None:
+            self._inflight = asyncio.ensure_future(self._refresh())
+        # Shielded so a cancelled caller does not abort the shared fetch
+        return await asyncio.shield(self._inflight)
+
+    async def _refresh(self) -> StatusMap:
+        try:
+            items = await self.fetch()
+            self.status = {
+                name: PathStatus.from_item(item) for name, item in items.items()
+            }
+            self.error = None
+        except Exception as e:
+            if self.error is None:
+                logger.warning(f"Path status poll failed: {e!r}")
+            self.error = str(e) or repr(e)
+        finally:
+            # Failed polls are cached too, so a dead server is not hammered
+            self.fetched_at = self.clock()
+            self._inflight = None
+        return self.status
+
+
+@lru_cache()
+def get_status_poller() -> Optional[StatusPoller]:
+    """Process-wide poller of the API in MTX_API_URL (None if not configured)."""
+    client = get_mtx_api_client()
+    if client is None:
+        return None
+    return StatusPoller(client.get_paths, ttl=get_settings().MTX_STATUS_TTL)
@@ -0,0 +1,157 @@
+"""Coalescing save scheduler that runs writes off the event loop."""
+
+import asyncio
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, NamedTuple, Optional
+
+from src.core.log import logger
+
+
+class SaveResult(NamedTuple):
+    """Outcome of one save run."""
+
+    ok: bool
+    latency: float  # seconds
+    coalesced: int  # number of save requests served by this run
+    error: Optional[BaseException] = None
+    revision: Any = None  # what save_func returned, e.g. the saved version
+
+
+class SaveScheduler:
+    """Run saves on a worker thread and coalesce bursts of requests.
+
+    Requests arriving while a save is running are merged into a single
+    follow-up save. With autosave_delay > 0, touch() schedules a save once
+    no edits were reported for that many seconds and is_dirty() confirms
+    there is something to save.
+
+    With prepare set, it runs on the event loop before each save and its
+    result (e.g. a pinned snapshot of the data) is passed to save_func, so
+    editing can continue while the worker thread writes.
+
+    With lock set (see get_save_lock()), prepare and save_func of every
+    scheduler sharing it run one at a time and in that order, so the
+    sessions of several operators never write the same files at once and a
+    later save never precedes an earlier one.
+    """
+
+    def __init__(
+        self,
+        save_func: Callable[..., Any],
+        on_done: Optional[Callable[[SaveResult], None]] = None,
+        autosave_delay: float = 0.0,
+        is_dirty: Optional[Callable[[], bool]] = None,
+        prepare: Optional[Callable[[], Any]] = None,
+        lock: Optional[threading.Lock] = None,
+    ):
+        self.save_func = save_func
+        self.prepare = prepare
+        self.lock = lock
+        self.on_done = on_done
+        self.autosave_delay = autosave_delay
+        self.is_dirty = is_dirty
+        self.last_result: Optional[SaveResult] = None
+        self._running = False
+        self._requested = 0
+        self._autosave_task: Optional[asyncio.Task] = None
+
+    @property
+    def is_saving(self) -> bool:
+        """Whether a save is currently running."""
+        return self._running
+
+    async def request_save(self) -> None:
+        """Request a save; returns immediately if one is already running."""
+        self._requested += 1
+        if self._running:
+            logger.debug("Save already running, request coalesced")
+            return
+
+        self._running = True
+        try:
+            while self._requested:
+                coalesced, self._requested = self._requested, 0
+                await self._save_once(coalesced)
+        finally:
+            self._running = False
+
+    async def _save_once(self, coalesced: int) -> None:
+        """Run save_func in a worker thread and report the result."""
+        start = time.perf_counter()
+        error: Optional[BaseException] = None
+        revision = None
+        await self._acquire()
+        try:
+            if self.prepare is not None:
+                revision = await asyncio.to_thread(self.save_func, self.prepare())
+            else:
+                revision = await asyncio.to_thread(self.save_func)
+        except Exception as e:
+            error = e
+            logger.error(f"Save failed: {e}", exc_info=True)
+        finally:
+            if self.lock is not None:
+                self.lock.release()
+
+        result = SaveResult(
+            error is None, time.perf_counter() - start, coalesced, error, revision
+        )
+        self.last_result = result
+        logger.info(
+            f"Save finished in {result.latency * 1000:.0f} ms "
+            f"({coalesced} request(s) coalesced)"
+        )
+        if self.on_done:
+            try:
+                self.on_done(result)
+            except Exception as e:
+                logger.error(f"Error in save callback: {e}")
+
+    async def _acquire(self) -> None:
+        """Wait for the shared lock without blocking the event loop."""
+        if self.lock is None:
+            return
+        acquired = asyncio.ensure_future(asyncio.to_thread(self.lock.acquire))
+        try:
+            await asyncio.shield(acquired)
+        except asyncio.CancelledError:
+            # The worker thread still takes the lock; hand it back then
+            acquired.add_done_callback(lambda _: self.lock.release())
+            raise
+
+    def touch(self) -> None:
+        """Report an edit and restart the autosave quiet-period timer."""
+        if self.autosave_delay <= 0:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        # Only a task that is still waiting is cancelled, never a running save
+        if self._autosave_task is not None:
+            self._autosave_task.cancel()
+        self._autosave_task = loop.create_task(self._autosave())
+
+    async def _autosave(self) -> None:
+        try:
+            await asyncio.sleep(self.autosave_delay)
+        except asyncio.CancelledError:
+            return
+        self._autosave_task = None
+        if self.is_dirty is not None and not self.is_dirty():
+            return
+        logger.debug("Autosave after quiet period")
+        await self.request_save()
+
+
+def get_save_lock(json_dir: Path) -> threading.Lock:
+    """Lock serializing the saves of all sessions editing json_dir."""
+    return _get_save_lock(Path(json_dir).resolve())
+
+
+@lru_cache()
+def _get_save_lock(json_dir: Path) -> threading.Lock:
+    return threading.Lock()
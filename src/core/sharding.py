@@ -0,0 +1,289 @@
+"""Plan how the paths of one config are spread over N mediamtx instances.
+
+Paths are assigned by consistent hashing of their camera host: all paths
+pulling from one camera land on the same instance, so the camera is never
+connected to twice. Each host is placed on the first instance clockwise on a
+hash ring that still has room under a load bound (consistent hashing with
+bounded loads), where transcoding paths weigh more than passthrough ones.
+Adding an instance only moves the hosts it takes over from the others.
+
+Usage:
+    python -m src.core.sharding 4 --out work/shards
+"""
+
+import argparse
+import bisect
+import copy
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Mapping, NamedTuple, Optional
+from urllib.parse import urlsplit
+
+import yaml
+
+from src.clients.yaml_client import build_final_config
+from src.core.config import get_settings
+from src.core.workspace import load_sections
+from src.utils.fs_utils import atomic_write_many
+
+# Relative cost of a path re-encoded by a runOnInit/runOnDemand command
+# versus one whose source is only relayed
+TRANSCODE_WEIGHT = 10.0
+PASSTHROUGH_WEIGHT = 1.0
+# No instance is loaded above LOAD_FACTOR times the average
+LOAD_FACTOR = 1.25
+# Points of each instance on the hash ring
+VIRTUAL_NODES = 64
+# Smallest distance between the ports of neighbouring instances
+MIN_PORT_STEP = 10
+# Path -> instance assignment written next to the configs
+MANIFEST_FILE = "shards.json"
+
+_COMMANDS = ("runOnInit", "runOnDemand")
+_URL_RE = re.compile(r"\b[a-z][a-z0-9+.-]*://[^\s'\"]+", re.IGNORECASE)
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest())
+
+
+def _host(url: str) -> Optional[str]:
+    try:
+        host = urlsplit(url).hostname
+    except ValueError:
+        return None
+    # mediamtx itself (commands re-publishing to it) is not a camera
+    return host if host not in (None, "localhost", "127.0.0.1", "::1") else None
+
+
+def source_host(conf: Any) -> Optional[str]:
+    """Host a path pulls from: its source URL, else the first URL of its
+    runOnInit/runOnDemand command (None for publishers and the like)."""
+    if not isinstance(conf, dict):
+        return None
+    candidates = [conf.get("source")]
+    for command in _COMMANDS:
+        if isinstance(conf.get(command), str):
+            candidates.extend(_URL_RE.findall(conf[command]))
+    for url in candidates:
+        host = _host(url) if isinstance(url, str) else None
+        if host:
+            return host
+    return None
+
+
+def camera_host(name: str, conf: Any) -> str:
+    """Sharding key of a path: its source host; paths without one stand alone."""
+    return source_host(conf) or f"path:{name}"
+
+
+def is_transcoding(conf: Any) -> bool:
+    return isinstance(conf, dict) and any(conf.get(c) for c in _COMMANDS)
+
+
+class HashRing:
+    """Consistent hash ring with VIRTUAL_NODES points per instance."""
+
+    def __init__(self, nodes: Iterable[str], replicas: int = VIRTUAL_NODES):
+        points = sorted(
+            (_hash(f"{node}#{i}"), node) for node in nodes for i in range(replicas)
+        )
+        self._keys = [point for point, _ in points]
+        self._nodes = [node for _, node in points]
+        self.size = len(set(self._nodes))
+
+    def walk(self, key: str) -> Iterator[str]:
+        """Distinct instances clockwise from the position of key."""
+        start = bisect.bisect(self._keys, _hash(key))
+        seen = set()
+        for i in range(len(self._nodes)):
+            node = self._nodes[(start + i) % len(self._nodes)]
+            if node not in seen:
+                seen.add(node)
+                yield node
+                if len(seen) == self.size:
+                    return
+
+
+class ShardPlan(NamedTuple):
+    """Assignment of paths to instances."""
+
+    instances: list[str]
+    # Path name -> instance
+    assignment: Dict[str, str]
+    # Summed path weight per instance
+    loads: Dict[str, float]
+
+    def paths_of(self, instance: str) -> list[str]:
+        return [name for name, node in self.assignment.items() if node == instance]
+
+
+def instance_names(count: int) -> list[str]:
+    return [f"shard-{i}" for i in range(count)]
+
+
+def plan_shards(
+    paths: Mapping[str, Any],
+    count: int,
+    transcode_weight: float = TRANSCODE_WEIGHT,
+    passthrough_weight: float = PASSTHROUGH_WEIGHT,
+    load_factor: float = LOAD_FACTOR,
+) -> ShardPlan:
+    """Assign paths (paths.json content) to count instances."""
+    if count < 1:
+        raise ValueError("At least one instance is required")
+    groups: Dict[str, list[str]] = {}
+    weights: Dict[str, float] = {}
+    for name, conf in paths.items():
+        host = camera_host(name, conf)
+        groups.setdefault(host, []).append(name)
+        weights[host] = weights.get(host, 0.0) + (
+            transcode_weight if is_transcoding(conf) else passthrough_weight
+        )
+
+    instances = instance_names(count)
+    ring = HashRing(instances)
+    loads = dict.fromkeys(instances, 0.0)
+    total = sum(weights.values())
+    capacity = max(load_factor * total / count, max(weights.values(), default=0.0))
+    assignment: Dict[str, str] = {}
+    # A fixed order (not depending on count) keeps the spill-over stable
+    for host in sorted(groups, key=lambda h: (_hash(h), h)):
+        weight = weights[host]
+        target = next(
+            (node for node in ring.walk(host) if loads[node] + weight <= capacity),
+            None,
+        ) or min(instances, key=loads.__getitem__)
+        loads[target] += weight
+        for name in groups[host]:
+            assignment[name] = target
+    return ShardPlan(instances, assignment, loads)
+
+
+def moved_paths(old: Mapping[str, str], new: Mapping[str, str]) -> list[str]:
+    """Paths of both assignments placed on a different instance."""
+    return [name for name, node in new.items() if old.get(name, node) != node]
+
+
+# --- listening ports ---
+def _port(value: Any) -> Optional[int]:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str) and ":" in value:
+        port = value.rsplit(":", 1)[1]
+        if port.isdigit():
+            return int(port)
+    return None
+
+
+def listen_ports(sections: Mapping[str, Any]) -> Dict[tuple[str, str], int]:
+    """Ports of the *Address / *Port settings of the global sections."""
+    ports = {}
+    for key, content in sections.items():
+        if not key.endswith(".json") or key in ("paths.json", "auth.json"):
+            continue
+        if not isinstance(content, dict) or key == "values_pathDefaults.json":
+            continue
+        for setting, value in content.items():
+            if setting.endswith(("Address", "Port")):
+                port = _port(value)
+                if port is not None:
+                    ports[(key, setting)] = port
+    return ports
+
+
+def port_step(ports: Iterable[int], count: int, minimum: int = MIN_PORT_STEP) -> int:
+    """Smallest even step at which count instances use distinct ports.
+
+    Even, so RTP/RTCP port pairs keep their parity.
+    """
+    ports = sorted(set(ports))
+    step = minimum + minimum % 2
+    if not ports:
+        return step
+    while ports[-1] + (count - 1) * step <= 65535:
+        used = {port + i * step for port in ports for i in range(count)}
+        if len(used) == len(ports) * count:
+            return step
+        step += 2
+    raise ValueError(f"Ports {ports} cannot be spread over {count} instances")
+
+
+def _shift(value: Any, offset: int) -> Any:
+    if isinstance(value, int):
+        return value + offset
+    host, port = value.rsplit(":", 1)
+    return f"{host}:{int(port) + offset}"
+
+
+def instance_sections(
+    sections: Mapping[str, Any], plan: ShardPlan, step: Optional[int] = None
+) -> Dict[str, Dict[str, Any]]:
+    """Sections of every instance: its share of paths.json and the listening
+    ports of the global sections moved by step per instance."""
+    ports = listen_ports(sections)
+    if step is None:
+        step = port_step(ports.values(), len(plan.instances))
+    paths = sections.get("paths.json") or {}
+    result = {}
+    for index, instance in enumerate(plan.instances):
+        data = copy.deepcopy(dict(sections))
+        data["paths.json"] = {name: paths[name] for name in plan.paths_of(instance)}
+        for key, setting in ports:
+            data[key][setting] = _shift(data[key][setting], index * step)
+        result[instance] = data
+    return result
+
+
+def read_manifest(out_dir: Path) -> Dict[str, str]:
+    try:
+        return json.loads((Path(out_dir) / MANIFEST_FILE).read_text("utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def write_shards(
+    sections: Mapping[str, Any], plan: ShardPlan, out_dir: Path
+) -> Dict[str, Path]:
+    """Write <instance>.yml for every instance and the manifest to out_dir."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    files = {instance: out_dir / f"{instance}.yml" for instance in plan.instances}
+    contents = {
+        files[instance]: yaml.dump(
+            build_final_config(data),
+            default_flow_style=False,
+            sort_keys=False,
+            allow_unicode=True,
+        )
+        for instance, data in instance_sections(sections, plan).items()
+    }
+    contents[out_dir / MANIFEST_FILE] = json.dumps(plan.assignment, indent=2)
+    atomic_write_many(contents)
+    return files
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("instances", type=int, help="number of instances")
+    parser.add_argument("--json-dir", type=Path, default=None)
+    parser.add_argument("--out", type=Path, required=True)
+    args = parser.parse_args(argv)
+
+    sections = load_sections(args.json_dir or get_settings().MTX_JSON_DIR)
+    previous = read_manifest(args.out)
+    plan = plan_shards(sections.get("paths.json") or {}, args.instances)
+    write_shards(sections, plan, args.out)
+    for instance in plan.instances:
+        print(
+            f"{instance}: {len(plan.paths_of(instance))} paths, "
+            f"load {plan.loads[instance]:.0f}"
+        )
+    if previous:
+        print(f"Moved {len(moved_paths(previous, plan.assignment))} paths")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""On-disk snapshot of decoded and validated section files for fast restarts."""
+
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from src.core.log import logger
+
+# (file name, mtime_ns, size, content digest)
+SectionKey = Tuple[str, int, int, str]
+
+
+class SectionSnapshot(NamedTuple):
+    """Decoded section together with the result of its validation."""
+
+    key: SectionKey
+    content: Any
+    content_hash: str
+    errors: list[str]
+
+
+class SnapshotCache:
+    """Pickle file beside MTX_JSON_DIR holding decoded, validated sections.
+
+    A snapshot is reused only when the (name, mtime, size, digest) key of the
+    section file still matches. The digest is taken from the raw bytes, so a
+    change is detected even when mtime and size are unchanged.
+
+    The cache is a local, trusted file written by this application only.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, json_dir: Path, cache_file: Optional[Path] = None):
+        self.json_dir = Path(json_dir)
+        self.cache_file = cache_file or (
+            self.json_dir.parent / f".{self.json_dir.name}.snapshot"
+        )
+
+    @staticmethod
+    def section_key(path: Path, raw: bytes) -> SectionKey:
+        """Build the cache key of a section file from its stat and raw bytes."""
+        st = path.stat()
+        digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+        return (path.name, st.st_mtime_ns, st.st_size, digest)
+
+    def read(self) -> Dict[str, SectionSnapshot]:
+        """Load cached snapshots; a missing or stale cache file yields {}."""
+        try:
+            with open(self.cache_file, "rb") as f:
+                version, json_dir, snapshots = pickle.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable snapshot cache {self.cache_file}: {e}")
+            return {}
+
+        if version != self.FORMAT_VERSION or json_dir != str(self.json_dir.resolve()):
+            logger.info(f"Snapshot cache {self.cache_file} is outdated, ignoring")
+            return {}
+        return snapshots
+
+    def write(self, snapshots: Dict[str, SectionSnapshot]) -> None:
+        """Atomically replace the cache file with the given snapshots."""
+        tmp_file = self.cache_file.with_name(self.cache_file.name + ".tmp")
+        try:
+            with open(tmp_file, "wb") as f:
+                pickle.dump(
+                    (self.FORMAT_VERSION, str(self.json_dir.resolve()), snapshots),
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            os.replace(tmp_file, self.cache_file)
+            logger.debug(f"Snapshot cache written: {self.cache_file}")
+        except OSError:
+            logger.warning(
+                f"Failed to write snapshot cache {self.cache_file}", exc_info=True
+            )
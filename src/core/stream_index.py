@@ -0,0 +1,180 @@
+"""Sorted index of the streams of paths.json for paginated, filtered reads."""
+
+import bisect
+from typing import Any, Dict, Iterable, Mapping, NamedTuple, Optional, Tuple
+
+from src.core.sharding import source_host
+
+# Stream types a listing can be filtered by
+STREAM_TYPES = ("source", "runOnDemand", "runOnInit", "publisher", "redirect")
+
+
+def stream_type(conf: Any) -> str:
+    """Kind of a stream: how mediamtx obtains its media."""
+    if not isinstance(conf, dict):
+        return "publisher"
+    if conf.get("runOnDemand"):
+        return "runOnDemand"
+    if conf.get("runOnInit"):
+        return "runOnInit"
+    source = conf.get("source", "publisher")
+    if source in ("publisher", "redirect"):
+        return source
+    return "source"
+
+
+class StreamMeta(NamedTuple):
+    type: str
+    host: Optional[str]
+
+
+class StreamPage(NamedTuple):
+    names: list[str]
+    # Last name of the page if more streams match, else None
+    next_after: Optional[str]
+
+
+def _insert(names: list[str], name: str) -> None:
+    i = bisect.bisect_left(names, name)
+    if i == len(names) or names[i] != name:
+        names.insert(i, name)
+
+
+def _remove(names: list[str], name: str) -> None:
+    i = bisect.bisect_left(names, name)
+    if i < len(names) and names[i] == name:
+        del names[i]
+
+
+class StreamIndex:
+    """Stream names kept sorted, with sorted secondary lists by type and host.
+
+    A query walks the shortest list that can satisfy its filters from the
+    cursor position (binary search) and checks the other filters per name,
+    so a page costs O(log n + scanned names) at any offset.
+    """
+
+    # Changes of more streams than this are applied in bulk
+    BULK = 64
+
+    def __init__(self, paths: Optional[Mapping[str, Any]] = None):
+        self.rebuild(paths or {})
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def rebuild(self, paths: Mapping[str, Any]) -> None:
+        self.meta: Dict[str, StreamMeta] = {
+            name: StreamMeta(stream_type(conf), source_host(conf))
+            for name, conf in paths.items()
+        }
+        self.names = sorted(self.meta)
+        self.by_type: Dict[str, list[str]] = {}
+        self.by_host: Dict[str, list[str]] = {}
+        for name in self.names:
+            meta = self.meta[name]
+            self.by_type.setdefault(meta.type, []).append(name)
+            if meta.host is not None:
+                self.by_host.setdefault(meta.host, []).append(name)
+
+    def _unlink(self, name: str, meta: StreamMeta) -> None:
+        _remove(self.by_type[meta.type], name)
+        if meta.host is not None:
+            _remove(self.by_host[meta.host], name)
+            if not self.by_host[meta.host]:
+                del self.by_host[meta.host]
+
+    def update(self, name: str, conf: Any = None, exists: bool = True) -> None:
+        """Index the current config of a stream (exists=False: removed)."""
+        old = self.meta.pop(name, None)
+        if old is not None:
+            self._unlink(name, old)
+        if not exists:
+            if old is not None:
+                _remove(self.names, name)
+            return
+        meta = self.meta[name] = StreamMeta(stream_type(conf), source_host(conf))
+        if old is None:
+            _insert(self.names, name)
+        _insert(self.by_type.setdefault(meta.type, []), name)
+        if meta.host is not None:
+            _insert(self.by_host.setdefault(meta.host, []), name)
+
+    def update_many(self, names: Iterable[str], paths: Mapping[str, Any]) -> None:
+        """Re-index the given streams from paths (missing ones are removed)."""
+        names = set(names)
+        if len(names) <= self.BULK:
+            for name in names:
+                self.update(name, paths.get(name), name in paths)
+            return
+        # Many changes: filter and re-sort each affected list once instead
+        # of shifting it per name (sorting an appended run is linear)
+        removed: Dict[int, Tuple[list[str], set[str]]] = {}
+        added: Dict[int, Tuple[list[str], set[str]]] = {}
+        # Hosts that may have lost their last stream
+        emptied: set[str] = set()
+
+        def mark(marks: Dict[int, Tuple[list[str], set[str]]], names, name):
+            marks.setdefault(id(names), (names, set()))[1].add(name)
+
+        for name in names:
+            old = self.meta.pop(name, None)
+            new = None
+            if name in paths:
+                conf = paths[name]
+                new = self.meta[name] = StreamMeta(stream_type(conf), source_host(conf))
+            if old == new:
+                continue
+            if old is not None:
+                mark(removed, self.by_type[old.type], name)
+                if old.host is not None:
+                    mark(removed, self.by_host[old.host], name)
+                    emptied.add(old.host)
+                if new is None:
+                    mark(removed, self.names, name)
+            if new is not None:
+                mark(added, self.by_type.setdefault(new.type, []), name)
+                if new.host is not None:
+                    mark(added, self.by_host.setdefault(new.host, []), name)
+                if old is None:
+                    mark(added, self.names, name)
+        for names_list, gone in removed.values():
+            names_list[:] = [n for n in names_list if n not in gone]
+        for names_list, new_names in added.values():
+            names_list.extend(new_names)
+            names_list.sort()
+        for host in emptied:
+            if not self.by_host.get(host, True):
+                del self.by_host[host]
+
+    def query(
+        self,
+        type: Optional[str] = None,
+        host: Optional[str] = None,
+        prefix: str = "",
+        after: Optional[str] = None,
+        limit: int = 100,
+    ) -> StreamPage:
+        """Up to limit matching names after the cursor name, in name order."""
+        candidates = [self.names]
+        if type:
+            candidates.append(self.by_type.get(type, []))
+        if host:
+            candidates.append(self.by_host.get(host, []))
+        names = min(candidates, key=len)
+        start = bisect.bisect_left(names, prefix) if prefix else 0
+        if after is not None:
+            start = max(start, bisect.bisect_right(names, after))
+
+        page: list[str] = []
+        for i in range(start, len(names)):
+            name = names[i]
+            if prefix and not name.startswith(prefix):
+                break
+            meta = self.meta[name]
+            if (type and meta.type != type) or (host and meta.host != host):
+                continue
+            if len(page) == limit:
+                return StreamPage(page, page[-1] if page else None)
+            page.append(name)
+        return StreamPage(page, None)
@@ -0,0 +1,136 @@
+"""Undo/redo stack of configuration edits stored as inverse operations."""
+
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, NamedTuple, Optional, Tuple
+
+from src.utils.json_utils import DELETE, INSERT, MISSING, SET, EditPath
+
+
+class Edit(NamedTuple):
+    """One applied edit with the value it replaced (MISSING if none)."""
+
+    op: str
+    path: Tuple[Any, ...]
+    value: Any
+    old_value: Any
+
+
+def inverse(edit: Edit) -> Edit:
+    """Return the edit that reverts the given one."""
+    if edit.op == SET:
+        if edit.old_value is MISSING:
+            return Edit(DELETE, edit.path, None, edit.value)
+        return Edit(SET, edit.path, edit.old_value, edit.value)
+    if edit.op == DELETE:
+        # Removed list items are put back at their index, not over a neighbour
+        op = INSERT if isinstance(edit.path[-1], int) else SET
+        return Edit(op, edit.path, edit.old_value, MISSING)
+    if edit.op == INSERT:
+        return Edit(DELETE, edit.path, None, edit.value)
+    raise ValueError(f"Unsupported edit operation: {edit.op}")
+
+
+class UndoStack:
+    """Bounded undo/redo history.
+
+    Each step is the list of edits of one user action together with the
+    values they replaced. Nothing is copied: replaced values are kept by
+    reference, so memory grows with the size of the changes only.
+    Consecutive SETs of the same field (typing) are merged into one step.
+    """
+
+    def __init__(self, max_depth: int = 100):
+        self.max_depth = max_depth
+        self._undo: deque[list[Edit]] = deque(maxlen=max_depth or None)
+        self._redo: list[list[Edit]] = []
+        self._group: Optional[list[Edit]] = None
+        self._group_depth = 0
+        # Values written by undo/redo that bound UI fields will echo back
+        self._echoes: Dict[Tuple[Any, ...], Any] = {}
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def clear(self) -> None:
+        """Forget all steps, e.g. after sections were replaced from disk."""
+        self._undo.clear()
+        self._redo.clear()
+        self._echoes.clear()
+
+    @contextmanager
+    def group(self) -> Iterator[None]:
+        """Record all edits made inside the block as a single step."""
+        if self._group_depth == 0:
+            self._group = []
+        self._group_depth += 1
+        try:
+            yield
+        finally:
+            self._group_depth -= 1
+            if self._group_depth == 0:
+                step, self._group = self._group, None
+                if step:
+                    self._push(step)
+
+    def is_echo(self, path: EditPath, value: Any) -> bool:
+        """Check (and consume) a UI change that only reflects an undo/redo."""
+        expected = self._echoes.pop(tuple(path), MISSING)
+        return expected is not MISSING and expected == value
+
+    def record(
+        self, op: str, path: EditPath, value: Any = None, old_value: Any = MISSING
+    ) -> None:
+        """Record an applied edit as a new step (or part of the open group)."""
+        if self.max_depth <= 0:
+            return
+        edit = Edit(op, tuple(path), value, old_value)
+        if self._group is not None:
+            self._group.append(edit)
+            return
+        last = self._undo[-1] if self._undo else None
+        if (
+            op == SET
+            and last is not None
+            and len(last) == 1
+            and last[0].op == SET
+            and last[0].path == edit.path
+            and not self._redo
+        ):
+            # Keep the oldest value so one undo reverts the whole typing burst
+            last[0] = last[0]._replace(value=value)
+            return
+        self._push([edit])
+
+    def _push(self, step: list[Edit]) -> None:
+        self._undo.append(step)
+        self._redo.clear()
+
+    def pop_undo(self) -> Optional[list[Edit]]:
+        """Take the last step and return the edits that revert it, in order."""
+        if not self._undo:
+            return None
+        step = self._undo.pop()
+        self._redo.append(step)
+        return self._expect([inverse(edit) for edit in reversed(step)])
+
+    def pop_redo(self) -> Optional[list[Edit]]:
+        """Take the last undone step and return its edits to apply again."""
+        if not self._redo:
+            return None
+        step = self._redo.pop()
+        self._undo.append(step)
+        return self._expect(list(step))
+
+    def expect_echoes(self, values: Dict[Tuple[Any, ...], Any]) -> None:
+        """Ignore UI changes that only reflect values written by the program."""
+        self._echoes.update(values)
+
+    def _expect(self, edits: list[Edit]) -> list[Edit]:
+        self._echoes = {edit.path: edit.value for edit in edits if edit.op == SET}
+        return edits
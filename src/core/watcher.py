@@ -0,0 +1,77 @@
+"""Stat-based watcher for section files in MTX_JSON_DIR."""
+
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+from src.core.log import logger
+
+if TYPE_CHECKING:
+    from src.mtx_manager import MtxConfigManager
+
+# (mtime_ns, size) of a section file
+FileStat = Tuple[int, int]
+
+
+def file_stat(path: Path) -> Optional[FileStat]:
+    """(mtime_ns, size) of a file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def scan_json_dir(json_dir: Path) -> Dict[str, FileStat]:
+    """Collect (mtime_ns, size) for every *.json file in the directory."""
+    stats: Dict[str, FileStat] = {}
+    try:
+        with os.scandir(json_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".json") or not entry.is_file():
+                    continue
+                st = entry.stat()
+                stats[entry.name] = (st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        logger.warning(f"Watched directory not found: {json_dir}")
+    return stats
+
+
+class JsonDirWatcher:
+    """Poll MTX_JSON_DIR with os.scandir and hot-reload changed sections.
+
+    Only stat data is compared on each poll; a file is re-read only when its
+    mtime or size changes, and only that section is merged into the manager.
+    """
+
+    def __init__(self, manager: "MtxConfigManager", json_dir: Optional[Path] = None):
+        self.manager = manager
+        self.json_dir = Path(json_dir or manager.json_dir)
+        self._stats: Dict[str, FileStat] = self.scan()
+
+    def scan(self) -> Dict[str, FileStat]:
+        """Collect (mtime_ns, size) for every *.json file in the directory."""
+        return scan_json_dir(self.json_dir)
+
+    def changed_files(self) -> list[str]:
+        """Return names of files added or modified since the previous scan."""
+        current = self.scan()
+        changed = [
+            name for name, stat in current.items() if self._stats.get(name) != stat
+        ]
+        for name in self._stats.keys() - current.keys():
+            logger.warning(f"Section file removed externally: {name}")
+        self._stats = current
+        return changed
+
+    def poll(self) -> Tuple[list[str], list[str]]:
+        """Reload changed sections into the manager.
+
+        Returns:
+            Tuple of (reloaded keys, keys with conflicts with unsaved local edits)
+        """
+        changed = self.changed_files()
+        if not changed:
+            return [], []
+        logger.debug(f"Detected changes in {self.json_dir}: {changed}")
+        return self.manager.reload_sections(changed)
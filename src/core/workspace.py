@@ -0,0 +1,253 @@
+"""Workspace of several mediamtx instances sharing common section files.
+
+Layout of MTX_WORKSPACE_DIR:
+
+    common/               section files shared by all instances
+    instances/<name>/     per-instance section files overriding common ones
+    out/<name>.yml        rendered mediamtx config of each instance
+"""
+
+import hashlib
+import json
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, NamedTuple, Optional
+
+import yaml
+
+from src.clients.yaml_client import build_final_config
+from src.core.config import get_settings
+from src.core.log import logger
+from src.core.watcher import FileStat, file_stat, scan_json_dir
+from src.utils.fs_utils import atomic_write_many
+
+COMMON_DIR = "common"
+INSTANCES_DIR = "instances"
+OUTPUT_DIR = "out"
+# Input fingerprint of every rendered instance, kept across restarts
+STATE_FILE = ".render_state.json"
+
+
+def load_sections(json_dir: Path) -> Dict[str, Any]:
+    """Read the non-empty *.json section files of a directory."""
+    sections: Dict[str, Any] = {}
+    for json_file in sorted(Path(json_dir).glob("*.json")):
+        try:
+            content = json.loads(json_file.read_bytes())
+        except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+            logger.error(f"Error reading section {json_file}", exc_info=True)
+            continue
+        if content:
+            sections[json_file.name] = content
+    return sections
+
+
+def merge_sections(common: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """Overlay instance sections on the common ones.
+
+    Dict sections are merged key by key (an instance's paths.json adds or
+    replaces single paths, its values_rtsp.json can change one address);
+    other sections are replaced as a whole.
+    """
+    merged = dict(common)
+    for key, content in override.items():
+        base = merged.get(key)
+        if isinstance(base, dict) and isinstance(content, dict):
+            merged[key] = {**base, **content}
+        else:
+            merged[key] = content
+    return merged
+
+
+def render_instance(common_dir: Path, instance_dir: Path, output: Path) -> str:
+    """Render the YAML of one instance to output; returns its SHA-1.
+
+    Runs in a worker process, so it only takes paths and returns a string.
+    """
+    data = merge_sections(load_sections(common_dir), load_sections(instance_dir))
+    text = yaml.dump(
+        build_final_config(data),
+        default_flow_style=False,
+        sort_keys=False,
+        allow_unicode=True,
+    )
+    atomic_write_many({Path(output): text})
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+class RenderReport(NamedTuple):
+    """Outcome of Workspace.render()."""
+
+    rendered: list[str]
+    unchanged: list[str]
+    errors: Dict[str, str]
+    elapsed: float
+
+
+class Workspace:
+    """N mediamtx instances rendered from shared and per-instance sections.
+
+    An instance is re-rendered only when the stat data (mtime, size) of its
+    inputs - the common files and its own overrides - differ from the last
+    render. Stale instances are rendered in parallel on a process pool that
+    is created on first use and reused.
+    """
+
+    def __init__(self, root: Path, workers: Optional[int] = None):
+        self.root = Path(root)
+        self.common_dir = self.root / COMMON_DIR
+        self.instances_dir = self.root / INSTANCES_DIR
+        self.output_dir = self.root / OUTPUT_DIR
+        self.workers = workers or None
+        self._pool: Optional[Executor] = None
+        self._state: Dict[str, str] = self._read_state()
+        # SHA-1 of the YAML last rendered for each instance
+        self.hashes: Dict[str, str] = {}
+        # Stat of each output file right after it was rendered
+        self._output_stats: Dict[str, Optional[FileStat]] = {}
+
+    def instances(self) -> list[str]:
+        """Names of the instance directories, sorted."""
+        if not self.instances_dir.is_dir():
+            return []
+        return sorted(p.name for p in self.instances_dir.iterdir() if p.is_dir())
+
+    def instance_dir(self, name: str) -> Path:
+        return self.instances_dir / name
+
+    def output_file(self, name: str) -> Path:
+        return self.output_dir / f"{name}.yml"
+
+    def load_instance(self, name: str) -> Dict[str, Any]:
+        """Effective sections of an instance (common overlaid with its own)."""
+        return merge_sections(
+            load_sections(self.common_dir), load_sections(self.instance_dir(name))
+        )
+
+    def rendered_digest(self, name: str, stat: FileStat) -> Optional[str]:
+        """SHA-1 of the output of an instance if it still is as rendered."""
+        if self._output_stats.get(name) != stat:
+            return None
+        return self.hashes.get(name)
+
+    def _read_state(self) -> Dict[str, str]:
+        try:
+            return json.loads((self.output_dir / STATE_FILE).read_text("utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _fingerprint(self, name: str, common: str) -> str:
+        own = json.dumps(sorted(scan_json_dir(self.instance_dir(name)).items()))
+        return hashlib.sha1(f"{common}\n{own}".encode()).hexdigest()
+
+    def fingerprints(self, names: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        """Fingerprint of the input files of each instance."""
+        common = json.dumps(sorted(scan_json_dir(self.common_dir).items()))
+        return {
+            name: self._fingerprint(name, common)
+            for name in (self.instances() if names is None else names)
+        }
+
+    def is_stale(self, name: str, fingerprint: str) -> bool:
+        return (
+            self._state.get(name) != fingerprint or not self.output_file(name).exists()
+        )
+
+    def stale(self, names: Optional[Iterable[str]] = None) -> list[str]:
+        """Instances whose inputs changed since they were last rendered."""
+        return [
+            name
+            for name, fingerprint in self.fingerprints(names).items()
+            if self.is_stale(name, fingerprint)
+        ]
+
+    def _executor(self) -> Executor:
+        if self._pool is None:
+            # spawn: the editor process runs threads, which fork does not copy
+            self._pool = ProcessPoolExecutor(
+                self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    def render(
+        self, force: bool = False, names: Optional[Iterable[str]] = None
+    ) -> RenderReport:
+        """Render the instances whose inputs changed (all with force)."""
+        start = time.perf_counter()
+        fingerprints = self.fingerprints(names)
+        stale = [
+            name
+            for name, fingerprint in fingerprints.items()
+            if force or self.is_stale(name, fingerprint)
+        ]
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        jobs = {
+            name: (self.common_dir, self.instance_dir(name), self.output_file(name))
+            for name in stale
+        }
+        results: Dict[str, Any] = {}
+        if len(jobs) == 1:
+            # Not worth a round trip to the pool
+            for name, args in jobs.items():
+                try:
+                    results[name] = render_instance(*args)
+                except Exception as e:
+                    results[name] = e
+        elif jobs:
+            futures = {
+                name: self._executor().submit(render_instance, *args)
+                for name, args in jobs.items()
+            }
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    results[name] = e
+
+        rendered, errors = [], {}
+        for name, result in results.items():
+            if isinstance(result, Exception):
+                errors[name] = str(result) or repr(result)
+                self._state.pop(name, None)
+                logger.error(f"Rendering instance {name} failed: {result!r}")
+                continue
+            rendered.append(name)
+            self.hashes[name] = result
+            self._output_stats[name] = file_stat(self.output_file(name))
+            # Inputs changed during the render are picked up next time
+            self._state[name] = fingerprints[name]
+        if rendered or errors:
+            atomic_write_many(
+                {self.output_dir / STATE_FILE: json.dumps(self._state, indent=2)}
+            )
+
+        report = RenderReport(
+            rendered,
+            [name for name in fingerprints if name not in jobs],
+            errors,
+            time.perf_counter() - start,
+        )
+        logger.info(
+            f"Workspace render: {len(report.rendered)} rendered, "
+            f"{len(report.unchanged)} unchanged, {len(report.errors)} failed "
+            f"in {report.elapsed:.2f}s"
+        )
+        return report
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+@lru_cache()
+def get_workspace() -> Optional[Workspace]:
+    """Workspace in MTX_WORKSPACE_DIR (None in single-instance mode)."""
+    settings = get_settings()
+    if not settings.MTX_WORKSPACE_DIR:
+        return None
+    return Workspace(settings.MTX_WORKSPACE_DIR, settings.MTX_WORKSPACE_WORKERS)
@@ -1,13 +1,34 @@
-from nicegui import ui
+import asyncio
+import json
+from typing import Optional
 
+from nicegui import background_tasks, ui
+
+from src.clients.metrics_client import get_metrics_collector
+from src.clients.source_probe import get_source_prober
 from src.core.config import get_settings
+from src.core.distribution import mount_config_routes
+from src.core.effective import MinimizeReport
 from src.core.log import logger
+from src.core.overlay import get_shared_base, publish_shared_base
+from src.core.rest_api import mount_api_routes
+from src.core.runtime_status import get_status_poller
+from src.core.save_scheduler import SaveResult, SaveScheduler, get_save_lock
+from src.core.workspace import get_workspace
+from src.core.watcher import JsonDirWatcher
 from src.mtx_manager import MtxConfigManager
+from src.utils.json_utils import MISSING
 from ui_components.auth_tab import build_auth_tab
 from ui_components.generic_tab import build_generic_tab
-from ui_components.paths_tab import build_paths_tab
+from ui_components.paths_tab import StreamRowsView, build_paths_tab, format_bytes
 from ui_components.preview_tab import build_preview_tab
 from ui_components.rtsp_tab import build_rtsp_tab
+from ui_components.workspace_tab import build_workspace_tab
+from ui_components.ui_utils import (
+    register_change_listener,
+    register_edit_group,
+    register_owner,
+)
 
 # Tab names mapping
 TAB_NAMES = {
@@ -23,36 +44,145 @@ TAB_NAMES = {
     "preview": "Preview",
 }
 
-# Centralized manager for all configuration data
-config_manager = MtxConfigManager()
+
+def requested_instance() -> Optional[str]:
+    """Workspace instance this session edits (?instance=<name>), None for common."""
+    if workspace is None:
+        return None
+    try:
+        name = ui.context.client.request.query_params.get("instance")
+    except RuntimeError:
+        # No request behind the client (e.g. the initial script run)
+        return None
+    return name if name in workspace.instances() else None
+
+
+workspace = get_workspace()
+edited_instance = requested_instance()
+# Centralized manager for all configuration data; an instance session edits
+# only its override sections, the instance YAML is rendered by the workspace
+config_manager = (
+    MtxConfigManager()
+    if edited_instance is None
+    else MtxConfigManager(
+        json_dir=workspace.instance_dir(edited_instance), render_yaml=False
+    )
+)
+
+
+def on_save_done(result: SaveResult) -> None:
+    """Show the outcome of a background save in the UI."""
+    with header:
+        if result.ok:
+            ui.notify(
+                f"Конфигурация (версия {result.revision}) успешно сохранена! "
+                f"({result.latency * 1000:.0f} мс)",
+                color="positive",
+            )
+            logger.info("Configuration saved successfully")
+            commit = config_manager.last_commit
+            if commit is not None and commit.conflicts:
+                conflicts = ", ".join("/".join(map(str, p)) for p in commit.conflicts)
+                ui.notify(
+                    f"Не сохранено, изменено в другой сессии: {conflicts}",
+                    color="warning",
+                    timeout=10000,
+                )
+            minimized = config_manager.last_minimize
+            if minimized is not None and minimized.keys:
+                # Rows were bound to the dicts the keys were removed from
+                refresh_replaced_sections(["paths.json"])
+                notify_minimized(minimized)
+            merged, conflicted = config_manager.last_merge
+            if merged:
+                ui.notify(
+                    f"Объединено с изменениями на диске: {', '.join(merged)}",
+                    color="info",
+                )
+                refresh_replaced_sections(merged)
+            if conflicted:
+                show_conflicts()
+            if get_settings().MTX_API_DEPLOY:
+                background_tasks.create(deploy_and_notify())
+            if workspace is not None:
+                # Instances whose inputs changed with this save
+                background_tasks.create(render_instances())
+            # Update preview after save
+            background_tasks.create(config_manager.update_preview_async())
+            config_manager.update_diff()
+        else:
+            ui.notify(
+                f"Ошибка при сохранении: {result.error}", color="negative", timeout=5000
+            )
 
 
-def save_and_notify() -> None:
-    """Wrapper to call save function and show UI notification."""
+async def deploy_and_notify() -> None:
+    """Push the saved configuration to the running mediamtx via its API."""
     try:
-        config_manager.save_data()
-        ui.notify("Конфигурация успешно сохранена!", color="positive")
-        logger.info("Configuration saved successfully")
-        # Update preview after save
-        config_manager.update_preview()
+        result = await config_manager.deploy()
     except Exception as e:
-        logger.error(f"Save failed: {e}", exc_info=True)
-        ui.notify(f"Ошибка при сохранении: {e}", color="negative", timeout=5000)
+        logger.error(f"Deploy failed: {e}", exc_info=True)
+        with header:
+            ui.notify(f"Ошибка применения через API: {e}", color="negative")
+        return
+    with header:
+        if result.ok:
+            ui.notify(
+                f"Применено в mediamtx: добавлено {len(result.added)}, "
+                f"изменено {len(result.patched)}, удалено {len(result.deleted)}",
+                color="positive",
+            )
+        else:
+            ui.notify(
+                f"Применено с ошибками ({len(result.errors)}): "
+                + "; ".join(result.errors[:3]),
+                color="warning",
+                timeout=10000,
+            )
+
+
+# Saves run in a worker thread; bursts of requests are coalesced
+save_scheduler = SaveScheduler(
+    config_manager.save_data,
+    on_done=on_save_done,
+    autosave_delay=get_settings().MTX_AUTOSAVE_DELAY,
+    is_dirty=config_manager.has_unsaved_changes,
+    # Pin a snapshot on the event loop; editing continues during the write
+    prepare=config_manager.prepare_save,
+    # Saves of all tabs run one at a time
+    lock=get_save_lock(config_manager.json_dir),
+)
+
+
+async def save_and_notify() -> None:
+    """Queue a save; the result is reported by on_save_done."""
+    await save_scheduler.request_save()
+
 
+def on_config_edited(events: list) -> None:
+    """Restart the autosave timer on configuration edits (once per frame)."""
+    save_scheduler.touch()
 
-def validate_config() -> None:
-    """Validate current configuration and show results in a dialog."""
-    errors = config_manager.validate_all()
+
+async def validate_config() -> None:
+    """Validate a snapshot of the configuration and show results in a dialog."""
+    snapshot = config_manager.snapshot()
+    errors = await asyncio.to_thread(config_manager.validate_all, snapshot)
 
     if not errors:
-        ui.notify("Валидация пройдена успешно!", color="positive")
+        ui.notify(
+            f"Валидация пройдена успешно! (версия {snapshot.version})",
+            color="positive",
+        )
         logger.info("Validation passed")
         return
 
     with ui.dialog() as dialog, ui.card().classes("w-full max-w-2xl"):
         ui.label("Ошибки валидации").classes("text-h6 text-negative mb-4")
         error_count = sum(len(e) for e in errors.values())
-        ui.label(f"Найдено ошибок: {error_count}").classes("mb-4")
+        ui.label(f"Найдено ошибок: {error_count} (версия {snapshot.version})").classes(
+            "mb-4"
+        )
 
         with ui.scroll_area().classes("h-64 border p-2"):
             for location, errs in errors.items():
@@ -66,22 +196,252 @@ def validate_config() -> None:
     dialog.open()
 
 
+def refresh_replaced_sections(keys: list[str]) -> None:
+    """Rebuild tabs whose rows were bound to nested dicts that were replaced."""
+    if "paths.json" in keys and "paths_tab_content" in globals():
+        paths_tab_content.clear()
+        build_paths_tab(
+            paths_tab_content,
+            config_manager.data,
+            stream_rows,
+            probe_sources,
+            config_manager.effective,
+            minimize_paths,
+        )
+    if "auth.json" in keys and "auth_tab_content" in globals():
+        auth_tab_content.clear()
+        build_auth_tab(auth_tab_content, config_manager.data)
+
+
+def undo_edit() -> None:
+    """Revert the last edit step (Ctrl+Z)."""
+    keys = config_manager.undo()
+    if not keys:
+        ui.notify("Нечего отменять", color="info")
+        return
+    refresh_replaced_sections(keys)
+    ui.notify(f"Отменено: {', '.join(keys)}", color="info")
+
+
+def redo_edit() -> None:
+    """Re-apply the last undone edit step (Ctrl+Y)."""
+    keys = config_manager.redo()
+    if not keys:
+        ui.notify("Нечего повторять", color="info")
+        return
+    refresh_replaced_sections(keys)
+    ui.notify(f"Повторено: {', '.join(keys)}", color="info")
+
+
+def minimize_paths() -> None:
+    """Remove per-path keys equal to their pathDefaults value (one undo step)."""
+    try:
+        report = config_manager.minimize_paths()
+    except ValueError as e:
+        ui.notify(f"Ошибка минимизации: {e}", color="negative", timeout=10000)
+        return
+    if not report.keys:
+        ui.notify("Нет ключей, совпадающих с pathDefaults", color="info")
+        return
+    refresh_replaced_sections(["paths.json"])
+    notify_minimized(report)
+
+
+def notify_minimized(report: MinimizeReport) -> None:
+    """Report the keys removed as redundant with pathDefaults."""
+    ui.notify(
+        f"Удалено ключей: {report.keys} в {report.paths} потоках, "
+        f"экономия {format_bytes(report.bytes_saved)}",
+        color="positive",
+    )
+
+
+async def handle_key(e) -> None:
+    """Keyboard shortcuts: Ctrl+S save, Ctrl+Z undo, Ctrl+Y / Ctrl+Shift+Z redo."""
+    if not e.action.keydown or e.action.repeat or not e.modifiers.ctrl:
+        return
+    # Physical key codes also work with a non-Latin keyboard layout
+    if e.key == "KeyS":
+        await save_and_notify()
+    elif e.key == "KeyZ" and not e.modifiers.shift:
+        undo_edit()
+    elif e.key == "KeyY" or (e.key == "KeyZ" and e.modifiers.shift):
+        redo_edit()
+
+
+def show_history() -> None:
+    """List stored revisions and allow restoring one as unsaved edits."""
+    history = config_manager.history
+    if history is None:
+        ui.notify("История конфигураций отключена (MTX_HISTORY)", color="warning")
+        return
+
+    def restore(rev: int) -> None:
+        changed = config_manager.restore_revision(rev)
+        refresh_replaced_sections(changed)
+        config_manager.update_preview()
+        dialog.close()
+        ui.notify(
+            f"Ревизия {rev} восстановлена: {', '.join(changed) or 'без изменений'}. "
+            "Сохраните, чтобы применить.",
+            color="info",
+        )
+
+    revisions = list(reversed(history.revisions()))
+    with ui.dialog() as dialog, ui.card().classes("w-full max-w-2xl"):
+        ui.label("История конфигураций").classes("text-h6 mb-4")
+        ui.label(
+            f"Ревизий: {len(revisions)} | На диске: {history.objects.size / 1024:.0f} КБ"
+        ).classes("mb-4")
+
+        with ui.scroll_area().classes("h-64 border p-2"):
+            for i, revision in enumerate(revisions):
+                rev = revision["rev"]
+                with ui.row().classes("w-full items-center"):
+                    ui.label(f"#{rev}").classes("font-bold")
+                    ui.label(revision["time"]).classes("text-grey-7")
+                    if i + 1 < len(revisions):
+                        changed = history.changed_sections(revisions[i + 1]["rev"], rev)
+                        ui.label(", ".join(changed) or "—").classes("text-sm")
+                    ui.space()
+                    ui.button(
+                        icon="restore", on_click=lambda rev=rev: restore(rev)
+                    ).props("flat dense")
+
+        with ui.row().classes("w-full justify-end mt-4"):
+            ui.button("Закрыть", on_click=dialog.close).props("flat")
+
+    dialog.open()
+
+
+def _format_value(value) -> str:
+    return "удалено" if value is MISSING else json.dumps(value, ensure_ascii=False)
+
+
+def show_conflicts() -> None:
+    """Let the user choose between local and disk values of merge conflicts."""
+    conflicts = [c for cs in config_manager.conflicts.values() for c in cs]
+    if not conflicts:
+        return
+    # Choice per conflict, by index (tuple names mean nested keys to bindings)
+    take_theirs = {str(i): False for i in range(len(conflicts))}
+
+    async def apply() -> None:
+        keys = config_manager.resolve_conflicts(
+            c.path for i, c in enumerate(conflicts) if take_theirs[str(i)]
+        )
+        refresh_replaced_sections(keys)
+        dialog.close()
+        await save_and_notify()
+
+    with (
+        ui.dialog().props("persistent") as dialog,
+        ui.card().classes("w-full max-w-3xl"),
+    ):
+        ui.label("Конфликты с изменениями на диске").classes("text-h6 mb-2")
+        ui.label(
+            "Эти значения изменены и здесь, и в файлах на диске. "
+            "Секции с конфликтами не сохраняются, пока они не разрешены."
+        ).classes("text-grey-7 mb-4")
+
+        with ui.scroll_area().classes("h-64 border p-2"):
+            for i, conflict in enumerate(conflicts):
+                with ui.card().classes("w-full mb-2"):
+                    ui.label("/".join(map(str, conflict.path))).classes("font-bold")
+                    ui.label(f"Здесь: {_format_value(conflict.ours)}").classes(
+                        "text-sm"
+                    )
+                    ui.label(f"На диске: {_format_value(conflict.theirs)}").classes(
+                        "text-sm"
+                    )
+                    ui.toggle(
+                        {False: "Оставить моё", True: "Взять с диска"}
+                    ).bind_value(take_theirs, str(i))
+
+        with ui.row().classes("w-full justify-end mt-4"):
+            ui.button("Применить и сохранить", on_click=apply, color="primary")
+
+    dialog.open()
+
+
+def poll_json_dir() -> None:
+    """Pick up changes saved by other sessions and hot-reload section files."""
+    pulled = config_manager.pull_session()
+    if pulled:
+        ui.notify(f"Изменения из другой сессии: {', '.join(pulled)}", color="info")
+        refresh_replaced_sections(pulled)
+    reloaded, conflicts = json_watcher.poll()
+    if reloaded:
+        ui.notify(f"Перезагружено с диска: {', '.join(reloaded)}", color="info")
+    refresh_replaced_sections(reloaded)
+    if conflicts:
+        show_conflicts()
+
+
+async def poll_path_status() -> None:
+    """Show the runtime state of the streams in the Paths tab rows."""
+    stream_rows.update_status(await status_poller.get())
+
+
+async def poll_metrics() -> None:
+    """Update the throughput sparklines after a new metrics scrape."""
+    version = await metrics_collector.refresh()
+    if version != shown_metrics["version"]:
+        shown_metrics["version"] = version
+        stream_rows.update_metrics(metrics_collector)
+
+
+async def probe_sources() -> None:
+    """Check that the stream sources answer and mark each row with a badge."""
+    ui.notify("Проверка источников...", color="info")
+    run = await stream_rows.probe(
+        config_manager.data.get("paths.json", {}), get_source_prober()
+    )
+    ui.notify(
+        f"Проверено источников: {len(run.results)}, недоступно: {len(run.failed)} "
+        f"({run.rate:.0f} проверок/с)",
+        color="positive" if not run.failed else "warning",
+    )
+
+
 # --- Main UI Setup ---
-config_manager.load_data()
+# Each browser tab runs this script; all tabs edit overlays of one shared base
+shared_base = get_shared_base(config_manager.json_dir)
+if shared_base is None:
+    config_manager.load_data()
+    shared_base = publish_shared_base(config_manager.json_dir, config_manager.data)
+config_manager.attach_session(shared_base)
+# A closed tab leaves no journal behind once its edits are saved
+ui.context.client.on_delete(config_manager.close_session)
 config_manager.update_preview()
+json_watcher = JsonDirWatcher(config_manager)
+status_poller = get_status_poller()
+stream_rows = StreamRowsView()
+metrics_collector = get_metrics_collector()
+# Collector version last drawn in this session
+shown_metrics = {"version": 0}
 
-with ui.header().classes("bg-primary"):
+with ui.header().classes("bg-primary") as header:
     ui.label("Mediamtx Configuration Editor").classes("text-2xl font-bold")
+    if workspace is not None:
+        ui.badge(
+            f"Инстанс: {edited_instance}" if edited_instance else "Общие секции",
+            color="white",
+            text_color="primary",
+        ).classes("ml-4")
     ui.space()
     ui.button(
         "Валидация", on_click=validate_config, icon="check_circle", color="info"
     ).classes("mr-2")
     ui.button(
         "Предпросмотр",
-        on_click=config_manager.update_preview,
+        on_click=config_manager.update_preview_async,
         icon="visibility",
         color="accent",
     ).classes("mr-2")
+    ui.button(
+        "История", on_click=show_history, icon="history", color="secondary"
+    ).classes("mr-2")
     ui.button("Сохранить", on_click=save_and_notify, icon="save", color="positive")
 
 
@@ -100,6 +460,8 @@ with ui.tabs().classes("w-full") as tabs:
 
     # Add Preview tab
     preview_tab = ui.tab("Preview", icon="code")
+    if workspace is not None:
+        ui.tab("Instances", label="Инстансы", icon="dns")
 
 
 with ui.tab_panels(tabs, value=list(TAB_NAMES.values())[0]).classes("w-full"):
@@ -109,7 +471,14 @@ with ui.tab_panels(tabs, value=list(TAB_NAMES.values())[0]).classes("w-full"):
             if filename == "paths.json":
                 with ui.tab_panel(tab_name):
                     paths_tab_content = ui.column().classes("w-full")
-                    build_paths_tab(paths_tab_content, config_manager.data)
+                    build_paths_tab(
+                        paths_tab_content,
+                        config_manager.data,
+                        stream_rows,
+                        probe_sources,
+                        config_manager.effective,
+                        minimize_paths,
+                    )
             elif filename == "auth.json":
                 with ui.tab_panel(tab_name):
                     auth_tab_content = ui.column().classes("w-full")
@@ -123,11 +492,46 @@ with ui.tab_panels(tabs, value=list(TAB_NAMES.values())[0]).classes("w-full"):
 
     # Preview tab panel
     with ui.tab_panel("Preview"):
-        build_preview_tab(config_manager.preview_content, config_manager.update_preview)
+        build_preview_tab(
+            config_manager.preview_content,
+            config_manager.update_preview_async,
+            diff_callback=config_manager.update_diff,
+        )
+
+    if workspace is not None:
+        with ui.tab_panel("Instances"):
+            render_instances = build_workspace_tab(workspace, edited_instance)
 
 
 # Keyboard shortcuts
-ui.keyboard(lambda e: save_and_notify() if e.key == "s" and e.modifiers.ctrl else None)
+ui.keyboard(handle_key)
+
+# UI edits are journaled and reported to observers by the manager
+register_change_listener(config_manager.record_edit)
+# Bulk UI actions are undone as one step
+register_edit_group(config_manager.undo_stack.group)
+# Bound fields edit the session's own copies of shared containers
+register_owner(config_manager.own)
+# Autosave after a quiet period; typing bursts are coalesced per frame
+config_manager.subscribe(on_config_edited, coalesce=True)
+
+# Hot reload of externally changed section files
+if get_settings().MTX_WATCH_INTERVAL > 0:
+    ui.timer(get_settings().MTX_WATCH_INTERVAL, poll_json_dir)
+
+# Runtime state of the streams from the mediamtx API (shared TTL cache)
+if status_poller is not None and get_settings().MTX_STATUS_INTERVAL > 0:
+    ui.timer(get_settings().MTX_STATUS_INTERVAL, poll_path_status)
+
+# Throughput sparklines from the Prometheus metrics (one scrape per interval)
+if metrics_collector is not None:
+    ui.timer(get_settings().MTX_METRICS_INTERVAL, poll_metrics)
+
+# Rendered configs for fleet nodes (routes are added once per process)
+if get_settings().MTX_SERVE_CONFIGS:
+    mount_config_routes()
+if get_settings().MTX_REST_API:
+    mount_api_routes()
 
 
 logger.info("Application started")
@@ -1,7 +1,7 @@
 """Data models and validation schemas using Pydantic."""
 
 import re
-from typing import Any, Dict
+from typing import Any, Dict, Mapping
 from typing import Optional
 
 from pydantic import BaseModel, Field, field_validator, ConfigDict
@@ -83,6 +83,23 @@ class PathsConfig(BaseModel):
         }
 
 
+def check_effective_stream(conf: Mapping[str, Any]) -> list[str]:
+    """Check the effective config of a path (pathDefaults applied).
+
+    These combinations are rejected by mediamtx on load, also when one of
+    the keys is inherited from pathDefaults.
+    """
+    errors = []
+    source = conf.get("source") or "publisher"
+    if conf.get("sourceOnDemand") and source in ("publisher", "redirect"):
+        errors.append(f"'sourceOnDemand' is useless when source is '{source}'")
+    if conf.get("runOnDemand") and source != "publisher":
+        errors.append("'runOnDemand' can be used only when source is 'publisher'")
+    if source == "redirect" and not conf.get("sourceRedirect"):
+        errors.append("'sourceRedirect' is required when source is 'redirect'")
+    return errors
+
+
 class AuthConfig(BaseModel):
     """Authentication configuration."""
 
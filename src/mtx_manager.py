@@ -1,56 +1,879 @@
 """ConfigManager class for centralized data management."""
 
+import asyncio
+import copy
 import json
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
 
 import yaml
 from pydantic import ValidationError
 
 from src.clients.config_clients import get_config_client
+from src.clients.mtx_api_client import DeployResult, get_mtx_api_client
+from src.clients.yaml_client import build_final_config
 from src.core.config import get_settings
+from src.core.effective import (
+    EffectiveResolver,
+    MinimizeReport,
+    path_defaults,
+    redundant_keys,
+    stored_size,
+)
+from src.core.events import ChangeCallback, ChangeEvent, EventBus, Prefix
+from src.core.history import ConfigHistory, get_history
+from src.core.journal import (
+    EditJournal,
+    get_journal,
+    recoverable_journals,
+    release_session_journal,
+    session_journal,
+)
 from src.core.log import logger
-from src.models.check_models import AuthConfig, PathsConfig, RTSPConfig, StreamConfig
+from src.core.mvcc import ConfigSnapshot, SnapshotPublisher
+from src.core.overlay import CommitResult, SessionOverlay, SharedBase
+from src.core.save_scheduler import get_save_lock
+from src.core.snapshot_cache import SectionKey, SectionSnapshot, SnapshotCache
+from src.core.undo import Edit, UndoStack, inverse
+from src.core.watcher import FileStat, file_stat, scan_json_dir
+from src.models.check_models import (
+    AuthConfig,
+    PathsConfig,
+    RTSPConfig,
+    StreamConfig,
+    check_effective_stream,
+)
+from src.utils.diff_utils import (
+    ADDED,
+    REMOVED,
+    Change,
+    Conflict,
+    diff_values,
+    format_diff,
+    merge3,
+)
+from src.utils.json_utils import (
+    DELETE,
+    MISSING,
+    SET,
+    EditPath,
+    apply_edit,
+    get_in,
+    section_hash,
+)
+
+
+class Batch:
+    """Edits collected by MtxConfigManager.batch() until it commits."""
+
+    def __init__(self) -> None:
+        self.edits: list[Edit] = []
+        self.events: list[ChangeEvent] = []
+        # Top-level keys changed, in order of the first change
+        self.keys: list[str] = []
+        # Streams added or updated without validation yet
+        self.streams: set[str] = set()
+        # Journal lines, written with one fsync when the batch commits
+        self.journal: list[str] = []
 
 
 class MtxConfigManager:
     """Centralized configuration manager with validation and observers."""
 
-    def __init__(self, json_dir: Optional[Path] = None):
-        """Initialize ConfigManager."""
+    def __init__(self, json_dir: Optional[Path] = None, render_yaml: bool = True):
+        """Initialize ConfigManager.
+
+        Args:
+            json_dir: Directory of the section files (MTX_JSON_DIR by default)
+            render_yaml: Also write the mediamtx YAML on save; without it only
+                the section files are written and history (which stores the
+                YAML) is off
+        """
         settings = get_settings()
         self.json_dir = json_dir or settings.MTX_JSON_DIR
+        self.render_yaml = render_yaml
         self.data: Dict[str, Any] = {}
-        self.preview_content: Dict[str, Any] = {"yaml": ""}
+        self.preview_content: Dict[str, Any] = {"yaml": "", "diff": "", "version": 0}
         self.observers: list[Callable] = []
+        # Fine-grained change events, see subscribe()
+        self.events = EventBus()
+        # Memoized effective path configs, invalidated by the change events
+        self.effective = EffectiveResolver(lambda: self.data)
+        self.events.subscribe(self.effective.invalidate)
+        # Strip keys redundant with pathDefaults before each save
+        self.minimize_on_save = settings.MTX_MINIMIZE_ON_SAVE
+        self.last_minimize: Optional[MinimizeReport] = None
+        # Omit mediamtx built-in defaults from the rendered YAML
+        self.compact_yaml = settings.MTX_YAML_COMPACT
         self._paths_config: Optional[PathsConfig] = None
+        # Hashes of section contents as last loaded from / saved to disk
+        self._section_hashes: Dict[str, str] = {}
+        # The same sections (read-only) as the base of three-way merges, and
+        # the (mtime, size) of their files to skip re-reading unchanged ones
+        self._merge_base: Dict[str, Any] = {}
+        self._section_stats: Dict[str, FileStat] = {}
+        # Unresolved merge conflicts by section; those sections are not saved
+        self.conflicts: Dict[str, list[Conflict]] = {}
+        self.last_merge: Tuple[list[str], list[str]] = ([], [])
+        self.snapshot_cache: Optional[SnapshotCache] = (
+            SnapshotCache(self.json_dir) if settings.MTX_SNAPSHOT_CACHE else None
+        )
+        self.journal: Optional[EditJournal] = (
+            get_journal(self.json_dir) if settings.MTX_JOURNAL else None
+        )
+        self.journal_compact_every = settings.MTX_JOURNAL_COMPACT_EVERY
+        # Top-level keys touched by journaled edits since the last compaction
+        self._journaled_keys: set[str] = set()
+        # Journal entries and compactions when the last save was prepared
+        self._save_mark: Tuple[int, int] = (0, 0)
+        self._compactions = 0
+        self.history: Optional[ConfigHistory] = (
+            get_history(Path(self.json_dir).parent / "history")
+            if settings.MTX_HISTORY and render_yaml
+            else None
+        )
+        self.undo_stack = UndoStack(settings.MTX_UNDO_DEPTH)
+        # Copy-on-write view of a base shared with other sessions, if attached
+        self.session: Optional[SessionOverlay] = None
+        self.last_commit: Optional[CommitResult] = None
+        # Immutable versions of self.data for readers running off the event loop
+        self._snapshots = SnapshotPublisher()
+        self.saved_version = 0
+        self.last_saved: Optional[ConfigSnapshot] = None
+        # Open transaction of batch(), if any
+        self._batch: Optional[Batch] = None
+
+    def attach_session(self, base: SharedBase) -> None:
+        """Edit a copy-on-write overlay of a shared base instead of own data.
+
+        self.data becomes the session view; containers are copied from the
+        base only when they are modified or bound to UI fields (see own()).
+        """
+        self.session = SessionOverlay(base)
+        self.data = self.session.data
+        if self.journal is not None:
+            # Sessions journal separately; edits recovered into the base by
+            # load_data() move to this session's journal until it saves
+            journal = session_journal(self.json_dir)
+            recovered = self.journal.read()
+            if recovered:
+                journal.rewrite(recovered)
+                self.journal.truncate()
+            self.journal = journal
+        self._paths_config = None
+        self.effective.clear()
+        self.undo_stack.clear()
+        self._snapshots.reset()
+        if not self._section_hashes:
+            self._mark_clean()
+        if not self._merge_base:
+            # The shared base is never modified in place
+            self._merge_base = self._sections(base.data)
+
+    def close_session(self) -> None:
+        """Release the session journal once the client of the session is gone.
+
+        Edits journaled but not saved stay in its file; load_data() of the
+        next start recovers them.
+        """
+        if self.session is not None and self.journal is not None:
+            release_session_journal(self.journal)
+
+    def pull_session(self) -> list[str]:
+        """Apply changes that other sessions committed to the shared base.
+
+        Returns:
+            Top-level keys that were updated
+        """
+        if self.session is None:
+            return []
+        paths = self.session.pull()
+        if not paths:
+            return []
+        # Bound fields will report the pulled values back as edits
+        self.undo_stack.expect_echoes({p: get_in(self.data, p) for p in paths})
+        for path in paths:
+            self._snapshots.mark_dirty(path)
+        keys = sorted({str(p[0]) for p in paths})
+        if "paths.json" in keys:
+            self._paths_config = None
+        for key in keys:
+            self._notify_observers(key, self.data.get(key))
+        self._publish([self._change_to(path) for path in paths])
+        logger.info(f"Pulled {len(paths)} change(s) from other sessions: {keys}")
+        return keys
+
+    def own(self, path: EditPath) -> Any:
+        """Container at path that may be modified in place by this manager."""
+        if self.session is not None:
+            return self.session.own(path)
+        return get_in(self.data, path, None)
+
+    def _touch(self, path: EditPath) -> None:
+        """Prepare an in-place edit at path and record it as a change."""
+        self._snapshots.mark_dirty(path)
+        if self.session is not None:
+            if len(path) > 1:
+                self.session.own(path[:-1])
+            self.session.record(path)
 
     def load_data(self) -> Dict[str, Any]:
         """Load all JSON files into the data dictionary using JSONClient."""
-        # Use JSONClient from config_clients.py
-        json_client = get_config_client("JSON")
-        self.data = json_client.load_config()
+        self._section_stats = scan_json_dir(self.json_dir)
+        if self.snapshot_cache is not None:
+            self._load_from_snapshot()
+        else:
+            # Use JSONClient from config_clients.py
+            json_client = get_config_client("JSON", self.json_dir)
+            self.data = json_client.load_config()
+            self._mark_clean()
+            self._build_paths_config()
 
-        # Initialize PathsConfig with validation
-        if "paths.json" in self.data:
+        self._snapshots.reset()
+        self.effective.clear()
+        self._merge_base = self._sections(self.snapshot().data)
+        self.conflicts.clear()
+        if self.journal is not None:
+            self._replay_journal()
+        self.undo_stack.clear()
+        return self.data
+
+    @staticmethod
+    def _sections(data: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: value for key, value in data.items() if key.endswith(".json")}
+
+    def _replay_journal(self) -> None:
+        """Re-apply edits that were journaled but not yet saved.
+
+        The journals of all sessions of the previous run are replayed and
+        consolidated into this manager's journal.
+        """
+        entries = []
+        stale = []
+        for journal_file in recoverable_journals(self.json_dir):
+            if journal_file == self.journal.journal_file:
+                entries.extend(self.journal.read())
+            else:
+                entries.extend(EditJournal(self.json_dir, journal_file).read())
+                stale.append(journal_file)
+        if not entries:
+            return
+        applied = self.journal.replay(self.data, entries)
+        # One line per entry from here on, without corrupt lines
+        self.journal.rewrite(entries)
+        for journal_file in stale:
+            journal_file.unlink(missing_ok=True)
+        for _, path, _ in entries:
+            self._snapshots.mark_dirty(path)
+        self._journaled_keys = {str(path[0]) for _, path, _ in entries if path}
+        for key in self._journaled_keys:
+            if key.endswith(".json"):
+                self.data.setdefault(f"{key}_enabled", True)
+        self._paths_config = None
+        logger.warning(
+            f"Recovered {applied} unsaved edit(s) from {self.journal.journal_file}"
+        )
+
+    def _load_from_snapshot(self) -> Dict[str, Any]:
+        """Load sections, restoring unchanged ones from the snapshot cache."""
+        cached = self.snapshot_cache.read()
+        self.data, snapshots = self._read_sections(cached)
+
+        hits = sum(1 for name, snap in snapshots.items() if cached.get(name) is snap)
+        logger.info(f"Snapshot cache: {hits}/{len(snapshots)} sections restored")
+        if hits != len(snapshots) or len(cached) != len(snapshots):
+            self.snapshot_cache.write(snapshots)
+
+        self._section_hashes = {
+            name: snap.content_hash for name, snap in snapshots.items()
+        }
+        # Validation results come from the snapshot; the model is built lazily
+        self._paths_config = None
+        if "paths.json" in snapshots and snapshots["paths.json"].errors:
+            logger.error(
+                "Validation error in paths.json: "
+                + "; ".join(snapshots["paths.json"].errors)
+            )
+        return self.data
+
+    def _read_sections(
+        self, cached: Dict[str, SectionSnapshot]
+    ) -> Tuple[Dict[str, Any], Dict[str, SectionSnapshot]]:
+        """Read section files, decoding only those whose snapshot is stale."""
+        data: Dict[str, Any] = {}
+        snapshots: Dict[str, SectionSnapshot] = {}
+        for json_file in Path(self.json_dir).glob("*.json"):
             try:
-                self._paths_config = PathsConfig(
+                raw = json_file.read_bytes()
+            except OSError:
+                logger.error(f"Error reading file {json_file}", exc_info=True)
+                continue
+
+            key = SnapshotCache.section_key(json_file, raw)
+            snapshot = cached.get(json_file.name)
+            if snapshot is None or snapshot.key != key:
+                snapshot = self._decode_section(key, raw)
+                if snapshot is None:
+                    continue
+
+            snapshots[json_file.name] = snapshot
+            data[json_file.name] = snapshot.content
+            data[f"{json_file.name}_enabled"] = True
+        return data, snapshots
+
+    def _decode_section(self, key: SectionKey, raw: bytes) -> Optional[SectionSnapshot]:
+        """Parse and validate one section file."""
+        name = key[0]
+        try:
+            content = json.loads(raw)
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            logger.error(f"Error decoding JSON from {name}", exc_info=True)
+            return None
+        if not content:
+            logger.warning(f"File {name} is empty, skipping.")
+            return None
+
+        errors: list[str] = []
+        if name == "paths.json":
+            _, errors = self._validate_paths(content)
+        return SectionSnapshot(key, content, section_hash(content), errors)
+
+    def _refresh_snapshot(self) -> None:
+        """Re-snapshot section files after they were rewritten by a save."""
+        _, snapshots = self._read_sections({})
+        self.snapshot_cache.write(snapshots)
+        self._section_hashes = {
+            name: snap.content_hash for name, snap in snapshots.items()
+        }
+
+    @staticmethod
+    def _validate_paths(
+        paths: Dict[str, Any],
+    ) -> Tuple[Optional[PathsConfig], list[str]]:
+        """Validate all streams and return the model or the error messages."""
+        try:
+            return (
+                PathsConfig(
                     paths={
-                        name: StreamConfig(**config)
-                        for name, config in self.data["paths.json"].items()
+                        name: StreamConfig(**config) for name, config in paths.items()
                     }
-                )
-            except ValidationError as e:
-                logger.error(f"Validation error in paths.json: {e}")
+                ),
+                [],
+            )
+        except ValidationError as e:
+            return None, [str(err) for err in e.errors()]
+
+    def _build_paths_config(self) -> None:
+        """Initialize PathsConfig with validation from paths.json."""
+        if "paths.json" in self.data:
+            self._paths_config, errors = self._validate_paths(self.data["paths.json"])
+            if errors:
                 # Keep original data but log validation errors
+                logger.error("Validation error in paths.json: " + "; ".join(errors))
 
-        return self.data
+    @property
+    def paths_config(self) -> Optional[PathsConfig]:
+        """Validated paths model, built on first access if not yet available."""
+        if self._paths_config is None:
+            self._build_paths_config()
+        return self._paths_config
+
+    def snapshot(self) -> ConfigSnapshot:
+        """Pin the current version of the data for a reader.
+
+        Must be called from the event loop (the thread editing self.data);
+        the returned data can then be read from any thread while editing
+        continues. A new version is created only if something changed.
+        """
+        return self._snapshots.publish(self.data)
+
+    def prepare_save(self) -> ConfigSnapshot:
+        """Pin the version to save; with a session, commit it to the base first.
+
+        Section files changed on disk since they were loaded are merged in
+        first (see merge_from_disk()); sections with unresolved conflicts are
+        saved with their disk content. Must be called from the event loop.
+        """
+        self.last_merge = self.merge_from_disk()
+        if self.minimize_on_save:
+            self.last_minimize = self.minimize_paths()
+        # Edits journaled from here on are not part of this save
+        self._save_mark = (
+            self.journal.entries if self.journal is not None else 0,
+            self._compactions,
+        )
+        snapshot = self.snapshot()
+        if self.session is not None:
+            # Merge into the shared base and write what all sessions committed
+            self.last_commit = self.session.commit()
+            snapshot = ConfigSnapshot(snapshot.version, self.session.base.data)
+        if self.conflicts:
+            data = dict(snapshot.data)
+            for key in self.conflicts:
+                if key in self._merge_base:
+                    data[key] = self._merge_base[key]
+            snapshot = ConfigSnapshot(snapshot.version, data)
+        return snapshot
+
+    def save_data(self, snapshot: Optional[ConfigSnapshot] = None) -> int:
+        """Save a pinned version of the data using YAMLClient.
+
+        Safe to run in a worker thread when snapshot was taken with
+        prepare_save() on the event loop.
+
+        Returns:
+            Version of the data that was saved
+
+        Raises:
+            OSError: The section files could not be written; nothing is
+                marked saved and the journal keeps the edits
+        """
+        if snapshot is None:
+            # Called directly: also pick up changes made without record_edit()
+            self._snapshots.reset()
+            snapshot = self.prepare_save()
+        data = snapshot.data
+        # Workspace layers only write sections; their YAML is rendered separately
+        yaml_client = get_config_client(
+            "YAML" if self.render_yaml else "JSON", self.json_dir
+        )
+        journaled, compactions = self._save_mark
+        if self.render_yaml and self.compact_yaml:
+            yaml_client.save_config(data, compact=True)
+        else:
+            yaml_client.save_config(data)
+        self._section_stats = scan_json_dir(self.json_dir)
+        self._merge_base = self._sections(data)
+        if self.snapshot_cache is not None:
+            self._refresh_snapshot()
+        else:
+            self._mark_clean(data)
+        # Journaled edits of sections held back by conflicts, or of session
+        # changes the base rejected, are not saved yet; a compaction since
+        # prepare_save() already truncated what it persisted
+        commit_conflicts = self.last_commit is not None and self.last_commit.conflicts
+        if (
+            self.journal is not None
+            and not self.conflicts
+            and not commit_conflicts
+            and compactions == self._compactions
+        ):
+            # Edits journaled before the save are now persisted in the section files
+            self.journal.truncate(journaled)
+            if not self.journal.entries:
+                self._journaled_keys.clear()
+        if self.history is not None:
+            self._commit_history(yaml_client, data)
+        self.saved_version = snapshot.version
+        self.last_saved = ConfigSnapshot(snapshot.version, data)
+        logger.info(
+            f"Configuration version {snapshot.version} saved successfully via YAMLClient"
+        )
+        return snapshot.version
+
+    async def deploy(self, snapshot: Optional[ConfigSnapshot] = None) -> DeployResult:
+        """Apply a version (the last saved by default) to the running mediamtx.
+
+        Only paths and fields that differ from the server's current
+        configuration are sent through its Control API (MTX_API_URL).
+        """
+        client = get_mtx_api_client()
+        if client is None:
+            raise RuntimeError("mediamtx API is not configured (MTX_API_URL)")
+        snapshot = snapshot or self.last_saved or self.snapshot()
+        config = build_final_config(snapshot.data)
+        logger.info(f"Deploying configuration version {snapshot.version} via API")
+        return await client.deploy(config)
+
+    def _commit_history(self, yaml_client: Any, data: Dict[str, Any]) -> None:
+        """Store the saved configuration as a new history revision."""
+        try:
+            yaml_file = getattr(yaml_client, "yaml_file", None)
+            yaml_text = (
+                Path(yaml_file).read_text(encoding="utf-8")
+                if yaml_file is not None and Path(yaml_file).exists()
+                else None
+            )
+            self.history.commit(data, yaml_text=yaml_text)
+        except Exception:
+            # History is best effort and must never fail a save
+            logger.error("Failed to store configuration history", exc_info=True)
+
+    def _mark_clean(self, data: Optional[Dict[str, Any]] = None) -> None:
+        """Remember the given (default: current) sections as the on-disk state."""
+        self._section_hashes = {
+            key: section_hash(content)
+            for key, content in (self.data if data is None else data).items()
+            if key.endswith(".json")
+        }
+
+    def is_section_dirty(self, key: str) -> bool:
+        """Check whether a section has unsaved local edits."""
+        baseline = self._section_hashes.get(key)
+        if baseline is None:
+            return key in self.data
+        return section_hash(self.data.get(key)) != baseline
+
+    def has_unsaved_changes(self) -> bool:
+        """Check whether any section differs from the on-disk state."""
+        return any(
+            self.is_section_dirty(key) for key in self.data if key.endswith(".json")
+        )
 
-    def save_data(self) -> None:
-        """Save all data using YAMLClient."""
-        yaml_client = get_config_client("YAML")
-        yaml_client.save_config(self.data)
-        logger.info("Configuration saved successfully via YAMLClient")
+    def diff_with_disk(self) -> list[Change]:
+        """Field-level changes a save would write to the section files.
+
+        Sections whose content still matches the last loaded/saved state are
+        skipped without reading the disk.
+        """
+        json_client = get_config_client("JSON", self.json_dir)
+        json_dir = Path(self.json_dir)
+        on_disk = (
+            {p.name for p in json_dir.glob("*.json")} if json_dir.exists() else set()
+        )
+        keys = {key for key in self.data if key.endswith(".json")} | on_disk
+
+        changes: list[Change] = []
+        for key in sorted(keys):
+            if key in self.data and not self.is_section_dirty(key):
+                continue
+            disk = json_client.load_section(key) if key in on_disk else None
+            if key not in self.data:
+                changes.append(Change(REMOVED, (key,), disk, None))
+            elif disk is None:
+                changes.append(Change(ADDED, (key,), None, self.data[key]))
+            else:
+                changes.extend(diff_values(disk, self.data[key], (key,)))
+        return changes
+
+    def diff_revisions(self, rev_a: int, rev_b: int) -> list[Change]:
+        """Field-level changes between two stored history revisions."""
+        if self.history is None:
+            raise RuntimeError("Configuration history is disabled")
+        return self.history.diff(rev_a, rev_b)
+
+    def update_diff(self) -> None:
+        """Render the unsaved changes into preview_content["diff"]."""
+        try:
+            self.preview_content["diff"] = format_diff(self.diff_with_disk())
+        except Exception as e:
+            logger.error(f"Error generating diff: {e}", exc_info=True)
+            self.preview_content["diff"] = f"Error generating diff: {e}"
+
+    def merge_from_disk(self) -> Tuple[list[str], list[str]]:
+        """Merge section files changed on disk since they were loaded/saved.
+
+        Files whose (mtime, size) is unchanged are not read at all.
+
+        Returns:
+            Tuple of (merged keys, keys with unresolved conflicts)
+        """
+        stats = scan_json_dir(self.json_dir)
+        changed = [
+            key for key, stat in stats.items() if self._section_stats.get(key) != stat
+        ]
+        if not changed:
+            return [], []
+        return self.reload_sections(changed)
+
+    def reload_sections(self, keys: Iterable[str]) -> Tuple[list[str], list[str]]:
+        """Merge changed section files from disk into the in-memory data.
+
+        Only the given sections are re-read. Sections whose disk content equals
+        the last loaded/saved state (e.g. our own writes) are skipped. Sections
+        without unsaved edits are reloaded in place so UI bindings stay
+        attached. Sections with unsaved edits are merged three-way against the
+        last loaded/saved content: changes to different streams and fields
+        are combined, and values changed on both sides are kept as ours and
+        recorded in self.conflicts until resolve_conflicts() is called.
+
+        Returns:
+            Tuple of (reloaded keys, keys with unresolved conflicts)
+        """
+        json_client = get_config_client("JSON", self.json_dir)
+        reloaded: list[str] = []
+        replaced: list[str] = []
+        conflicts: list[str] = []
+
+        for key in keys:
+            stat = file_stat(Path(self.json_dir) / key)
+            if stat is not None and stat == self._section_stats.get(key):
+                # The file as this manager last loaded or saved it
+                continue
+            content = json_client.load_section(key)
+            if content is None:
+                continue
+            if stat is not None:
+                self._section_stats[key] = stat
+
+            disk_hash = section_hash(content)
+            if disk_hash == self._section_hashes.get(key):
+                continue
+            if disk_hash == section_hash(self.data.get(key)):
+                # Disk already holds our in-memory state (e.g. journal compaction)
+                continue
+
+            if self.is_section_dirty(key):
+                result = merge3(
+                    self._merge_base.get(key, MISSING),
+                    self.data.get(key, MISSING),
+                    content,
+                    (key,),
+                )
+                self._apply_edits(
+                    [self._edit_to(path, value) for path, value in result.theirs],
+                    record=False,
+                )
+                self._merge_base[key] = content
+                if result.conflicts:
+                    self.conflicts[key] = result.conflicts
+                    conflicts.append(key)
+                    logger.warning(
+                        f"{key} changed on disk: {len(result.conflicts)} conflict(s) "
+                        "with unsaved local edits"
+                    )
+                else:
+                    self.conflicts.pop(key, None)
+                logger.info(f"Merged {len(result.theirs)} change(s) to {key} from disk")
+            else:
+                self._replace_section(key, content)
+                self.conflicts.pop(key, None)
+                self._notify_observers(key, self.data[key])
+                self._publish([ChangeEvent(SET, (key,), self.data[key])])
+                replaced.append(key)
+                logger.info(f"Reloaded {key} from disk")
+            self._section_hashes[key] = disk_hash
+            reloaded.append(key)
+
+        if replaced:
+            # The live sections share containers with content; keep copies
+            snapshot = self.snapshot()
+            for key in replaced:
+                self._merge_base[key] = snapshot.data[key]
+            # Undo steps may refer to values that were just replaced
+            self.undo_stack.clear()
+        stale = self._journaled_keys.intersection(replaced)
+        if stale and self.session is not None:
+            # Journaled edits of reloaded sections are stale now
+            self._drop_journaled(stale)
+        elif stale:
+            self.compact_journal()
+        return reloaded, conflicts
+
+    def _edit_to(self, path: Tuple[Any, ...], value: Any) -> Edit:
+        """Edit that sets path to a copy of value (deletes it for MISSING)."""
+        old_value = get_in(self.data, path)
+        if value is MISSING:
+            return Edit(DELETE, path, None, old_value)
+        return Edit(SET, path, copy.deepcopy(value), old_value)
+
+    def resolve_conflicts(self, take_theirs: Iterable[EditPath] = ()) -> list[str]:
+        """Resolve all merge conflicts as one undoable step.
+
+        Conflicting values at the given paths are replaced by the disk
+        version; all others keep the local edits. The sections are saved
+        normally from then on.
+
+        Returns:
+            Top-level keys that were changed
+        """
+        take = {tuple(path) for path in take_theirs}
+        edits = [
+            self._edit_to(conflict.path, conflict.theirs)
+            for conflicts in self.conflicts.values()
+            for conflict in conflicts
+            if conflict.path in take
+        ]
+        self.conflicts.clear()
+        with self.undo_stack.group():
+            keys = self._apply_edits(edits)
+        logger.info(f"Resolved merge conflicts, {len(edits)} taken from disk")
+        return keys
+
+    def _replace_section(self, key: str, content: Any) -> None:
+        """Replace a section, updating dicts in place so UI bindings stay attached."""
+        current = self.data.get(key)
+        self._snapshots.mark_dirty((key,))
+        if self.session is not None:
+            self.session.record((key,))
+            if isinstance(current, dict):
+                current = self.session.own((key,))
+        if isinstance(current, dict) and isinstance(content, dict):
+            current.clear()
+            current.update(content)
+        else:
+            self.data[key] = content
+        self.data.setdefault(f"{key}_enabled", True)
+        if key == "paths.json":
+            self._build_paths_config()
+
+    def restore_revision(self, rev: int) -> list[str]:
+        """Restore sections from a stored history revision as unsaved edits.
+
+        Returns:
+            Keys of the sections that changed
+        """
+        if self.history is None:
+            raise RuntimeError("Configuration history is disabled")
+
+        revision = self.history.checkout(rev)
+        changed: list[str] = []
+        with self.undo_stack.group():
+            for key, content in revision.items():
+                if key.endswith("_enabled"):
+                    if self.data.get(key) != content:
+                        self._apply_edits(
+                            [Edit(SET, (key,), content, self.data.get(key))]
+                        )
+                    continue
+                if key in self.data and section_hash(self.data[key]) == section_hash(
+                    content
+                ):
+                    continue
+                old = self.data.get(key, MISSING)
+                # A shallow copy survives the in-place replacement
+                old = dict(old) if isinstance(old, dict) else old
+                self._apply_edits([Edit(SET, (key,), content, old)])
+                changed.append(key)
+
+        logger.info(f"Restored revision {rev}: {changed or 'no changes'}")
+        return changed
+
+    def _apply_edits(self, edits: list[Edit], record: bool = True) -> list[str]:
+        """Apply edits to self.data, journal them and notify observers.
+
+        Whole sections are replaced in place so UI bindings stay attached.
+
+        Returns:
+            Top-level keys that were changed
+        """
+        keys: list[str] = []
+        for edit in edits:
+            key = str(edit.path[0])
+            if edit.op == SET and len(edit.path) == 1 and key.endswith(".json"):
+                self._replace_section(key, edit.value)
+            else:
+                self._touch(edit.path)
+                apply_edit(self.data, edit.op, edit.path, edit.value)
+                if key == "paths.json":
+                    # Rebuilt lazily on next access
+                    self._paths_config = None
+            self._journal_edit(edit.op, edit.path, edit.value)
+            if record:
+                self._record(*edit)
+            if key not in keys:
+                keys.append(key)
+        for key in keys:
+            self._notify_observers(key, self.data.get(key))
+        self._publish([ChangeEvent(edit.op, edit.path, edit.value) for edit in edits])
+        return keys
+
+    def undo(self) -> list[str]:
+        """Revert the last edit step and return the changed top-level keys."""
+        edits = self.undo_stack.pop_undo()
+        if edits is None:
+            return []
+        keys = self._apply_edits(edits, record=False)
+        logger.info(f"Undo: {len(edits)} edit(s) in {keys}")
+        return keys
+
+    def redo(self) -> list[str]:
+        """Re-apply the last undone step and return the changed top-level keys."""
+        edits = self.undo_stack.pop_redo()
+        if edits is None:
+            return []
+        keys = self._apply_edits(edits, record=False)
+        logger.info(f"Redo: {len(edits)} edit(s) in {keys}")
+        return keys
+
+    def _journal_edit(self, op: str, path: EditPath, value: Any = None) -> None:
+        """Append an edit to the journal and compact it when it grows too long."""
+        if self.journal is None:
+            return
+        if self._batch is not None:
+            self._batch.journal.append(self.journal.encode(op, path, value))
+            self._journaled_keys.add(str(path[0]))
+            return
+        try:
+            self.journal.append(op, path, value)
+        except OSError:
+            logger.error("Failed to append to edit journal", exc_info=True)
+            return
+        self._journaled_keys.add(str(path[0]))
+        # A transaction compacts once it is committed
+        if (
+            self._batch is None
+            and self.journal_compact_every
+            and self.journal.entries >= self.journal_compact_every
+        ):
+            self.compact_journal()
+
+    def compact_journal(self) -> None:
+        """Write journaled sections to their files and truncate the journal.
+
+        Keys that have no section file (e.g. "*_enabled" flags) are re-journaled
+        with their current value so they survive a restart. A session never
+        compacts: its edits must not reach the files or the other sessions
+        before it saves. Skipped while a save of json_dir is running; the next
+        journaled edit retries.
+        """
+        if self.journal is None or self.session is not None:
+            return
+        lock = get_save_lock(self.json_dir)
+        if not lock.acquire(blocking=False):
+            return
+        try:
+            sections = {
+                key: self.data[key]
+                for key in self._journaled_keys
+                if key.endswith(".json") and key in self.data
+            }
+            try:
+                get_config_client("JSON", self.json_dir).save_config(sections)
+            except OSError:
+                # The journal stays the durable copy; retried at the next edit
+                logger.error("Journal compaction failed, journal kept", exc_info=True)
+                return
+            flags = {
+                key: self.data[key]
+                for key in self._journaled_keys
+                if not key.endswith(".json") and key in self.data
+            }
+            self._compactions += 1
+            self.journal.truncate()
+            self._journaled_keys.clear()
+        finally:
+            lock.release()
+        for key, value in flags.items():
+            self._journal_edit(SET, (key,), value)
+        logger.info(f"Compacted edit journal into {len(sections)} section file(s)")
+
+    def _drop_journaled(self, keys: set[str]) -> None:
+        """Remove the journaled edits of top-level keys from the journal."""
+        self.journal.rewrite(
+            [entry for entry in self.journal.read() if str(entry[1][0]) not in keys]
+        )
+        self._journaled_keys.difference_update(keys)
+        # A save prepared before no longer knows which lines it covers
+        self._compactions += 1
+
+    def record_edit(
+        self, op: str, path: EditPath, value: Any = None, old_value: Any = None
+    ) -> None:
+        """Record an edit that the UI already applied to self.data."""
+        if op == SET and self.undo_stack.is_echo(path, value):
+            # A bound field reflecting an undo/redo, already journaled
+            return
+        self._journal_edit(op, path, value)
+        self._record(op, path, value, old_value)
+        self._snapshots.mark_dirty(path)
+        if self.session is not None:
+            # The UI already wrote into a container owned via own()
+            self.session.record(path)
+        key = str(path[0])
+        self._notify_observers(key, self.data.get(key))
+        self._publish([ChangeEvent(op, tuple(path), value)])
 
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value."""
@@ -70,8 +893,12 @@ class MtxConfigManager:
                 elif key == "values_rtsp.json" and isinstance(value, dict):
                     RTSPConfig(**value)
 
+            self._record(SET, (key,), value, self.data.get(key, MISSING))
+            self._touch((key,))
             self.data[key] = value
+            self._journal_edit(SET, (key,), value)
             self._notify_observers(key, value)
+            self._publish([ChangeEvent(SET, (key,), value)])
             logger.debug(f"Set {key}")
             return True
 
@@ -109,18 +936,25 @@ class MtxConfigManager:
                 logger.error(f"Invalid stream type: {stream_type}")
                 return False
 
-            # Validate
-            StreamConfig(**config)
+            # Validate (deferred to the commit inside a batch)
+            if self._batch is None:
+                StreamConfig(**config)
 
             # Add to data
+            self._touch(("paths.json", name))
             self.data["paths.json"][name] = config
+            self._journal_edit(SET, ("paths.json", name), config)
+            self._record(SET, ("paths.json", name), config)
 
             # Update paths config
-            if self._paths_config:
+            if self._batch is not None:
+                self._batch.streams.add(name)
+            elif self._paths_config:
                 self._paths_config.add_stream(name, config)
 
             self._notify_observers("paths.json", self.data["paths.json"])
-            logger.info(f"Added stream: {name} (type: {stream_type})")
+            self._publish([ChangeEvent(SET, ("paths.json", name), config)])
+            self._log_change(f"Added stream: {name} (type: {stream_type})")
             return True
 
         except ValidationError as e:
@@ -137,14 +971,20 @@ class MtxConfigManager:
                 logger.warning(f"Stream {name} not found")
                 return False
 
-            del self.data["paths.json"][name]
+            self._touch(("paths.json", name))
+            old_config = self.data["paths.json"].pop(name)
+            self._journal_edit(DELETE, ("paths.json", name))
+            self._record(DELETE, ("paths.json", name), None, old_config)
 
             # Update paths config
-            if self._paths_config:
+            if self._batch is not None:
+                self._batch.streams.add(name)
+            elif self._paths_config:
                 self._paths_config.remove_stream(name)
 
             self._notify_observers("paths.json", self.data["paths.json"])
-            logger.info(f"Removed stream: {name}")
+            self._publish([ChangeEvent(DELETE, ("paths.json", name))])
+            self._log_change(f"Removed stream: {name}")
             return True
 
         except Exception as e:
@@ -158,17 +998,25 @@ class MtxConfigManager:
                 logger.warning(f"Stream {name} not found")
                 return False
 
-            # Validate
-            StreamConfig(**config)
+            # Validate (deferred to the commit inside a batch)
+            if self._batch is None:
+                StreamConfig(**config)
 
             # Update
+            old_config = self.data["paths.json"][name]
+            self._touch(("paths.json", name))
             self.data["paths.json"][name] = config
+            self._journal_edit(SET, ("paths.json", name), config)
+            self._record(SET, ("paths.json", name), config, old_config)
 
             # Update paths config
-            if self._paths_config:
+            if self._batch is not None:
+                self._batch.streams.add(name)
+            elif self._paths_config:
                 self._paths_config.paths[name] = StreamConfig(**config)
 
             self._notify_observers("paths.json", self.data["paths.json"])
+            self._publish([ChangeEvent(SET, ("paths.json", name), config)])
             logger.debug(f"Updated stream: {name}")
             return True
 
@@ -179,8 +1027,206 @@ class MtxConfigManager:
             logger.error(f"Error updating stream {name}: {e}")
             return False
 
+    def put_stream(self, name: str, config: Dict[str, Any]) -> bool:
+        """Create or replace a stream with the given configuration."""
+        if name in self.data.get("paths.json", {}):
+            return self.update_stream(name, config)
+        try:
+            # Validate (deferred to the commit inside a batch)
+            if self._batch is None:
+                StreamConfig(**config)
+
+            self.data.setdefault("paths.json", {})
+            self._touch(("paths.json", name))
+            self.data["paths.json"][name] = config
+            self._journal_edit(SET, ("paths.json", name), config)
+            self._record(SET, ("paths.json", name), config)
+
+            if self._batch is not None:
+                self._batch.streams.add(name)
+            elif self._paths_config:
+                self._paths_config.add_stream(name, config)
+
+            self._notify_observers("paths.json", self.data["paths.json"])
+            self._publish([ChangeEvent(SET, ("paths.json", name), config)])
+            self._log_change(f"Added stream: {name}")
+            return True
+
+        except ValidationError as e:
+            logger.error(f"Validation error adding stream {name}: {e}")
+            return False
+        except Exception as e:
+            logger.error(f"Error adding stream {name}: {e}")
+            return False
+
+    def minimize_paths(self) -> MinimizeReport:
+        """Remove per-path keys whose value equals the pathDefaults value.
+
+        The paths are scanned once and the removals applied as one batch
+        (one undo step). Before it commits, the effective config of every
+        changed path is recomputed and compared with the one before; any
+        difference rolls the batch back with a ValueError.
+        """
+        paths = self.data.get("paths.json") or {}
+        redundant = redundant_keys(paths, path_defaults(self.data))
+        if not redundant:
+            return MinimizeReport(0, 0, 0)
+        expected = {name: dict(self.effective.resolve(name)) for name in redundant}
+        size_before = sum(stored_size(paths[name]) for name in redundant)
+        with self.batch():
+            self._apply_edits(
+                [
+                    Edit(DELETE, ("paths.json", name, key), None, paths[name][key])
+                    for name, keys in redundant.items()
+                    for key in keys
+                ]
+            )
+            # The events reach self.effective on commit; check with a fresh one
+            check = EffectiveResolver(lambda: self.data)
+            lost = [n for n, conf in expected.items() if check.resolve(n) != conf]
+            if lost:
+                raise ValueError(f"Minimizing would change paths: {lost[:10]}")
+        # A session replaces the edited containers with its own copies
+        paths = self.data["paths.json"]
+        report = MinimizeReport(
+            len(redundant),
+            sum(map(len, redundant.values())),
+            size_before - sum(stored_size(paths[name]) for name in redundant),
+        )
+        logger.info(
+            f"Removed {report.keys} key(s) equal to pathDefaults from "
+            f"{report.paths} path(s), {report.bytes_saved} bytes saved"
+        )
+        return report
+
+    def _record(
+        self, op: str, path: EditPath, value: Any = None, old_value: Any = MISSING
+    ) -> None:
+        """Record an applied edit for undo, or in the open transaction."""
+        if self._batch is not None:
+            self._batch.edits.append(Edit(op, tuple(path), value, old_value))
+        else:
+            self.undo_stack.record(op, path, value, old_value)
+
+    def _log_change(self, message: str) -> None:
+        # Per-edit messages of a transaction would flood the log
+        if self._batch is not None:
+            logger.debug(message)
+        else:
+            logger.info(message)
+
+    @contextmanager
+    def batch(self) -> Iterator[Batch]:
+        """Apply many edits as one transaction.
+
+        Inside the block, stream methods skip their validation and observers
+        are not notified. On exit all added and updated streams are validated
+        in one pass; then observers are notified once per changed key,
+        subscribers get all change events in one call and the edits become a
+        single undo step, and the edits are journaled with one fsync. If the
+        block raises or validation fails, every edit is rolled back (and
+        nothing journaled) and the error is re-raised (ValueError for invalid
+        streams). Nested batches join the outer one.
+
+        Usage:
+            with manager.batch():
+                for name in cameras:
+                    manager.add_stream(name, "Source")
+        """
+        if self._batch is not None:
+            yield self._batch
+            return
+
+        batch = self._batch = Batch()
+        try:
+            yield batch
+            self._validate_batch(batch)
+        except BaseException:
+            try:
+                self._apply_edits(
+                    [inverse(edit) for edit in reversed(batch.edits)], record=False
+                )
+            finally:
+                self._batch = None
+            logger.warning(f"Batch of {len(batch.edits)} edit(s) rolled back")
+            raise
+        self._batch = None
+
+        if self.journal is not None:
+            try:
+                self.journal.append_lines(batch.journal)
+            except OSError:
+                logger.error("Failed to append to edit journal", exc_info=True)
+        with self.undo_stack.group():
+            for edit in batch.edits:
+                self.undo_stack.record(*edit)
+        if (
+            self.journal is not None
+            and self.journal_compact_every
+            and self.journal.entries >= self.journal_compact_every
+        ):
+            self.compact_journal()
+        for key in batch.keys:
+            self._notify_observers(key, self.data.get(key))
+        self.events.publish(batch.events)
+        logger.info(f"Batch committed: {len(batch.edits)} edit(s) in {batch.keys}")
+
+    def _validate_batch(self, batch: Batch) -> None:
+        """Validate the streams of a batch in one pass and update the model."""
+        paths = self.data.get("paths.json", {})
+        validated: Dict[str, StreamConfig] = {}
+        errors: list[str] = []
+        for name in sorted(batch.streams):
+            if name not in paths:
+                continue
+            try:
+                validated[name] = StreamConfig(**paths[name])
+            except ValidationError as e:
+                errors.extend(f"paths.json:{name}: {err['msg']}" for err in e.errors())
+        if errors:
+            raise ValueError(f"Invalid streams in batch: {'; '.join(errors)}")
+        if self._paths_config is not None:
+            for name in batch.streams:
+                if name in validated:
+                    self._paths_config.paths[name] = validated[name]
+                else:
+                    self._paths_config.remove_stream(name)
+
+    def subscribe(
+        self, callback: ChangeCallback, prefix: Prefix = "", coalesce: bool = False
+    ) -> None:
+        """Receive change events at, below or above a path prefix.
+
+        callback gets a list of ChangeEvent, each with the precise path of
+        the change (e.g. "paths.json/cam042/source" as event.pointer) and
+        its operation. prefix is a pointer string or a path; "" receives
+        everything. With coalesce=True, bursts of events are delivered once
+        per frame from the event loop, one (latest) event per path.
+        """
+        self.events.subscribe(callback, prefix, coalesce)
+
+    def unsubscribe(self, callback: ChangeCallback, prefix: Prefix = "") -> None:
+        self.events.unsubscribe(callback, prefix)
+
+    def _publish(self, events: list[ChangeEvent]) -> None:
+        """Send change events to subscribers, or hold them in the open batch."""
+        if self._batch is not None:
+            self._batch.events.extend(events)
+        elif events:
+            self.events.publish(events)
+
+    def _change_to(self, path: Tuple[Any, ...]) -> ChangeEvent:
+        """Event for the current value at path (DELETE if it is gone)."""
+        value = get_in(self.data, path)
+        if value is MISSING:
+            return ChangeEvent(DELETE, path)
+        return ChangeEvent(SET, path, value)
+
     def register_observer(self, callback: Callable[[str, Any], None]) -> None:
-        """Register an observer for data changes."""
+        """Register an observer called with (key, whole section) on changes.
+
+        Prefer subscribe() for precise, per-path change events.
+        """
         if callback not in self.observers:
             self.observers.append(callback)
             logger.debug(f"Registered observer: {callback.__name__}")
@@ -192,38 +1238,57 @@ class MtxConfigManager:
             logger.debug(f"Unregistered observer: {callback.__name__}")
 
     def _notify_observers(self, key: str, value: Any) -> None:
-        """Notify all observers of data change."""
+        """Notify all observers of data change (once per key after a batch)."""
+        if self._batch is not None:
+            if key not in self._batch.keys:
+                self._batch.keys.append(key)
+            return
         for observer in self.observers:
             try:
                 observer(key, value)
             except Exception as e:
                 logger.error(f"Error notifying observer {observer.__name__}: {e}")
 
-    def validate_all(self) -> Dict[str, list[str]]:
-        """Validate all configurations and return errors."""
+    def validate_all(
+        self, snapshot: Optional[ConfigSnapshot] = None
+    ) -> Dict[str, list[str]]:
+        """Validate all configurations and return errors.
+
+        Args:
+            snapshot: Pinned version to validate, e.g. from a worker thread;
+                the live data by default
+        """
+        data = self.data if snapshot is None else snapshot.data
+        # The memo follows the live data; a pinned version gets its own
+        effective = (
+            self.effective if snapshot is None else EffectiveResolver(lambda: data)
+        )
         errors: Dict[str, list[str]] = {}
 
-        # Validate paths
-        if "paths.json" in self.data:
-            for stream_name, stream_config in self.data["paths.json"].items():
+        # Validate paths, then their effective configs (pathDefaults applied)
+        if "paths.json" in data:
+            for stream_name, stream_config in data["paths.json"].items():
                 try:
                     StreamConfig(**stream_config)
                 except ValidationError as e:
                     errors[f"paths.json:{stream_name}"] = [
                         str(err) for err in e.errors()
                     ]
+                conflicts = check_effective_stream(effective.resolve(stream_name))
+                if conflicts:
+                    errors.setdefault(f"paths.json:{stream_name}", []).extend(conflicts)
 
         # Validate auth
-        if "auth.json" in self.data:
+        if "auth.json" in data:
             try:
-                AuthConfig(**self.data["auth.json"])
+                AuthConfig(**data["auth.json"])
             except ValidationError as e:
                 errors["auth.json"] = [str(err) for err in e.errors()]
 
         # Validate RTSP
-        if "values_rtsp.json" in self.data:
+        if "values_rtsp.json" in data:
             try:
-                RTSPConfig(**self.data["values_rtsp.json"])
+                RTSPConfig(**data["values_rtsp.json"])
             except ValidationError as e:
                 errors["values_rtsp.json"] = [str(err) for err in e.errors()]
 
@@ -231,13 +1296,32 @@ class MtxConfigManager:
 
     def update_preview(self) -> None:
         """Update preview with current configuration."""
+        self._set_preview(self.snapshot())
+
+    async def update_preview_async(self) -> None:
+        """Render the preview of a pinned version in a worker thread."""
+        snapshot = self.snapshot()
+        text = await asyncio.to_thread(self.render_preview, snapshot)
+        # A slower render of an older version must not overwrite a newer one
+        if snapshot.version >= self.preview_content.get("version", 0):
+            self.preview_content["yaml"] = text
+            self.preview_content["version"] = snapshot.version
+
+    def _set_preview(self, snapshot: ConfigSnapshot) -> None:
+        self.preview_content["yaml"] = self.render_preview(snapshot)
+        self.preview_content["version"] = snapshot.version
+
+    @staticmethod
+    def render_preview(snapshot: ConfigSnapshot) -> str:
+        """Render the YAML preview of a pinned version (thread-safe)."""
+        data = snapshot.data
         try:
             # Assemble configuration like save does
             final_config = {}
-            for json_file_name, content in self.data.items():
+            for json_file_name, content in data.items():
                 if json_file_name.endswith("_enabled"):
                     continue
-                if not self.data.get(f"{json_file_name}_enabled", True):
+                if not data.get(f"{json_file_name}_enabled", True):
                     continue
 
                 if json_file_name == "paths.json":
@@ -257,7 +1341,7 @@ class MtxConfigManager:
             if "paths" not in final_config:
                 final_config["paths"] = {}
 
-            self.preview_content["yaml"] = yaml.dump(
+            return yaml.dump(
                 final_config,
                 default_flow_style=False,
                 sort_keys=False,
@@ -265,4 +1349,4 @@ class MtxConfigManager:
             )
         except Exception as e:
             logger.error(f"Preview update failed: {e}")
-            self.preview_content["yaml"] = f"Error generating preview: {e}"
+            return f"Error generating preview: {e}"
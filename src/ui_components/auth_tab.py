@@ -2,7 +2,8 @@
 
 from typing import Dict, Any
 from nicegui import ui
-from .ui_utils import create_ui_element
+from src.utils.json_utils import DELETE, SET
+from .ui_utils import apply_ui_edit, create_ui_element, notify_change, owned
 import json
 
 
@@ -24,21 +25,33 @@ def build_auth_tab(container: ui.element, data: Dict[str, Any]):
                 return
 
             for i, user_config in enumerate(users):
+                user_path = ("auth.json", "authInternalUsers", i)
                 user_label = user_config.get("user", f"User {i + 1}")
                 with ui.expansion(user_label, icon="person").classes(
                     "w-full mb-2 border rounded-lg"
                 ):
                     # --- User and Password ---
                     with ui.row().classes("w-full gap-4 p-2"):
-                        ui.input(label="User").bind_value(user_config, "user").classes(
+                        ui.input(
+                            label="User",
+                            value=user_config.get("user", ""),
+                            on_change=lambda e, p=user_path: notify_change(
+                                SET, (*p, "user"), e.value, e.previous_value
+                            ),
+                        ).bind_value(owned(user_config, user_path), "user").classes(
                             "flex-1"
-                        ).on(
-                            "change",
-                            lambda e, u=user_config: u.update({"user": e.value}),
                         )
                         ui.input(
-                            label="Password", password=True, password_toggle_button=True
-                        ).bind_value(user_config, "pass").classes("flex-1")
+                            label="Password",
+                            value=user_config.get("pass", ""),
+                            password=True,
+                            password_toggle_button=True,
+                            on_change=lambda e, p=user_path: notify_change(
+                                SET, (*p, "pass"), e.value, e.previous_value
+                            ),
+                        ).bind_value(owned(user_config, user_path), "pass").classes(
+                            "flex-1"
+                        )
 
                     # --- IPs ---
                     ui.label("IPs").classes("text-sm font-medium px-2")
@@ -47,16 +60,17 @@ def build_auth_tab(container: ui.element, data: Dict[str, Any]):
                         value=ips_str, placeholder="One IP or CIDR per line"
                     ).on(
                         "change",
-                        lambda e, u=user_config: u.update(
-                            {
-                                "ips": [
-                                    line
-                                    for line in e.value.splitlines()
-                                    if line.strip()
-                                ]
-                            }
+                        lambda e, p=user_path: apply_ui_edit(
+                            data,
+                            SET,
+                            (*p, "ips"),
+                            [line for line in e.value.splitlines() if line.strip()],
                         ),
-                    ).props("outlined dense").classes("w-full px-2")
+                    ).props(
+                        "outlined dense"
+                    ).classes(
+                        "w-full px-2"
+                    )
 
                     # --- Permissions ---
                     ui.label("Permissions (JSON format)").classes(
@@ -71,8 +85,8 @@ def build_auth_tab(container: ui.element, data: Dict[str, Any]):
 
                     ui.textarea(value=permissions_str).on(
                         "change",
-                        lambda e, u=user_config: u.update(
-                            {"permissions": json.loads(e.value)}
+                        lambda e, p=user_path: apply_ui_edit(
+                            data, SET, (*p, "permissions"), json.loads(e.value)
                         ),
                     ).props("outlined dense").classes("w-full px-2")
 
@@ -87,15 +101,19 @@ def build_auth_tab(container: ui.element, data: Dict[str, Any]):
 
     def add_user():
         """Add a new blank user to the list and refresh the UI."""
-        users = auth_data.setdefault("authInternalUsers", [])
-        users.append(
-            {
-                "user": "new_user",
-                "pass": "changeme",
-                "ips": ["127.0.0.1", "::1"],
-                "permissions": [{"action": "read"}, {"action": "publish"}],
-            }
-        )
+        new_user = {
+            "user": "new_user",
+            "pass": "changeme",
+            "ips": ["127.0.0.1", "::1"],
+            "permissions": [{"action": "read"}, {"action": "publish"}],
+        }
+        users = auth_data.get("authInternalUsers")
+        if users is None:
+            apply_ui_edit(data, SET, ("auth.json", "authInternalUsers"), [new_user])
+        else:
+            apply_ui_edit(
+                data, SET, ("auth.json", "authInternalUsers", len(users)), new_user
+            )
         rebuild_users_list()
         ui.notify("New user added. Please edit the details.", color="positive")
 
@@ -103,7 +121,7 @@ def build_auth_tab(container: ui.element, data: Dict[str, Any]):
         """Delete a user by index and refresh the UI."""
         users = auth_data.get("authInternalUsers", [])
         if 0 <= index < len(users):
-            del users[index]
+            apply_ui_edit(data, DELETE, ("auth.json", "authInternalUsers", index))
             rebuild_users_list()
             ui.notify("User deleted.", color="warning")
 
@@ -111,7 +129,7 @@ def build_auth_tab(container: ui.element, data: Dict[str, Any]):
         # --- General Auth Settings ---
         for key, value in auth_data.items():
             if key != "authInternalUsers":
-                create_ui_element(key, value, auth_data)
+                create_ui_element(key, value, auth_data, ("auth.json",))
 
         ui.separator().classes("my-4")
 
@@ -2,7 +2,8 @@
 
 from typing import Dict, Any
 from nicegui import ui
-from .ui_utils import create_ui_element
+from src.utils.json_utils import SET
+from .ui_utils import create_ui_element, notify_change
 
 
 def build_generic_tab(tab_name: str, filename: str, data: Dict[str, Any]) -> None:
@@ -24,6 +25,9 @@ def build_generic_tab(tab_name: str, filename: str, data: Dict[str, Any]) -> Non
         ui.checkbox(
             "Включить раздел в mediamtx.yml",
             value=data.get(f"{filename}_enabled", True),
+            on_change=lambda e: notify_change(
+                SET, (f"{filename}_enabled",), e.value, e.previous_value
+            ),
         ).bind_value(data, f"{filename}_enabled")
 
         ui.separator().classes("my-4")
@@ -45,4 +49,4 @@ def build_generic_tab(tab_name: str, filename: str, data: Dict[str, Any]) -> Non
         with ui.scroll_area().style("height: calc(100vh - 350px)"):
             with ui.column().classes("w-full gap-2"):
                 for key, value in sorted(config_data.items()):
-                    create_ui_element(key, value, config_data)
+                    create_ui_element(key, value, config_data, (filename,))
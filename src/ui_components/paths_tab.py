@@ -1,9 +1,16 @@
 """Paths tab component with live updates and search functionality."""
 
-from typing import Dict, Any, Optional, Callable
+from functools import partial
+from typing import Dict, Any, NamedTuple, Optional, Callable
 import asyncio
 from nicegui import ui
-from .ui_utils import create_ui_element
+
+from src.clients.metrics_client import MetricsCollector
+from src.clients.source_probe import ProbeResult, ProbeRun, SourceProber
+from src.core.effective import EffectiveResolver
+from src.core.runtime_status import PathStatus, StatusMap, diff_status
+from src.utils.json_utils import DELETE, SET
+from .ui_utils import apply_ui_edit, create_ui_element, edit_group, notify_change
 
 map_av = {
     "audio": "mic",  # 1: Только аудио
@@ -46,6 +53,159 @@ class SearchState:
         asyncio.create_task(self.debounced_update())
 
 
+def format_bytes(size: int) -> str:
+    """Human-readable byte count."""
+    for unit in ("Б", "КБ", "МБ", "ГБ"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "Б" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} ТБ"
+
+
+def format_status(status: Optional[PathStatus]) -> str:
+    """Caption of a stream row for its runtime status."""
+    if status is None:
+        return "нет на сервере"
+    state = "● готов" if status.ready else "○ не готов"
+    return (
+        f"{state} · зрителей: {status.readers} · "
+        f"получено {format_bytes(status.bytes_received)}"
+    )
+
+
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+# Points of throughput shown in a row sparkline
+SPARK_WIDTH = 20
+
+
+def sparkline(values: list[float]) -> str:
+    """Unicode sparkline of values scaled to their maximum."""
+    top = max(values, default=0.0)
+    if top <= 0:
+        return SPARK_CHARS[0] * len(values)
+    last = len(SPARK_CHARS) - 1
+    return "".join(SPARK_CHARS[round(v / top * last)] for v in values)
+
+
+def format_throughput(rates: list[float]) -> str:
+    """Sparkline of recent throughput followed by the latest rate."""
+    if not rates:
+        return ""
+    return f"{sparkline(rates[-SPARK_WIDTH:])} {format_bytes(rates[-1])}/с"
+
+
+def format_probe(result: ProbeResult) -> str:
+    """Badge text of a stream row for a source probe result."""
+    if result.ok:
+        return f"{result.latency * 1000:.0f} мс"
+    return result.detail
+
+
+class StreamRow(NamedTuple):
+    """Parts of a stream row header updated without rebuilding the list."""
+
+    caption: ui.item_label
+    spark: ui.label
+    badge: ui.badge
+
+
+def stream_row_header(row: ui.expansion, name: str, icon: str) -> StreamRow:
+    """Header of a stream row: icon, name, status, throughput and probe badge."""
+    with row.add_slot("header"):
+        with ui.item_section().props("avatar"):
+            ui.icon(icon)
+        with ui.item_section():
+            ui.item_label(name)
+            caption = ui.item_label().props("caption")
+            caption.set_visibility(False)
+        with ui.item_section().props("side"):
+            with ui.row().classes("items-center no-wrap gap-2"):
+                spark = ui.label().classes("font-mono text-xs text-primary")
+                badge = ui.badge()
+                badge.set_visibility(False)
+    return StreamRow(caption, spark, badge)
+
+
+class StreamRowsView:
+    """Runtime status captions, throughput and probe badges of the stream rows.
+
+    Rows register themselves when the list is (re)built and get the last
+    known status, throughput and probe result; update_status() changes only
+    the captions of paths whose status differs from the last poll.
+    """
+
+    def __init__(self):
+        self.rows: Dict[str, StreamRow] = {}
+        self.status: StatusMap = {}
+        self.status_active = False
+        self.probes: Dict[str, ProbeResult] = {}
+        self.metrics: Optional[MetricsCollector] = None
+
+    def clear(self) -> None:
+        self.rows.clear()
+
+    def add(self, name: str, row: StreamRow) -> None:
+        self.rows[name] = row
+        if self.status_active:
+            self._show_status(row, self.status.get(name))
+        if name in self.probes:
+            self._show_probe(row, self.probes[name])
+        if self.metrics is not None:
+            row.spark.text = format_throughput(self.metrics.throughput(name))
+
+    @staticmethod
+    def _show_status(row: StreamRow, status: Optional[PathStatus]) -> None:
+        row.caption.text = format_status(status)
+        row.caption.set_visibility(True)
+
+    @staticmethod
+    def _show_probe(row: StreamRow, result: ProbeResult) -> None:
+        row.badge.text = format_probe(result)
+        row.badge.props["color"] = "positive" if result.ok else "negative"
+        row.badge.set_visibility(True)
+
+    def update_status(self, status: StatusMap) -> int:
+        """Merge a new poll result into the rows; returns the rows changed."""
+        changed = diff_status(self.status, status)
+        if not self.status_active:
+            # First poll: rows without a status get their caption too
+            changed = {name: status.get(name) for name in self.rows}
+            self.status_active = True
+        self.status = status
+        count = 0
+        for name, path_status in changed.items():
+            row = self.rows.get(name)
+            if row is not None:
+                self._show_status(row, path_status)
+                count += 1
+        return count
+
+    def update_metrics(self, metrics: MetricsCollector) -> None:
+        """Redraw the throughput sparklines from the collector's buffers."""
+        self.metrics = metrics
+        for name, row in self.rows.items():
+            text = format_throughput(metrics.throughput(name))
+            if row.spark.text != text:
+                row.spark.text = text
+
+    async def probe(self, paths: Dict[str, Any], prober: SourceProber) -> ProbeRun:
+        """Probe the sources of paths, updating each badge as results arrive."""
+        by_source: Dict[str, list[str]] = {}
+        for name, config in paths.items():
+            source = config.get("source") if isinstance(config, dict) else None
+            if isinstance(source, str):
+                by_source.setdefault(source, []).append(name)
+
+        def on_result(source: str, result: ProbeResult) -> None:
+            for name in by_source[source]:
+                self.probes[name] = result
+                row = self.rows.get(name)
+                if row is not None:
+                    self._show_probe(row, result)
+
+        return await prober.probe_all(by_source, on_result)
+
+
 def add_new_stream(data: Dict[str, Any], container, rebuild_func: Callable) -> None:
     """Dialog to add a new stream with live update."""
     with ui.dialog() as dialog, ui.card():
@@ -70,22 +230,20 @@ def add_new_stream(data: Dict[str, Any], container, rebuild_func: Callable) -> N
                 ui.notify("Поток с таким именем уже существует!", color="negative")
                 return
 
-            # Ensure paths.json exists
-            if "paths.json" not in data:
-                data["paths.json"] = {}
-
+            # paths.json is created on demand by apply_ui_edit
             if stype == "Source":
-                data["paths.json"][name] = {
+                config = {
                     "source": "rtsp://",
                     "rtspTransport": "udp",
                     "sourceOnDemand": False,
                 }
             elif stype == "RunOnDemand":
-                data["paths.json"][name] = {
+                config = {
                     "runOnDemand": "ffmpeg",
                     "runOnDemandRestart": False,
                     "runOnDemandStartTimeout": "10s",
                 }
+            apply_ui_edit(data, SET, ("paths.json", name), config)
 
             dialog.close()
             ui.notify(f'Поток "{name}" добавлен!', color="positive")
@@ -127,7 +285,7 @@ def clone_stream(
 
             # Clone the configuration
             source_config = data["paths.json"][source_name]
-            data["paths.json"][name] = source_config.copy()
+            apply_ui_edit(data, SET, ("paths.json", name), source_config.copy())
 
             dialog.close()
             ui.notify(
@@ -150,8 +308,53 @@ def clone_stream(
     dialog.open()
 
 
-def build_paths_tab(container, data: Dict[str, Any]) -> None:
-    """Build the content of the 'Paths' tab with search, filter, and grouping."""
+def show_effective_config(name: str, effective: EffectiveResolver) -> None:
+    """Show the config a stream resolves to, marking inherited keys."""
+    config = effective.resolve(name)
+    if config is None:
+        return
+    inherited = set(effective.inherited(name))
+    with ui.dialog() as dialog, ui.card().classes("w-full max-w-2xl"):
+        ui.label(f'Эффективная конфигурация "{name}"').classes("text-h6 mb-0")
+        ui.label(
+            f"Унаследовано из pathDefaults: {len(inherited)} из {len(config)}"
+        ).classes("text-grey-7 mb-2")
+        with ui.scroll_area().classes("h-96 border p-2"):
+            for key, value in config.items():
+                with ui.row().classes("w-full gap-2 items-baseline"):
+                    ui.label(key).classes(
+                        "font-mono text-grey-7" if key in inherited else "font-mono"
+                    )
+                    ui.label(repr(value)).classes("font-mono text-sm break-all")
+                    if key in inherited:
+                        ui.badge("по умолчанию", color="grey").props("outline")
+        with ui.row().classes("w-full justify-end"):
+            ui.button("Закрыть", on_click=dialog.close).props("flat")
+    dialog.open()
+
+
+def build_paths_tab(
+    container,
+    data: Dict[str, Any],
+    rows_view: Optional[StreamRowsView] = None,
+    on_probe: Optional[Callable] = None,
+    effective: Optional[EffectiveResolver] = None,
+    on_minimize: Optional[Callable] = None,
+) -> None:
+    """Build the content of the 'Paths' tab with search, filter, and grouping.
+
+    rows_view, if given, receives the stream rows to show runtime status and
+    probe results; on_probe adds a button that checks the sources; effective
+    adds a button showing the config of a stream with pathDefaults applied;
+    on_minimize adds a button removing keys redundant with pathDefaults.
+    """
+    rebuild_tab = partial(
+        build_paths_tab,
+        rows_view=rows_view,
+        on_probe=on_probe,
+        effective=effective,
+        on_minimize=on_minimize,
+    )
 
     def get_stream_type(config: Dict[str, Any]) -> str:
         """Determine stream type from configuration."""
@@ -164,6 +367,8 @@ def build_paths_tab(container, data: Dict[str, Any]) -> None:
     def rebuild_streams_list():
         """Rebuild the streams list with current filters and grouping."""
         streams_container.clear()
+        if rows_view is not None:
+            rows_view.clear()
 
         paths_data = data.get("paths.json", {})
         if not paths_data:
@@ -237,17 +442,29 @@ def build_paths_tab(container, data: Dict[str, Any]) -> None:
 
                         with ui.expansion(stream_name, icon=icon_name).classes(
                             "w-full mb-0"
-                        ):
+                        ) as row:
+                            header = stream_row_header(row, stream_name, icon_name)
+                            if rows_view is not None:
+                                rows_view.add(stream_name, header)
                             # Header with actions
                             with ui.row().classes(
                                 "w-full justify-between items-center"
                             ):
                                 ui.label(stream_name).classes("text-lg font-bold")
                                 with ui.row().classes("gap-1"):
+                                    if effective is not None:
+                                        ui.button(
+                                            icon="layers",
+                                            on_click=lambda n=stream_name: show_effective_config(
+                                                n, effective
+                                            ),
+                                        ).props("flat dense").tooltip(
+                                            "Эффективная конфигурация"
+                                        )
                                     ui.button(
                                         icon="content_copy",
                                         on_click=lambda n=stream_name: clone_stream(
-                                            data, n, container, build_paths_tab
+                                            data, n, container, rebuild_tab
                                         ),
                                     ).props("flat dense").tooltip("Клонировать")
                                     ui.button(
@@ -263,14 +480,19 @@ def build_paths_tab(container, data: Dict[str, Any]) -> None:
                             # Editable configuration fields
                             with ui.column().classes("w-full gap-0 p-1"):
                                 for key, value in stream_config.items():
-                                    create_ui_element(key, value, stream_config)
+                                    create_ui_element(
+                                        key,
+                                        value,
+                                        stream_config,
+                                        ("paths.json", stream_name),
+                                    )
 
     def delete_stream_dialog(name: str) -> None:
         """Show delete confirmation dialog."""
 
         def perform_delete():
             if "paths.json" in data and name in data["paths.json"]:
-                del data["paths.json"][name]
+                apply_ui_edit(data, DELETE, ("paths.json", name))
                 ui.notify(f'Поток "{name}" удален!', color="warning")
                 rebuild_streams_list()  # Just rebuild the list
             dialog.close()
@@ -292,6 +514,9 @@ def build_paths_tab(container, data: Dict[str, Any]) -> None:
         ui.checkbox(
             "Включить раздел Paths в mediamtx.yml",
             value=data.get("paths.json_enabled", True),
+            on_change=lambda e: notify_change(
+                SET, ("paths.json_enabled",), e.value, e.previous_value
+            ),
         ).bind_value(data, "paths.json_enabled")
         ui.separator()
 
@@ -310,9 +535,24 @@ def build_paths_tab(container, data: Dict[str, Any]) -> None:
             ui.button(
                 "Добавить поток",
                 icon="add",
-                on_click=lambda: add_new_stream(data, container, build_paths_tab),
+                on_click=lambda: add_new_stream(data, container, rebuild_tab),
                 color="positive",
             )
+            if on_probe is not None:
+                ui.button(
+                    "Проверить источники",
+                    icon="network_check",
+                    on_click=on_probe,
+                    color="info",
+                )
+            if on_minimize is not None:
+                ui.button(
+                    "Убрать значения по умолчанию",
+                    icon="compress",
+                    on_click=on_minimize,
+                ).props("outline").tooltip(
+                    "Удалить ключи потоков, совпадающие с pathDefaults"
+                )
 
         # --- Bulk Credential Replacement ---
         with ui.card().classes("w-full p-4 mb-0"):
@@ -340,12 +580,17 @@ def build_paths_tab(container, data: Dict[str, Any]) -> None:
 
                     count = 0
                     paths_data = data.get("paths.json", {})
-                    for config in paths_data.values():
-                        if "runOnDemand" in config and old in config["runOnDemand"]:
-                            config["runOnDemand"] = config["runOnDemand"].replace(
-                                old, new
-                            )
-                            count += 1
+                    # One undo step for the whole replacement
+                    with edit_group():
+                        for name, config in paths_data.items():
+                            if "runOnDemand" in config and old in config["runOnDemand"]:
+                                apply_ui_edit(
+                                    data,
+                                    SET,
+                                    ("paths.json", name, "runOnDemand"),
+                                    config["runOnDemand"].replace(old, new),
+                                )
+                                count += 1
 
                     if count > 0:
                         ui.notify(
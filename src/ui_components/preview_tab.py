@@ -1,20 +1,27 @@
 """Preview tab component for YAML configuration preview."""
 
-from typing import Callable, Dict, Any
+from typing import Callable, Dict, Any, Optional
 from nicegui import ui
 
 
 def build_preview_tab(
-    preview_content: Dict[str, str], update_callback: Callable
+    preview_content: Dict[str, str],
+    update_callback: Callable,
+    diff_callback: Optional[Callable] = None,
 ) -> None:
     """Build the Preview tab content.
 
     Args:
-        preview_content: Dictionary containing the YAML preview string
+        preview_content: Dictionary containing the YAML preview and diff strings
+            and the version of the data the preview was rendered from
         update_callback: Callback to update preview content
+        diff_callback: Callback to update the diff against the files on disk
     """
     with ui.row().classes("w-full items-center mb-4"):
         ui.label("Предпросмотр итоговой конфигурации YAML").classes("text-h6")
+        ui.label().classes("text-grey-7 ml-2").bind_text_from(
+            preview_content, "version", backward=lambda v: f"версия {v}" if v else ""
+        )
         ui.space()
         ui.button(
             "Обновить", on_click=update_callback, icon="refresh", color="primary"
@@ -54,3 +61,22 @@ def build_preview_tab(
             stats_label.bind_text_from(
                 preview_content, "yaml", backward=lambda x: get_stats()
             )
+
+    if diff_callback is None:
+        return
+
+    # Structural diff against the section files on disk
+    with ui.row().classes("w-full items-center mt-6 mb-2"):
+        ui.label("Изменения относительно файлов на диске").classes("text-h6")
+        ui.space()
+        ui.button(
+            "Сравнить", on_click=diff_callback, icon="difference", color="primary"
+        ).props("outline")
+
+    with ui.scroll_area().classes("w-full border rounded").style("height: 300px"):
+        diff_code = ui.code(language="diff").classes("w-full")
+        diff_code.bind_content_from(
+            preview_content,
+            "diff",
+            backward=lambda x: x or "# Нет несохранённых изменений",
+        )
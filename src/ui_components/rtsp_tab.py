@@ -16,20 +16,22 @@ def build_rtsp_tab(container: ui.element, data: Dict[str, Any]):
         )
         return
 
+    path = ("values_rtsp.json",)
+
     with container:
         # --- General Settings ---
         with ui.card().classes("w-full mb-4"):
             with ui.card_section():
                 ui.label("General RTSP Settings").classes("text-lg font-bold")
-            create_ui_element("rtsp", rtsp_data.get("rtsp"), rtsp_data)
+            create_ui_element("rtsp", rtsp_data.get("rtsp"), rtsp_data, path)
             create_ui_element(
-                "rtspEncryption", rtsp_data.get("rtspEncryption"), rtsp_data
+                "rtspEncryption", rtsp_data.get("rtspEncryption"), rtsp_data, path
             )
             create_ui_element(
-                "rtspTransports", rtsp_data.get("rtspTransports"), rtsp_data
+                "rtspTransports", rtsp_data.get("rtspTransports"), rtsp_data, path
             )
             create_ui_element(
-                "rtspAuthMethods", rtsp_data.get("rtspAuthMethods"), rtsp_data
+                "rtspAuthMethods", rtsp_data.get("rtspAuthMethods"), rtsp_data, path
             )
 
         # --- Network Addresses and Ports ---
@@ -37,14 +39,18 @@ def build_rtsp_tab(container: ui.element, data: Dict[str, Any]):
             with ui.card_section():
                 ui.label("Network Addresses and Ports").classes("text-lg font-bold")
             with ui.row().classes("w-full"):
-                create_ui_element("rtspAddress", rtsp_data.get("rtspAddress"), rtsp_data)
                 create_ui_element(
-                    "rtspsAddress", rtsp_data.get("rtspsAddress"), rtsp_data
+                    "rtspAddress", rtsp_data.get("rtspAddress"), rtsp_data, path
+                )
+                create_ui_element(
+                    "rtspsAddress", rtsp_data.get("rtspsAddress"), rtsp_data, path
                 )
             with ui.row().classes("w-full"):
-                create_ui_element("rtpAddress", rtsp_data.get("rtpAddress"), rtsp_data)
                 create_ui_element(
-                    "rtcpAddress", rtsp_data.get("rtcpAddress"), rtsp_data
+                    "rtpAddress", rtsp_data.get("rtpAddress"), rtsp_data, path
+                )
+                create_ui_element(
+                    "rtcpAddress", rtsp_data.get("rtcpAddress"), rtsp_data, path
                 )
 
         # --- Multicast Settings ---
@@ -52,21 +58,33 @@ def build_rtsp_tab(container: ui.element, data: Dict[str, Any]):
             with ui.card_section():
                 ui.label("Multicast Settings").classes("text-lg font-bold")
             create_ui_element(
-                "multicastIPRange", rtsp_data.get("multicastIPRange"), rtsp_data
+                "multicastIPRange", rtsp_data.get("multicastIPRange"), rtsp_data, path
             )
             with ui.row().classes("w-full"):
                 create_ui_element(
-                    "multicastRTPPort", rtsp_data.get("multicastRTPPort"), rtsp_data
+                    "multicastRTPPort",
+                    rtsp_data.get("multicastRTPPort"),
+                    rtsp_data,
+                    path,
                 )
                 create_ui_element(
-                    "multicastRTCPPort", rtsp_data.get("multicastRTCPPort"), rtsp_data
+                    "multicastRTCPPort",
+                    rtsp_data.get("multicastRTCPPort"),
+                    rtsp_data,
+                    path,
                 )
             with ui.row().classes("w-full"):
                 create_ui_element(
-                    "multicastSRTPPort", rtsp_data.get("multicastSRTPPort"), rtsp_data
+                    "multicastSRTPPort",
+                    rtsp_data.get("multicastSRTPPort"),
+                    rtsp_data,
+                    path,
                 )
                 create_ui_element(
-                    "multicastSRTCPPort", rtsp_data.get("multicastSRTCPPort"), rtsp_data
+                    "multicastSRTCPPort",
+                    rtsp_data.get("multicastSRTCPPort"),
+                    rtsp_data,
+                    path,
                 )
 
         # --- Security (TLS/SSL) ---
@@ -74,10 +92,10 @@ def build_rtsp_tab(container: ui.element, data: Dict[str, Any]):
             with ui.card_section():
                 ui.label("Security (TLS/SSL)").classes("text-lg font-bold")
             create_ui_element(
-                "rtspServerKey", rtsp_data.get("rtspServerKey"), rtsp_data
+                "rtspServerKey", rtsp_data.get("rtspServerKey"), rtsp_data, path
             )
             create_ui_element(
-                "rtspServerCert", rtsp_data.get("rtspServerCert"), rtsp_data
+                "rtspServerCert", rtsp_data.get("rtspServerCert"), rtsp_data, path
             )
 
         # --- Advanced / Other ---
@@ -88,4 +106,5 @@ def build_rtsp_tab(container: ui.element, data: Dict[str, Any]):
                 "rtspUDPReadBufferSize",
                 rtsp_data.get("rtspUDPReadBufferSize"),
                 rtsp_data,
+                path,
             )
@@ -1,63 +1,188 @@
 """UI utility functions for creating form elements."""
 
-from typing import Any, Dict, Union
-from nicegui import ui
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, ContextManager, Dict, Iterator, Optional, Union
+from nicegui import context, ui
+from nicegui.slot import Slot
+
+from src.utils.json_utils import MISSING, SET, EditPath, apply_edit, get_in
 
 el_classes = "flex-grow min-w-0"
 el_props = "dense outlined"
 
+# Callbacks notified on every edit: callback(op, path, value, old_value)
+ChangeListener = Callable[[str, EditPath, Any, Any], None]
+
+
+class _EditHooks:
+    """Edit callbacks registered by the page of one client."""
+
+    def __init__(self) -> None:
+        self.listeners: list[ChangeListener] = []
+        # Factory of a context manager grouping edits into one undo step
+        self.group_factory: Optional[Callable[[], ContextManager]] = None
+        # Returns the container at a path that the session may modify
+        self.owner: Optional[Callable[[EditPath], Any]] = None
+
+
+# Each browser tab runs its own page (and manager), keyed by client id
+_hooks: Dict[Optional[str], _EditHooks] = {}
+
+
+def _client_id() -> Optional[str]:
+    """Id of the client whose page or event is being handled, if any."""
+    stack = Slot.get_stack()
+    return stack[-1].parent.client.id if stack else None
+
 
-def create_ui_checkbox(key: str, value: Any, parent_dict: Dict[str, Any]):
-    ui.checkbox().bind_value(parent_dict, key).classes(el_classes)
+def _current_hooks(create: bool = False) -> Optional[_EditHooks]:
+    client_id = _client_id()
+    hooks = _hooks.get(client_id)
+    if hooks is None and create:
+        hooks = _hooks[client_id] = _EditHooks()
+        if client_id is not None:
+            context.client.on_delete(lambda: _hooks.pop(client_id, None))
+    return hooks
 
 
-def create_ui_int(key: str, value: Any, parent_dict: Dict[str, Any]):
-    ui.number(value=value, min=0).bind_value(parent_dict, key).props(el_props).classes(
-        el_classes
-    )
+def register_change_listener(callback: ChangeListener) -> None:
+    """Register a callback for edits made through the current page."""
+    hooks = _current_hooks(create=True)
+    if callback not in hooks.listeners:
+        hooks.listeners.append(callback)
 
 
-def create_ui_str(key: str, value: Any, parent_dict: Dict[str, Any]):
+def register_edit_group(factory: Callable[[], ContextManager]) -> None:
+    """Register the context manager factory used by edit_group()."""
+    _current_hooks(create=True).group_factory = factory
+
+
+def register_owner(owner: Callable[[EditPath], Any]) -> None:
+    """Register the function returning modifiable containers by edit path."""
+    _current_hooks(create=True).owner = owner
+
+
+@contextmanager
+def edit_group() -> Iterator[None]:
+    """Report all edits made inside the block as one user action."""
+    hooks = _current_hooks()
+    factory = hooks.group_factory if hooks else None
+    with factory() if factory else nullcontext():
+        yield
+
+
+def owned(parent: Any, path: EditPath) -> Any:
+    """Container to bind or modify for the value at path (parent by default).
+
+    With a copy-on-write session the shared container is replaced by the
+    session's own copy first.
+    """
+    hooks = _current_hooks()
+    if path and hooks and hooks.owner:
+        return hooks.owner(path)
+    return parent
+
+
+def notify_change(
+    op: str, path: EditPath, value: Any = None, old_value: Any = None
+) -> None:
+    """Report an edit that was already applied to the configuration data."""
+    hooks = _current_hooks()
+    if not path or hooks is None:
+        return
+    for callback in hooks.listeners:
+        callback(op, tuple(path), value, old_value)
+
+
+def apply_ui_edit(
+    data: Dict[str, Any], op: str, path: EditPath, value: Any = None
+) -> Any:
+    """Apply an edit to the configuration data and report it to listeners."""
+    # MISSING tells listeners that the edit created the value
+    old_value = get_in(data, path)
+    if len(path) > 1:
+        owned(data, path[:-1])
+    apply_edit(data, op, path, value)
+    notify_change(op, path, value, old_value)
+    return None if old_value is MISSING else old_value
+
+
+def _on_field_change(path: EditPath):
+    """Build an on_change handler reporting edits of a bound field."""
+    return lambda e: notify_change(SET, path, e.value, e.previous_value)
+
+
+def create_ui_checkbox(
+    key: str, value: Any, parent_dict: Dict[str, Any], path: EditPath = ()
+):
+    ui.checkbox(
+        value=value, on_change=_on_field_change((*path, key)) if path else None
+    ).bind_value(parent_dict, key).classes(el_classes)
+
+
+def create_ui_int(
+    key: str, value: Any, parent_dict: Dict[str, Any], path: EditPath = ()
+):
+    ui.number(
+        value=value,
+        min=0,
+        on_change=_on_field_change((*path, key)) if path else None,
+    ).bind_value(parent_dict, key).props(el_props).classes(el_classes)
+
+
+def create_ui_str(
+    key: str, value: Any, parent_dict: Dict[str, Any], path: EditPath = ()
+):
     # Use textarea for long strings
-    if len(value) > 100:
-        ui.textarea(value=value, placeholder=f"Введите {key}").bind_value(
-            parent_dict, key
-        ).props(el_props).classes(el_classes)
-    else:
-        ui.input(value=value, placeholder=f"Введите {key}").bind_value(
-            parent_dict, key
-        ).props(el_props).classes(el_classes)
+    element = ui.textarea if len(value) > 100 else ui.input
+    element(
+        value=value,
+        placeholder=f"Введите {key}",
+        on_change=_on_field_change((*path, key)) if path else None,
+    ).bind_value(parent_dict, key).props(el_props).classes(el_classes)
 
 
-def create_ui_list(key: str, value: Any, parent_dict: Dict[str, Any]):
+def create_ui_list(
+    key: str, value: Any, parent_dict: Dict[str, Any], path: EditPath = ()
+):
     # Handle lists with proper filtering of empty lines
+    def update_list(e, k=key):
+        new_value = [line for line in e.value.splitlines() if line.strip()]
+        old_value = parent_dict.get(k)
+        parent_dict[k] = new_value
+        notify_change(SET, (*path, k) if path else (), new_value, old_value)
+
     ui.textarea(
         value="\n".join(map(str, value)),
         placeholder="Введите значения, каждое с новой строки",
-    ).on(
-        "change",
-        lambda e, k=key: parent_dict.update(
-            {k: [line for line in e.value.splitlines() if line.strip()]}
-        ),
-    ).props(el_props).classes(el_classes)
+    ).on("change", update_list).props(el_props).classes(el_classes)
 
 
-def create_ui_dict(key: str, value: Any, parent_dict: Dict[str, Any]):
+def create_ui_dict(
+    key: str, value: Any, parent_dict: Dict[str, Any], path: EditPath = ()
+):
     # Handle dictionaries recursively
     with ui.expansion(key, icon="schema").classes("w-full border rounded-lg"):
         with ui.column().classes("w-full p-2"):
             for sub_key, sub_value in value.items():
-                create_ui_element(sub_key, sub_value, value)
+                create_ui_element(
+                    sub_key, sub_value, value, (*path, key) if path else ()
+                )
 
 
-def create_ui_element(key: str, value: Any, parent_dict: Dict[str, Any]) -> None:
+def create_ui_element(
+    key: str, value: Any, parent_dict: Dict[str, Any], path: EditPath = ()
+) -> None:
     """Create a horizontal key:value UI pair with top-aligned label using NiceGUI.
 
     Args:
         key: Configuration key name
         value: Configuration value (can be bool, int, str, list)
         parent_dict: Parent dictionary to bind the value to
+        path: Edit path of parent_dict (e.g. ("paths.json", "cam1")), used to
+            report edits; edits are not reported when empty
     """
+    parent_dict = owned(parent_dict, path)
     with ui.row().classes("w-full items-start gap-2 mb-1"):
         # Label with tooltip
         label_element = ui.label(f"{key}:").classes(
@@ -72,15 +197,15 @@ def create_ui_element(key: str, value: Any, parent_dict: Dict[str, Any]) -> None
         if value is None:
             ui.label("None").classes(el_classes)
         elif isinstance(value, bool):
-            create_ui_checkbox(key, value, parent_dict)
+            create_ui_checkbox(key, value, parent_dict, path)
         elif isinstance(value, list):
-            create_ui_list(key, value, parent_dict)
+            create_ui_list(key, value, parent_dict, path)
         elif isinstance(value, int):
-            create_ui_int(key, value, parent_dict)
+            create_ui_int(key, value, parent_dict, path)
         elif isinstance(value, str):
-            create_ui_str(key, value, parent_dict)
+            create_ui_str(key, value, parent_dict, path)
         elif isinstance(value, dict):
-            create_ui_dict(key, value, parent_dict)
+            create_ui_dict(key, value, parent_dict, path)
 
 
 def get_parameter_tooltip(param_name: str) -> str:
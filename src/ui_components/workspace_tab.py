@@ -0,0 +1,100 @@
+"""Instances tab: switch between the instances of a workspace and render them."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from nicegui import ui
+
+from src.core.workspace import RenderReport, Workspace
+
+
+def build_workspace_tab(
+    workspace: Workspace, edited: Optional[str] = None
+) -> Callable[..., Awaitable[None]]:
+    """Build the Instances tab content.
+
+    Args:
+        workspace: Workspace whose instances are listed and rendered
+        edited: Instance whose overrides this session edits (None: common)
+
+    Returns:
+        Coroutine function rendering the changed instances (e.g. after a save)
+    """
+    instances = workspace.instances()
+    state: Dict[str, Any] = {
+        "instance": edited or (instances[0] if instances else None),
+        "yaml": "",
+        "overrides": "",
+        "report": "",
+    }
+
+    def show_instance() -> None:
+        """Show the rendered config and the override files of the instance."""
+        name = state["instance"]
+        if name is None:
+            state["yaml"] = "# Нет инстансов в " + str(workspace.instances_dir)
+            return
+        output = workspace.output_file(name)
+        state["yaml"] = (
+            output.read_text(encoding="utf-8")
+            if output.exists()
+            else "# Конфигурация ещё не отрендерена"
+        )
+        overrides = sorted(p.name for p in workspace.instance_dir(name).glob("*.json"))
+        state["overrides"] = (
+            "Переопределено: " + ", ".join(overrides)
+            if overrides
+            else "Все секции общие"
+        )
+
+    async def render(force: bool = False) -> None:
+        report: RenderReport = await asyncio.to_thread(workspace.render, force)
+        state["report"] = (
+            f"Отрендерено: {len(report.rendered)}, без изменений: "
+            f"{len(report.unchanged)}, ошибок: {len(report.errors)} "
+            f"({report.elapsed * 1000:.0f} мс)"
+        )
+        if report.errors:
+            ui.notify(
+                "Ошибки рендеринга: "
+                + "; ".join(f"{n}: {e}" for n, e in report.errors.items()),
+                color="negative",
+                timeout=10000,
+            )
+        show_instance()
+
+    with ui.row().classes("w-full items-center mb-4"):
+        ui.select(
+            instances,
+            label="Инстанс",
+            on_change=lambda e: show_instance(),
+        ).props("outlined dense").classes("w-64").bind_value(state, "instance")
+        ui.label().classes("text-grey-7 ml-2").bind_text_from(state, "overrides")
+        ui.space()
+        # Each session edits one layer: the common sections or an instance
+        ui.button(
+            "Редактировать",
+            on_click=lambda: ui.navigate.to(f"/?instance={state['instance']}"),
+            icon="edit",
+        ).props("outline").bind_enabled_from(state, "instance")
+        ui.button(
+            "Общие секции", on_click=lambda: ui.navigate.to("/"), icon="layers"
+        ).props("outline").set_visibility(edited is not None)
+        ui.button("Рендерить изменённые", on_click=lambda: render(), icon="sync").props(
+            "outline"
+        )
+        ui.button(
+            "Рендерить все", on_click=lambda: render(force=True), icon="refresh"
+        ).props("outline")
+
+    ui.label().classes("text-grey-7 mb-2").bind_text_from(state, "report")
+
+    with (
+        ui.scroll_area()
+        .classes("w-full border rounded")
+        .style("height: calc(100vh - 300px)")
+    ):
+        ui.code(language="yaml").classes("w-full").bind_content_from(state, "yaml")
+
+    show_instance()
+    return render
@@ -0,0 +1,160 @@
+"""Structural diff and three-way merge of configuration data."""
+
+import json
+from itertools import chain
+from typing import Any, Dict, Iterator, NamedTuple, Tuple
+
+from src.utils.json_utils import MISSING
+
+ADDED = "added"
+REMOVED = "removed"
+MODIFIED = "modified"
+
+
+class Change(NamedTuple):
+    """One difference between two configurations."""
+
+    op: str  # ADDED, REMOVED or MODIFIED
+    path: Tuple[Any, ...]  # section key first, then dict keys / list indexes
+    old: Any = None
+    new: Any = None
+
+
+def diff_values(old: Any, new: Any, path: Tuple[Any, ...] = ()) -> Iterator[Change]:
+    """Yield changes turning old into new, descending into dicts and lists.
+
+    Dicts are matched by key and lists by index, so the cost is linear in the
+    size of the compared values. Values of different types are reported as
+    one modification.
+    """
+    # Equal subtrees are skipped with one C-level comparison
+    if _same(old, new):
+        return
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key, old_value in old.items():
+            if key not in new:
+                yield Change(REMOVED, path + (key,), old_value, None)
+            else:
+                yield from diff_values(old_value, new[key], path + (key,))
+        for key, new_value in new.items():
+            if key not in old:
+                yield Change(ADDED, path + (key,), None, new_value)
+    elif isinstance(old, list) and isinstance(new, list):
+        for i, (old_value, new_value) in enumerate(zip(old, new)):
+            yield from diff_values(old_value, new_value, path + (i,))
+        for i in range(len(new), len(old)):
+            yield Change(REMOVED, path + (i,), old[i], None)
+        for i in range(len(old), len(new)):
+            yield Change(ADDED, path + (i,), None, new[i])
+    else:
+        yield Change(MODIFIED, path, old, new)
+
+
+def _same(a: Any, b: Any) -> bool:
+    return a is b or (type(a) is type(b) and a == b)
+
+
+class Conflict(NamedTuple):
+    """A value changed differently on both sides of a three-way merge."""
+
+    path: Tuple[Any, ...]
+    base: Any  # MISSING where the value did not exist
+    ours: Any
+    theirs: Any
+
+
+class MergeResult(NamedTuple):
+    """Outcome of merge3()."""
+
+    merged: Any
+    # (path, value) taken from theirs, i.e. the edits that turn ours into merged
+    theirs: list[Tuple[Tuple[Any, ...], Any]]
+    conflicts: list[Conflict]
+
+
+def merge3(
+    base: Any, ours: Any, theirs: Any, path: Tuple[Any, ...] = ()
+) -> MergeResult:
+    """Merge two versions derived from a common base.
+
+    Dicts are merged key by key, so changes to different streams or to
+    different fields of one stream combine. Lists and scalars are merged as
+    whole values. Where both sides changed a value differently the conflict
+    is recorded and ours is kept. MISSING stands for an absent value.
+    """
+    result = MergeResult(None, [], [])
+    merged = _merge(base, ours, theirs, path, result)
+    return result._replace(merged=merged)
+
+
+def _merge(
+    base: Any, ours: Any, theirs: Any, path: Tuple[Any, ...], result: MergeResult
+) -> Any:
+    if _same(ours, theirs) or _same(base, theirs):
+        return ours
+    if _same(base, ours):
+        result.theirs.append((path, theirs))
+        return theirs
+    if (
+        isinstance(ours, dict)
+        and isinstance(theirs, dict)
+        and (base is MISSING or isinstance(base, dict))
+    ):
+        base = {} if base is MISSING else base
+        merged = {}
+        for key in chain(ours, (k for k in theirs if k not in ours)):
+            value = _merge(
+                base.get(key, MISSING),
+                ours.get(key, MISSING),
+                theirs.get(key, MISSING),
+                path + (key,),
+                result,
+            )
+            if value is not MISSING:
+                merged[key] = value
+        return merged
+    result.conflicts.append(Conflict(path, base, ours, theirs))
+    return ours
+
+
+def diff_data(old: Dict[str, Any], new: Dict[str, Any]) -> list[Change]:
+    """Diff two manager data dicts (sections and *_enabled flags)."""
+    return list(diff_values(old, new))
+
+
+def summarize(changes: list[Change]) -> Dict[str, Dict[str, int]]:
+    """Count changed entries per section, by the second path element.
+
+    For paths.json this counts added, removed and modified streams.
+    """
+    summary: Dict[str, Dict[str, set]] = {}
+    for change in changes:
+        section = str(change.path[0])
+        counts = summary.setdefault(
+            section, {ADDED: set(), REMOVED: set(), MODIFIED: set()}
+        )
+        entry = change.path[1] if len(change.path) > 1 else None
+        counts[change.op if len(change.path) <= 2 else MODIFIED].add(entry)
+    return {
+        section: {op: len(entries) for op, entries in counts.items()}
+        for section, counts in summary.items()
+    }
+
+
+def _format_value(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+def format_diff(changes: list[Change]) -> str:
+    """Render changes as diff-style text lines, e.g. for ui.code(language="diff")."""
+    lines = []
+    for change in changes:
+        location = "/".join(str(part) for part in change.path)
+        if change.op == ADDED:
+            lines.append(f"+ {location}: {_format_value(change.new)}")
+        elif change.op == REMOVED:
+            lines.append(f"- {location}: {_format_value(change.old)}")
+        else:
+            lines.append(f"- {location}: {_format_value(change.old)}")
+            lines.append(f"+ {location}: {_format_value(change.new)}")
+    return "\n".join(lines)
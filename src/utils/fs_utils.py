@@ -0,0 +1,94 @@
+"""Crash-safe file writing helpers."""
+
+import os
+import shutil
+import stat
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+from src.core.log import logger
+
+
+def _target_mode(target: Path) -> int:
+    """Permissions for a new file: keep the existing mode, else honour umask."""
+    try:
+        return stat.S_IMODE(target.stat().st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def _fsync_path(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def link_backup(target: Path, backup: Path) -> None:
+    """Make backup point to the current content of target without copying.
+
+    A hard link is created under a temporary name and renamed over backup,
+    so an existing backup is replaced atomically. If the filesystem does not
+    support hard links, the file is copied instead.
+    """
+    tmp_link = backup.with_name(f".{backup.name}.link")
+    tmp_link.unlink(missing_ok=True)
+    try:
+        os.link(target, tmp_link)
+    except OSError:
+        logger.debug(f"Hard link not supported for {backup}, copying instead")
+        shutil.copy2(target, tmp_link)
+    os.replace(tmp_link, backup)
+
+
+def atomic_write_many(
+    contents: Dict[Path, str],
+    backups: Optional[Dict[Path, Path]] = None,
+    fsync: bool = True,
+) -> None:
+    """Atomically replace several text files.
+
+    Each file is written to a temp file in its own directory. All temp files
+    are fsynced in one batch, optional backups are hard-linked to the previous
+    versions, and then every temp file is os.replace()d over its target.
+    Readers always see either the old or the new complete file.
+    """
+    backups = backups or {}
+    pending: list[tuple[str, Path]] = []
+    try:
+        for target, text in contents.items():
+            fd, tmp_name = tempfile.mkstemp(
+                dir=target.parent, prefix=f".{target.name}.", suffix=".tmp"
+            )
+            pending.append((tmp_name, target))
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.chmod(tmp_name, _target_mode(target))
+
+        if fsync:
+            for tmp_name, _ in pending:
+                _fsync_path(Path(tmp_name))
+
+        for target, backup in backups.items():
+            if target.exists():
+                link_backup(target, backup)
+                logger.info(f"Backup created: {backup}")
+
+        for tmp_name, target in pending:
+            os.replace(tmp_name, target)
+    except BaseException:
+        for tmp_name, _ in pending:
+            Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+    if fsync:
+        for directory in {target.parent for target in contents}:
+            try:
+                _fsync_path(directory)
+            except OSError:
+                # Directory fsync is not supported on every platform
+                pass
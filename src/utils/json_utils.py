@@ -1,10 +1,31 @@
+import copy
+import hashlib
 import json
+from typing import Any, Sequence, Union
 
 from src.core.config import get_settings
 from pydantic import ValidationError  # <-- Добавлен BaseModel
 
 from src.core.log import logger
 
+# Edit operations on nested configuration data
+SET = "set"
+DELETE = "del"
+INSERT = "ins"
+
+
+class _Missing:
+    """Marker for a value that did not exist before an edit."""
+
+    def __repr__(self) -> str:
+        return "MISSING"
+
+
+MISSING: Any = _Missing()
+
+# Path to a nested value: section key first, then dict keys / list indexes
+EditPath = Sequence[Union[str, int]]
+
 
 # Define paths - using function to avoid module-level initialization
 def _get_json_dir():
@@ -43,3 +64,88 @@ def load_data():
 
     logger.info("Configuration data loaded and validated successfully.")
     return data
+
+
+def section_hash(content: Any) -> str:
+    """Return a stable content hash of a section, independent of key order."""
+    canonical = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def get_in(data: Any, path: EditPath, default: Any = MISSING) -> Any:
+    """Return the value at a nested path, or default if it does not exist."""
+    target = data
+    try:
+        for key in path:
+            target = target[key]
+    except (KeyError, IndexError, TypeError):
+        return default
+    return target
+
+
+def apply_edit(data: Any, op: str, path: EditPath, value: Any = None) -> Any:
+    """Apply a set/ins/del edit at a nested path and return the previous value.
+
+    Missing intermediate dicts are created for SET. Setting a list index equal
+    to the list length appends; INSERT shifts the following list items.
+    """
+    *parents, last = path
+    target = data
+    for key in parents:
+        if op == SET and isinstance(target, dict):
+            target = target.setdefault(key, {})
+        else:
+            target = target[key]
+
+    if op == INSERT and isinstance(target, list):
+        target.insert(last, value)
+        return None
+    if op in (SET, INSERT):
+        if isinstance(target, list) and last == len(target):
+            target.append(value)
+            return None
+        old_value = target.get(last) if isinstance(target, dict) else target[last]
+        target[last] = value
+        return old_value
+    if op == DELETE:
+        return target.pop(last)
+    raise ValueError(f"Unsupported edit operation: {op}")
+
+
+def set_in_copy(data: Any, path: EditPath, value: Any, copied: set) -> bool:
+    """Write a deep copy of value at path, copying containers on the way.
+
+    Containers whose id is in copied are modified in place; others are
+    shallow-copied first, so structures shared with older versions are never
+    changed. A MISSING value deletes the path.
+
+    Returns:
+        False if path cannot be created (e.g. through a scalar)
+    """
+    parent: Any = data
+    for key in path[:-1]:
+        child = get_in(parent, (key,))
+        if child is MISSING:
+            if value is MISSING:
+                # Nothing left to delete
+                return True
+            if not isinstance(parent, dict):
+                return False
+            child = {}
+        elif not isinstance(child, (dict, list)):
+            return False
+        elif id(child) not in copied:
+            child = dict(child) if isinstance(child, dict) else list(child)
+        copied.add(id(child))
+        parent[key] = child
+        parent = child
+
+    last = path[-1]
+    if value is MISSING:
+        if isinstance(parent, dict):
+            parent.pop(last, None)
+        elif isinstance(last, int) and last < len(parent):
+            del parent[last]
+        return True
+    apply_edit(parent, SET, (last,), copy.deepcopy(value))
+    return True
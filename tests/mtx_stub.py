@@ -0,0 +1,132 @@
+"""Local stub of the mediamtx Control API for tests."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+from urllib.parse import parse_qs, unquote, urlsplit
+
+
+class MtxStub:
+    """In-memory mediamtx API on 127.0.0.1: config, runtime paths and metrics.
+
+    fail_next makes the next N requests answer 503. connections counts the
+    TCP connections accepted, requests logs (method, path) of every request.
+    """
+
+    def __init__(self) -> None:
+        self.paths_config: Dict[str, Dict[str, Any]] = {}
+        self.global_config: Dict[str, Any] = {"logLevel": "info"}
+        self.path_defaults: Dict[str, Any] = {"record": False}
+        # Items of /v3/paths/list
+        self.paths: list[Dict[str, Any]] = []
+        # Body of /metrics (Prometheus text format)
+        self.metrics = ""
+        self.fail_next = 0
+        self.connections = 0
+        self.requests: list[tuple[str, str]] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "MtxStub":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handle(self, method: str, url: str, body: Any) -> tuple[int, Any]:
+        parts = urlsplit(url)
+        path = parts.path
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        with self._lock:
+            self.requests.append((method, path))
+            if self.fail_next > 0:
+                self.fail_next -= 1
+                return 503, {"error": "unavailable"}
+
+            if path == "/v3/config/paths/list":
+                return 200, self._page(list(self.paths_config.values()), query)
+            if path == "/metrics":
+                return 200, self.metrics
+            if path == "/v3/paths/list":
+                return 200, self._page(self.paths, query)
+            if path.startswith("/v3/config/paths/"):
+                action, _, name = path[len("/v3/config/paths/") :].partition("/")
+                name = unquote(name)
+                exists = name in self.paths_config
+                if action == "get":
+                    if not exists:
+                        return 404, {"error": "path not found"}
+                    return 200, self.paths_config[name]
+                if action == "add" and not exists:
+                    self.paths_config[name] = {"name": name, **body}
+                elif action == "patch" and exists:
+                    self.paths_config[name].update(body)
+                elif action == "delete" and exists:
+                    del self.paths_config[name]
+                else:
+                    return 400, {"error": f"cannot {action} {name}"}
+                return 200, {}
+            if path == "/v3/config/global/get":
+                return 200, self.global_config
+            if path == "/v3/config/global/patch":
+                self.global_config.update(body)
+                return 200, {}
+            if path == "/v3/config/pathdefaults/get":
+                return 200, self.path_defaults
+            if path == "/v3/config/pathdefaults/patch":
+                self.path_defaults.update(body)
+                return 200, {}
+        return 404, {"error": "not found"}
+
+    @staticmethod
+    def _page(items: list, query: Dict[str, str]) -> Dict[str, Any]:
+        page = int(query.get("page", 0))
+        per_page = int(query.get("itemsPerPage", 100))
+        page_count = max(1, -(-len(items) // per_page))
+        return {
+            "pageCount": page_count,
+            "itemCount": len(items),
+            "items": items[page * per_page : (page + 1) * per_page],
+        }
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def _serve(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                status, payload = stub._handle(self.command, self.path, body)
+                if isinstance(payload, str):
+                    raw, content_type = payload.encode(), "text/plain; version=0.0.4"
+                else:
+                    raw, content_type = json.dumps(payload).encode(), "application/json"
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(raw)))
+                self.end_headers()
+                self.wfile.write(raw)
+
+            do_GET = do_POST = do_PATCH = do_DELETE = _serve
+
+        return Handler
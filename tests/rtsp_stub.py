@@ -0,0 +1,113 @@
+"""Local RTSP server stub for source probe tests and benchmarks."""
+
+import asyncio
+import hashlib
+import re
+from collections import Counter
+from typing import Iterable, Optional
+from urllib.parse import urlsplit
+
+NONCE = "0a4f113b"
+SDP = b"v=0\r\no=- 0 0 IN IP4 127.0.0.1\r\ns=stub\r\nt=0 0\r\nm=video 0 RTP/AVP 96\r\n"
+
+
+def _md5(text: str) -> str:
+    return hashlib.md5(text.encode()).hexdigest()
+
+
+class RtspStub:
+    """RTSP server on all interfaces answering OPTIONS and DESCRIBE.
+
+    DESCRIBE returns 200 with an SDP for the paths in streams and 404 for
+    others; with user set it requires Digest authentication. delay holds
+    every connection before the first answer. Connections are counted per
+    local address, so several 127.0.0.x hosts can share one stub.
+    """
+
+    def __init__(
+        self,
+        streams: Iterable[str] = ("cam",),
+        user: Optional[str] = None,
+        password: str = "",
+        delay: float = 0.0,
+        realm: str = "stub",
+    ):
+        self.streams = set(streams)
+        self.user = user
+        self.password = password
+        self.delay = delay
+        self.realm = realm
+        self.port = 0
+        self.active: Counter = Counter()
+        self.max_active = 0
+        self.max_active_per_host: Counter = Counter()
+        self._server: Optional[asyncio.Server] = None
+
+    async def __aenter__(self) -> "RtspStub":
+        self._server = await asyncio.start_server(self._serve, "0.0.0.0", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._server.close()
+
+    def url(self, path: str, host: str = "127.0.0.1", auth: str = "") -> str:
+        return f"rtsp://{auth + '@' if auth else ''}{host}:{self.port}/{path}"
+
+    def _authorized(self, method: str, authorization: Optional[str]) -> bool:
+        if self.user is None:
+            return True
+        if not authorization or not authorization.startswith("Digest "):
+            return False
+        fields = dict(re.findall(r'(\w+)="?([^",]*)"?', authorization[7:]))
+        ha1 = _md5(f"{self.user}:{self.realm}:{self.password}")
+        ha2 = _md5(f"{method}:{fields.get('uri', '')}")
+        return fields.get("username") == self.user and fields.get("response") == _md5(
+            f"{ha1}:{NONCE}:{ha2}"
+        )
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        host = writer.get_extra_info("sockname")[0]
+        self.active[host] += 1
+        self.max_active = max(self.max_active, sum(self.active.values()))
+        self.max_active_per_host[host] = max(
+            self.max_active_per_host[host], self.active[host]
+        )
+        try:
+            await asyncio.sleep(self.delay)
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                request_line, *lines = head.decode().split("\r\n")
+                method, uri, _ = request_line.split(" ")
+                headers = {
+                    name.strip().lower(): value.strip()
+                    for name, _, value in (line.partition(":") for line in lines)
+                }
+                answer = [f"CSeq: {headers.get('cseq', '0')}"]
+                body = b""
+                if method == "OPTIONS":
+                    status = "200 OK"
+                    answer.append("Public: OPTIONS, DESCRIBE")
+                elif urlsplit(uri).path.lstrip("/") not in self.streams:
+                    status = "404 Not Found"
+                elif not self._authorized(method, headers.get("authorization")):
+                    status = "401 Unauthorized"
+                    answer.append(
+                        f'WWW-Authenticate: Digest realm="{self.realm}", '
+                        f'nonce="{NONCE}"'
+                    )
+                else:
+                    status = "200 OK"
+                    body = SDP
+                    answer.append("Content-Type: application/sdp")
+                answer.append(f"Content-Length: {len(body)}")
+                response = "\r\n".join([f"RTSP/1.0 {status}", *answer]) + "\r\n\r\n"
+                writer.write(response.encode() + body)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.active[host] -= 1
+            writer.close()
@@ -0,0 +1,64 @@
+"""Tests for transactional batches of manager edits."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.mtx_manager import MtxConfigManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """Manager with one stream and no journal or history."""
+    manager = MtxConfigManager(json_dir=tmp_path)
+    manager.journal = None
+    manager.history = None
+    manager.data = {"paths.json": {"cam1": {"source": "rtsp://a"}}}
+    manager.paths_config
+    return manager
+
+
+class TestBatch:
+    """Tests for MtxConfigManager.batch()."""
+
+    def test_commit_notifies_once_and_undoes_as_one_step(self, manager):
+        observer = MagicMock(__name__="observer")
+        manager.register_observer(observer)
+
+        with manager.batch() as batch:
+            for i in range(100):
+                assert manager.add_stream(f"new{i}", "Source")
+            manager.remove_stream("cam1")
+            observer.assert_not_called()
+
+        observer.assert_called_once_with("paths.json", manager.data["paths.json"])
+        assert batch.keys == ["paths.json"]
+        assert manager.paths_config.get_stream("new99") is not None
+        assert manager.paths_config.get_stream("cam1") is None
+
+        manager.undo()
+        assert manager.data["paths.json"] == {"cam1": {"source": "rtsp://a"}}
+
+    def test_invalid_stream_rolls_back_everything(self, manager):
+        observer = MagicMock(__name__="observer")
+        manager.register_observer(observer)
+
+        with pytest.raises(ValueError, match="paths.json:cam1"):
+            with manager.batch():
+                manager.add_stream("new", "Source")
+                manager.update_stream("cam1", {"source": "not a url"})
+
+        assert manager.data["paths.json"] == {"cam1": {"source": "rtsp://a"}}
+        assert manager.paths_config.get_stream("new") is None
+        assert not manager.undo_stack.can_undo
+        observer.assert_not_called()
+
+    def test_error_in_block_rolls_back(self, manager):
+        with pytest.raises(RuntimeError):
+            with manager.batch():
+                manager.add_stream("new", "Source")
+                with manager.batch():
+                    manager.remove_stream("cam1")
+                raise RuntimeError("import aborted")
+
+        assert manager.data["paths.json"] == {"cam1": {"source": "rtsp://a"}}
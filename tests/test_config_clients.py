@@ -2,13 +2,21 @@
 
 import json
 import pytest
+import yaml
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
-from src.clients.config_clients import get_config_client
-from src.clients.yaml_client import YAMLClient
+from src.clients.config_clients import ClientPool, get_config_client
+from src.clients.yaml_client import (
+    BuiltinDefaults,
+    YAMLClient,
+    compact_config,
+    config_differences,
+    load_builtin_defaults,
+)
 from src.clients.json_client import JSONClient
 from src.core.config import get_settings
+from src.mtx_manager import MtxConfigManager
 
 
 class TestJSONClient:
@@ -202,6 +210,88 @@ class TestYAMLClient:
         with pytest.raises(NotImplementedError):
             client.load_config()
 
+    BUILTIN = BuiltinDefaults(
+        {"rtsp": True, "logLevel": "info", "rtspTransports": ["udp", "tcp"]},
+        {"record": False, "sourceOnDemand": False},
+    )
+
+    def test_compact_config_drops_builtin_defaults(self):
+        """Path keys are kept where pathDefaults changes the default."""
+        config = {
+            "rtsp": True,
+            "logLevel": "debug",
+            "rtspTransports": ["tcp"],
+            "pathDefaults": {"record": False, "sourceOnDemand": True},
+            "paths": {
+                "a": {"source": "rtsp://x", "record": False, "sourceOnDemand": False},
+                "b": {"record": False},
+            },
+        }
+        compact = compact_config(config, self.BUILTIN)
+        assert compact == {
+            "logLevel": "debug",
+            "rtspTransports": ["tcp"],
+            "pathDefaults": {"sourceOnDemand": True},
+            "paths": {"a": {"source": "rtsp://x", "sourceOnDemand": False}, "b": {}},
+        }
+        assert config_differences(config, compact, self.BUILTIN) == []
+
+        del compact["paths"]["a"]["sourceOnDemand"]
+        compact["rtsp"] = 1
+        assert sorted(config_differences(config, compact, self.BUILTIN)) == [
+            "paths/a/sourceOnDemand",
+            "rtsp",
+        ]
+
+    def test_builtin_defaults_table(self):
+        """The shipped table is read once, without paths."""
+        load_builtin_defaults.cache_clear()
+        defaults_file = get_settings().MTX_DEFAULTS_FILE
+        defaults = load_builtin_defaults(defaults_file)
+        assert defaults.settings["rtspAddress"] == ":8554"
+        assert defaults.path_defaults["source"] == "publisher"
+        assert "paths" not in defaults.settings
+        assert "authInternalUsers" not in defaults.settings
+        assert load_builtin_defaults(defaults_file) is defaults
+
+    @patch("src.clients.yaml_client.get_settings_func")
+    @patch("src.clients.yaml_client.JSONClient")
+    def test_save_config_compact(self, _json_client, mock_get_settings, temp_work_dir):
+        """The compact file loads to the same effective config."""
+        work_dir, json_dir, yaml_file, yaml_backup = temp_work_dir
+        mock_settings = MagicMock()
+        mock_settings.MTX_JSON_DIR = json_dir
+        mock_settings.MTX_YAML_FILE = yaml_file
+        mock_settings.MTX_YAML_BACKUP_FILE = yaml_backup
+        mock_settings.MTX_DEFAULTS_FILE = get_settings().MTX_DEFAULTS_FILE
+        mock_get_settings.return_value = mock_settings
+        data = {
+            "values_rtsp.json": {"rtsp": True, "rtspAddress": ":8555"},
+            "values_app.json": {"logLevel": "info", "readTimeout": "10s"},
+            "values_pathDefaults.json": {"record": False},
+            "paths.json": {"cam": {"source": "rtsp://x", "sourceOnDemand": False}},
+        }
+        client = YAMLClient()
+
+        client.save_config(data)
+        full = yaml.safe_load(yaml_file.read_text())
+        client.save_config(data, compact=True)
+        compact = yaml.safe_load(yaml_file.read_text())
+
+        assert compact == {
+            "rtspAddress": ":8555",
+            "paths": {"cam": {"source": "rtsp://x"}},
+        }
+        defaults = load_builtin_defaults(mock_settings.MTX_DEFAULTS_FILE)
+        assert config_differences(full, compact, defaults) == []
+
+        # A compaction that would change the config is not written
+        with patch(
+            "src.clients.yaml_client.compact_config", return_value={"paths": {}}
+        ):
+            client.save_config(data, compact=True)
+        assert yaml.safe_load(yaml_file.read_text()) == full
+
 
 class TestGetConfigClient:
     """Tests for get_config_client factory function."""
@@ -226,3 +316,83 @@ class TestGetConfigClient:
         client1 = get_config_client("JSON")
         client2 = get_config_client("JSON")
         assert client1 is client2  # Same instance due to @lru_cache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestClientPool:
+    """Tests for the per-directory ClientPool."""
+
+    def test_keyed_by_directory(self, tmp_path):
+        pool = ClientPool()
+        first = pool.get("JSON", tmp_path / "a")
+        assert pool.get("JSON", tmp_path / "a" / ".." / "a") is first
+        assert pool.get("JSON", tmp_path / "b") is not first
+        assert pool.get("JSON", tmp_path / "b").json_dir == tmp_path / "b"
+        assert len(pool) == 2
+
+    def test_default_directory_shares_client(self):
+        pool = ClientPool()
+        json_dir = get_settings().MTX_JSON_DIR
+        assert pool.get("JSON") is pool.get("JSON", json_dir)
+        assert pool.get("YAML", Path(json_dir) / ".." / Path(json_dir).name) is (
+            pool.get("YAML")
+        )
+        assert len(pool) == 2
+
+    def test_lru_bound_closes_evicted(self, tmp_path):
+        pool = ClientPool(max_size=2)
+        clients = [pool.get("JSON", tmp_path / str(i)) for i in range(2)]
+        pool.get("JSON", tmp_path / "0")
+        with patch.object(JSONClient, "close") as close:
+            pool.get("JSON", tmp_path / "2")
+        # "1" was the least recently used
+        assert close.call_count == 1
+        assert pool.get("JSON", tmp_path / "0") is clients[0]
+        assert pool.get("JSON", tmp_path / "1") is not clients[1]
+        assert len(pool) == 2
+
+    def test_idle_clients_closed(self, tmp_path):
+        clock = FakeClock()
+        pool = ClientPool(idle_timeout=60.0, clock=clock)
+        idle = pool.get("JSON", tmp_path / "idle")
+        clock.now = 30.0
+        busy = pool.get("JSON", tmp_path / "busy")
+        clock.now = 70.0
+        with patch.object(JSONClient, "close") as close:
+            assert pool.get("JSON", tmp_path / "busy") is busy
+        assert close.call_count == 1
+        assert pool.get("JSON", tmp_path / "idle") is not idle
+
+    def test_yaml_client_for_other_directory(self, tmp_path):
+        client = ClientPool().get("YAML", tmp_path / "edge1")
+        assert client.yaml_file == tmp_path / "edge1.yml"
+        assert client.json_client.json_dir == tmp_path / "edge1"
+
+    def test_managers_use_own_directories(self, tmp_path):
+        """One process serves managers of several section directories."""
+        get_config_client.cache_clear()
+        managers = []
+        for name in ("edge0", "edge1"):
+            json_dir = tmp_path / name
+            json_dir.mkdir()
+            (json_dir / "paths.json").write_text(
+                json.dumps({name: {"source": f"rtsp://{name}"}})
+            )
+            manager = MtxConfigManager(json_dir=json_dir, render_yaml=False)
+            manager.load_data()
+            managers.append(manager)
+
+        assert [list(m.data["paths.json"]) for m in managers] == [["edge0"], ["edge1"]]
+        managers[1].data["paths.json"]["cam9"] = {"source": "rtsp://cam9"}
+        managers[1].save_data()
+        assert "cam9" in json.loads((tmp_path / "edge1" / "paths.json").read_text())
+        assert "cam9" not in json.loads((tmp_path / "edge0" / "paths.json").read_text())
+        assert not (tmp_path / "edge1.yml").exists()
+        get_config_client.cache_clear()
@@ -0,0 +1,116 @@
+"""Tests for the structural diff utilities."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+from src.clients.config_clients import get_config_client
+from src.mtx_manager import MtxConfigManager
+from src.utils.diff_utils import (
+    ADDED,
+    MODIFIED,
+    REMOVED,
+    Change,
+    Conflict,
+    diff_data,
+    format_diff,
+    merge3,
+    summarize,
+)
+from src.utils.json_utils import MISSING
+
+
+class TestDiffData:
+    """Tests for diff_data and its helpers."""
+
+    def test_field_level_changes(self):
+        """Streams are matched by name and compared field by field."""
+        old = {"paths.json": {"cam1": {"source": "a", "record": True}, "cam2": {}}}
+        new = {"paths.json": {"cam1": {"source": "b", "record": True}, "cam3": {}}}
+
+        assert diff_data(old, new) == [
+            Change(MODIFIED, ("paths.json", "cam1", "source"), "a", "b"),
+            Change(REMOVED, ("paths.json", "cam2"), {}, None),
+            Change(ADDED, ("paths.json", "cam3"), None, {}),
+        ]
+
+    def test_lists_by_index(self):
+        """Lists are compared by index, extra items are added or removed."""
+        old = {"auth.json": {"users": [{"user": "a"}, {"user": "b"}]}}
+        new = {"auth.json": {"users": [{"user": "x"}]}}
+
+        assert diff_data(old, new) == [
+            Change(MODIFIED, ("auth.json", "users", 0, "user"), "a", "x"),
+            Change(REMOVED, ("auth.json", "users", 1), {"user": "b"}, None),
+        ]
+
+    def test_summary_and_format(self):
+        """Summary counts streams; format renders +/- lines."""
+        changes = diff_data(
+            {"paths.json": {"cam1": {"source": "a"}, "cam2": {}}},
+            {"paths.json": {"cam1": {"source": "b"}, "cam3": {}}},
+        )
+        assert summarize(changes) == {"paths.json": {ADDED: 1, REMOVED: 1, MODIFIED: 1}}
+        assert format_diff(changes).splitlines()[:2] == [
+            '- paths.json/cam1/source: "a"',
+            '+ paths.json/cam1/source: "b"',
+        ]
+
+
+def test_diff_with_disk(tmp_path):
+    """Only unsaved edits are reported against the section files."""
+    json_dir = tmp_path / "json"
+    json_dir.mkdir()
+    (json_dir / "paths.json").write_text(json.dumps({"cam1": {"source": "a"}}))
+    (json_dir / "values_app.json").write_text(json.dumps({"logLevel": "info"}))
+
+    get_config_client.cache_clear()
+    mock_settings = MagicMock()
+    mock_settings.MTX_JSON_DIR = json_dir
+    with patch("src.clients.json_client.get_settings_func", return_value=mock_settings):
+        manager = MtxConfigManager(json_dir=json_dir)
+        manager.load_data()
+        assert manager.diff_with_disk() == []
+
+        manager.data["paths.json"]["cam1"]["source"] = "b"
+        assert manager.diff_with_disk() == [
+            Change(MODIFIED, ("paths.json", "cam1", "source"), "a", "b")
+        ]
+    get_config_client.cache_clear()
+
+
+class TestMerge3:
+    """Tests for the three-way merge."""
+
+    def test_merges_streams_and_fields(self):
+        """Changes to different streams and fields of one stream combine."""
+        base = {"cam1": {"source": "a", "record": False}, "cam2": {"source": "b"}}
+        ours = {"cam1": {"source": "x", "record": False}, "cam2": {"source": "b"}}
+        theirs = {"cam1": {"source": "a", "record": True}, "cam3": {"source": "c"}}
+
+        result = merge3(base, ours, theirs, ("paths.json",))
+
+        assert result.merged == {
+            "cam1": {"source": "x", "record": True},
+            "cam3": {"source": "c"},
+        }
+        assert result.theirs == [
+            (("paths.json", "cam1", "record"), True),
+            (("paths.json", "cam2"), MISSING),
+            (("paths.json", "cam3"), {"source": "c"}),
+        ]
+        assert result.conflicts == []
+
+    def test_conflicts_keep_ours(self):
+        """A value changed differently on both sides is a conflict."""
+        base = {"cam1": {"source": "a", "runOnInit": ["x"]}}
+        ours = {"cam1": {"source": "b", "runOnInit": ["x", "y"]}}
+        theirs = {"cam1": {"source": "c", "runOnInit": ["z"]}}
+
+        result = merge3(base, ours, theirs)
+
+        assert result.merged == ours
+        assert result.conflicts == [
+            Conflict(("cam1", "source"), "a", "b", "c"),
+            # Lists are merged as whole values
+            Conflict(("cam1", "runOnInit"), ["x"], ["x", "y"], ["z"]),
+        ]
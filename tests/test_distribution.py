@@ -0,0 +1,129 @@
+"""Tests for the config distribution endpoint."""
+
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.core.distribution import ConfigStore, parse_range, register_config_routes
+from src.core.workspace import Workspace
+
+
+@pytest.fixture
+def served(tmp_path):
+    """Workspace with two rendered instances served by a test app."""
+    common = tmp_path / "common"
+    common.mkdir()
+    (common / "values_app.json").write_text(json.dumps({"logLevel": "info"}))
+    paths = {f"cam{i}": {"source": f"rtsp://10.0.0.{i}/live"} for i in range(200)}
+    (common / "paths.json").write_text(json.dumps(paths))
+    for name in ("edge0", "edge1"):
+        (tmp_path / "instances" / name).mkdir(parents=True)
+    workspace = Workspace(tmp_path, workers=1)
+    workspace.render()
+    store = ConfigStore(
+        workspace.output_file, workspace.instances, workspace.rendered_digest
+    )
+    app = FastAPI()
+    register_config_routes(app, store)
+    yield workspace, store, TestClient(app)
+    workspace.close()
+
+
+class TestConfigEndpoint:
+    """Tests for GET /configs/<instance>.yml."""
+
+    def test_etag_from_render_cache(self, served):
+        workspace, store, client = served
+        response = client.get(
+            "/configs/edge0.yml", headers={"Accept-Encoding": "identity"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["etag"] == f'"{workspace.hashes["edge0"]}"'
+        assert response.content == workspace.output_file("edge0").read_bytes()
+        assert client.get("/configs/missing.yml").status_code == 404
+        assert client.get("/configs/..%2Fcommon.yml").status_code == 404
+
+    def test_conditional_get(self, served):
+        workspace, store, client = served
+        first = client.get("/configs/edge1.yml")
+        assert first.headers["content-encoding"] == "gzip"
+        etag = first.headers["etag"]
+
+        for _ in range(100):
+            response = client.get("/configs/edge1.yml", headers={"If-None-Match": etag})
+            assert response.status_code == 304
+            assert response.content == b""
+        # Read and compressed once; unchanged polls only stat the file
+        assert store.loads == 1
+
+        # Re-rendering the same content keeps the ETag
+        workspace.render(force=True)
+        again = client.get("/configs/edge1.yml", headers={"If-None-Match": etag})
+        assert again.status_code == 304
+        assert store.loads == 2
+
+        (workspace.instance_dir("edge1") / "values_app.json").write_text(
+            json.dumps({"logLevel": "debug"})
+        )
+        workspace.render()
+        changed = client.get("/configs/edge1.yml", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+        assert store.loads == 3
+
+    def test_gzip(self, served):
+        workspace, _, client = served
+        body = workspace.output_file("edge0").read_bytes()
+        response = client.get("/configs/edge0.yml", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["etag"].endswith('-gzip"')
+        # The client decodes the body; the wire size is the compressed one
+        assert response.content == body
+        assert response.num_bytes_downloaded < len(body) / 4
+        refused = client.get(
+            "/configs/edge0.yml", headers={"Accept-Encoding": "gzip;q=0"}
+        )
+        assert "content-encoding" not in refused.headers
+
+    def test_range(self, served):
+        workspace, _, client = served
+        body = workspace.output_file("edge0").read_bytes()
+        etag = f'"{workspace.hashes["edge0"]}"'
+
+        response = client.get("/configs/edge0.yml", headers={"Range": "bytes=10-19"})
+        assert response.status_code == 206
+        assert response.content == body[10:20]
+        assert response.headers["content-range"] == f"bytes 10-19/{len(body)}"
+        assert "content-encoding" not in response.headers
+
+        tail = client.get(
+            "/configs/edge0.yml", headers={"Range": "bytes=-5", "If-Range": etag}
+        )
+        assert tail.content == body[-5:]
+        stale = client.get(
+            "/configs/edge0.yml",
+            headers={"Range": "bytes=0-9", "If-Range": '"old"'},
+        )
+        assert stale.status_code == 200
+        unsatisfiable = client.get(
+            "/configs/edge0.yml", headers={"Range": f"bytes={len(body)}-"}
+        )
+        assert unsatisfiable.status_code == 416
+
+    def test_index(self, served):
+        workspace, _, client = served
+        index = client.get("/configs").json()
+        assert set(index) == {"edge0", "edge1"}
+        assert index["edge0"]["etag"] == f'"{workspace.hashes["edge0"]}"'
+
+
+def test_parse_range():
+    assert parse_range("bytes=0-", 10) == (0, 9)
+    assert parse_range("bytes=5-100", 10) == (5, 9)
+    assert parse_range("bytes=-20", 10) == (0, 9)
+    assert parse_range("bytes=0-1,4-5", 10) is None
+    with pytest.raises(ValueError):
+        parse_range("bytes=10-", 10)
@@ -0,0 +1,232 @@
+"""Tests for the effective path config resolver."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.clients.config_clients import get_config_client
+from src.core.effective import (
+    EffectiveResolver,
+    MinimizeReport,
+    effective_config,
+    path_defaults,
+    redundant_keys,
+    same_value,
+    stored_size,
+)
+from src.core.events import ChangeEvent
+from src.core.overlay import SharedBase
+from src.models.check_models import check_effective_stream
+from src.mtx_manager import MtxConfigManager
+from src.utils.json_utils import DELETE, SET
+
+DEFAULTS = {"sourceOnDemand": False, "record": False, "rtspTransport": "tcp"}
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """Manager over sections with pathDefaults and three paths."""
+    json_dir = tmp_path / "json"
+    json_dir.mkdir()
+    (json_dir / "values_pathDefaults.json").write_text(json.dumps(DEFAULTS))
+    (json_dir / "paths.json").write_text(
+        json.dumps(
+            {
+                "cam1": {"source": "rtsp://a", "record": True},
+                "cam2": {"source": "rtsp://b"},
+                "ondemand": {"runOnDemand": "ffmpeg -i x rtsp://localhost/ondemand"},
+            }
+        )
+    )
+
+    get_config_client.cache_clear()
+    mock_settings = MagicMock()
+    mock_settings.MTX_JSON_DIR = json_dir
+    with patch("src.clients.json_client.get_settings_func", return_value=mock_settings):
+        manager = MtxConfigManager(json_dir=json_dir)
+        manager.load_data()
+        yield manager
+    get_config_client.cache_clear()
+
+
+class TestEffectiveConfig:
+    """Tests for the merge itself."""
+
+    def test_path_keys_override_defaults(self):
+        conf = {"record": True, "source": "rtsp://a"}
+        assert effective_config(DEFAULTS, conf) == {
+            "sourceOnDemand": False,
+            "record": True,
+            "rtspTransport": "tcp",
+            "source": "rtsp://a",
+        }
+        assert effective_config(DEFAULTS, None) == DEFAULTS
+
+    def test_disabled_defaults_are_not_inherited(self):
+        data = {"values_pathDefaults.json": DEFAULTS}
+        assert path_defaults(data) == DEFAULTS
+        data["values_pathDefaults.json_enabled"] = False
+        assert path_defaults(data) == {}
+
+
+class TestEffectiveResolver:
+    """Tests for memoization and invalidation."""
+
+    def test_memoized_per_path(self, manager):
+        effective = manager.effective
+        assert effective.resolve("cam1")["record"] is True
+        assert effective.resolve("cam2")["record"] is False
+        assert effective.resolve("missing") is None
+        effective.resolve("cam1")
+        assert effective.computed == 2
+        assert effective.inherited("cam2") == [
+            "sourceOnDemand",
+            "record",
+            "rtspTransport",
+        ]
+        with pytest.raises(TypeError):
+            effective.resolve("cam1")["record"] = False
+
+    def test_path_edit_drops_only_that_path(self, manager):
+        effective = manager.effective
+        effective.resolve("cam1")
+        effective.resolve("cam2")
+        manager.update_stream("cam2", {"source": "rtsp://c", "record": True})
+        assert effective.resolve("cam1")["record"] is True
+        assert effective.resolve("cam2")["record"] is True
+        assert effective.computed == 3
+
+        manager.remove_stream("cam2")
+        assert effective.resolve("cam2") is None
+
+    def test_default_edit_drops_inheriting_paths(self, manager):
+        """cam1 overrides record, so a change of that default keeps it."""
+        effective = manager.effective
+        effective.resolve("cam1")
+        effective.resolve("cam2")
+        manager.data["values_pathDefaults.json"]["record"] = True
+        manager.record_edit(SET, ("values_pathDefaults.json", "record"), True, False)
+        assert effective.computed == 2
+        assert effective.resolve("cam2")["record"] is True
+        assert effective.resolve("cam1")["record"] is True
+        assert effective.computed == 3
+
+    def test_defaults_replaced_or_disabled(self, manager):
+        effective = manager.effective
+        effective.resolve("cam1")
+        manager.set("values_pathDefaults.json", {"record": True, "maxReaders": 5})
+        assert effective.resolve("cam1")["maxReaders"] == 5
+        manager.set("values_pathDefaults.json_enabled", False)
+        assert "maxReaders" not in effective.resolve("cam1")
+
+    def test_undo_invalidates(self, manager):
+        effective = manager.effective
+        manager.update_stream("cam2", {"source": "rtsp://c", "record": True})
+        assert effective.resolve("cam2")["record"] is True
+        manager.undo()
+        assert effective.resolve("cam2")["record"] is False
+
+    def test_standalone_resolver(self):
+        data = {"paths.json": {"a": {}}, "values_pathDefaults.json": DEFAULTS}
+        effective = EffectiveResolver(lambda: data)
+        assert effective.resolve("a") == DEFAULTS
+        effective.invalidate([])
+        del data["paths.json"]["a"]
+        effective.invalidate([ChangeEvent(DELETE, ("paths.json", "a"))])
+        assert effective.resolve("a") is None
+
+
+class TestEffectiveValidation:
+    """Validators see inherited keys."""
+
+    def test_check_effective_stream(self):
+        assert (
+            check_effective_stream({"source": "rtsp://a", "sourceOnDemand": True}) == []
+        )
+        assert check_effective_stream({"runOnDemand": "ffmpeg"}) == []
+        assert (
+            len(check_effective_stream({"runOnDemand": "x", "source": "rtsp://a"})) == 1
+        )
+        assert check_effective_stream({"source": "redirect"}) == [
+            "'sourceRedirect' is required when source is 'redirect'"
+        ]
+
+    def test_inherited_source_on_demand_with_run_on_demand(self, manager):
+        """sourceOnDemand from pathDefaults conflicts with a runOnDemand path."""
+        assert "paths.json:ondemand" not in manager.validate_all()
+        manager.set("values_pathDefaults.json", {**DEFAULTS, "sourceOnDemand": True})
+
+        errors = manager.validate_all()
+        assert errors["paths.json:ondemand"] == [
+            "'sourceOnDemand' is useless when source is 'publisher'"
+        ]
+        assert "paths.json:cam1" not in errors
+        # A pinned version is checked the same way
+        assert manager.validate_all(manager.snapshot()) == errors
+
+
+class TestMinimize:
+    """Tests for removing keys redundant with pathDefaults."""
+
+    def test_redundant_keys(self):
+        paths = {
+            "a": {"record": False, "source": "rtsp://a", "sourceOnDemand": 0},
+            "b": {"record": True},
+            "c": None,
+        }
+        # 0 is not false: mediamtx would reject or read it differently
+        assert redundant_keys(paths, DEFAULTS) == {"a": ["record"]}
+        assert redundant_keys(paths, {}) == {}
+        assert same_value({"x": [1, True]}, {"x": [1, True]})
+        assert not same_value([1], [True])
+
+    def test_stored_size_matches_file(self, tmp_path):
+        paths = {"a": {"record": False, "list": [1, 2]}, "b": {}}
+        whole = len(json.dumps(paths, indent=2, ensure_ascii=False).encode())
+        without_a = len(json.dumps({"b": {}}, indent=2).encode())
+        assert whole - without_a == stored_size(paths["a"]) + len('  "a": ,\n')
+
+    def test_minimize_is_lossless(self, manager):
+        manager.update_stream(
+            "cam2",
+            {"source": "rtsp://b", "record": False, "rtspTransport": "tcp"},
+        )
+        paths = manager.data["paths.json"]
+        before = {name: dict(manager.effective.resolve(name)) for name in paths}
+        size = len(json.dumps(paths, indent=2, ensure_ascii=False).encode())
+
+        report = manager.minimize_paths()
+
+        assert report.paths == 1 and report.keys == 2
+        assert paths["cam2"] == {"source": "rtsp://b"}
+        assert paths["cam1"]["record"] is True
+        after = len(json.dumps(paths, indent=2, ensure_ascii=False).encode())
+        assert report.bytes_saved == size - after > 0
+        assert {n: dict(manager.effective.resolve(n)) for n in paths} == before
+        assert manager.minimize_paths() == MinimizeReport(0, 0, 0)
+
+        # One undo step restores the removed keys
+        manager.undo()
+        assert paths["cam2"]["rtspTransport"] == "tcp"
+
+    def test_minimize_in_session(self, manager):
+        """The report measures the session's copies of the edited paths."""
+        manager.data["paths.json"]["cam2"]["record"] = False
+        base = SharedBase(manager.data)
+        manager.attach_session(base)
+
+        report = manager.minimize_paths()
+
+        assert report.keys == 1
+        assert report.bytes_saved == len(',\n    "record": false'.encode())
+        assert manager.data["paths.json"]["cam2"] == {"source": "rtsp://b"}
+        assert manager.data["paths.json"] is not base.data["paths.json"]
+
+    def test_minimize_on_save(self, manager):
+        manager.update_stream("cam2", {"source": "rtsp://b", "record": False})
+        manager.minimize_on_save = True
+        manager.save_data()
+        assert manager.last_minimize.keys == 1
+        saved = json.loads((manager.json_dir / "paths.json").read_text())
+        assert saved["cam2"] == {"source": "rtsp://b"}
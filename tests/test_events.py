@@ -0,0 +1,77 @@
+"""Tests for fine-grained change events."""
+
+import asyncio
+
+from src.core.events import ChangeEvent, EventBus, from_pointer, to_pointer
+from src.mtx_manager import MtxConfigManager
+from src.utils.json_utils import DELETE, SET
+
+
+class TestEventBus:
+    """Tests for EventBus."""
+
+    def test_pointer_round_trip(self):
+        path = ("paths.json", "cam/1~x", 0)
+        assert to_pointer(path) == "paths.json/cam~11~0x/0"
+        assert from_pointer(to_pointer(path)) == ("paths.json", "cam/1~x", "0")
+        assert ChangeEvent(SET, ("paths.json", "cam042", "source")).pointer == (
+            "paths.json/cam042/source"
+        )
+
+    def test_prefix_subscription(self):
+        """Subscribers get changes below their prefix and of its parents."""
+        bus = EventBus()
+        row, other = [], []
+        bus.subscribe(row.extend, "paths.json/cam1")
+        bus.subscribe(other.extend, ("paths.json", "cam2"))
+
+        field = ChangeEvent(SET, ("paths.json", "cam1", "source"), "rtsp://x")
+        section = ChangeEvent(SET, ("paths.json",), {})
+        bus.publish([field, ChangeEvent(SET, ("auth.json", "x"), 1), section])
+
+        assert row == [field, section]
+        assert other == [section]
+
+    def test_coalesced_delivery_once_per_frame(self):
+        """Bursts are delivered once from the loop, latest event per path."""
+        bus = EventBus(frame=0.01)
+        calls = []
+        bus.subscribe(calls.append, coalesce=True)
+
+        async def scenario():
+            for value in "abc":
+                bus.publish([ChangeEvent(SET, ("paths.json", "cam1", "source"), value)])
+            bus.publish([ChangeEvent(DELETE, ("paths.json", "cam2", "record"))])
+            bus.publish([ChangeEvent(DELETE, ("paths.json", "cam2"))])
+            assert calls == []
+            await asyncio.sleep(0.05)
+
+        asyncio.run(scenario())
+        assert calls == [
+            [
+                ChangeEvent(SET, ("paths.json", "cam1", "source"), "c"),
+                ChangeEvent(DELETE, ("paths.json", "cam2")),
+            ]
+        ]
+
+
+def test_manager_events(tmp_path):
+    """Manager edits carry precise paths; a batch publishes them in one call."""
+    manager = MtxConfigManager(json_dir=tmp_path)
+    manager.journal = None
+    manager.data = {"paths.json": {"cam1": {"source": "rtsp://a"}}}
+    received = []
+    manager.subscribe(received.append, "paths.json")
+
+    manager.data["paths.json"]["cam1"]["source"] = "rtsp://b"
+    manager.record_edit(SET, ("paths.json", "cam1", "source"), "rtsp://b")
+    assert received.pop()[0].pointer == "paths.json/cam1/source"
+
+    with manager.batch():
+        manager.add_stream("cam2", "Source")
+        manager.remove_stream("cam1")
+        assert received == []
+    assert [(e.op, e.pointer) for e in received[0]] == [
+        (SET, "paths.json/cam2"),
+        (DELETE, "paths.json/cam1"),
+    ]
@@ -0,0 +1,52 @@
+"""Tests for crash-safe file writing helpers."""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from src.utils.fs_utils import atomic_write_many
+
+
+class TestAtomicWriteMany:
+    """Tests for atomic_write_many."""
+
+    def test_replaces_files_and_keeps_mode(self, tmp_path):
+        """Targets get the new content and keep their permissions."""
+        target = tmp_path / "mediamtx.yml"
+        target.write_text("old")
+        os.chmod(target, 0o640)
+
+        atomic_write_many({target: "new", tmp_path / "other.json": "{}"})
+
+        assert target.read_text() == "new"
+        assert (tmp_path / "other.json").read_text() == "{}"
+        assert oct(target.stat().st_mode & 0o777) == oct(0o640)
+        assert not list(tmp_path.glob(".*.tmp"))
+
+    def test_backup_is_hard_link_to_previous_version(self, tmp_path):
+        """The backup reuses the old inode instead of copying data."""
+        target = tmp_path / "mediamtx.yml"
+        backup = tmp_path / "mediamtx.yml.bak"
+        target.write_text("v1")
+        backup.write_text("v0")
+        old_inode = target.stat().st_ino
+
+        atomic_write_many({target: "v2"}, backups={target: backup})
+
+        assert backup.read_text() == "v1"
+        assert backup.stat().st_ino == old_inode
+        assert target.read_text() == "v2"
+        assert target.stat().st_ino != old_inode
+
+    def test_failure_leaves_target_intact(self, tmp_path):
+        """If replacing fails, the old file and no temp files remain."""
+        target = tmp_path / "paths.json"
+        target.write_text("old")
+
+        with patch("src.utils.fs_utils.os.replace", side_effect=OSError("boom")):
+            with pytest.raises(OSError):
+                atomic_write_many({target: "new"})
+
+        assert target.read_text() == "old"
+        assert not list(tmp_path.glob(".*.tmp"))
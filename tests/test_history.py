@@ -0,0 +1,147 @@
+"""Tests for the content-addressed configuration history."""
+
+import json
+import threading
+import time
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+from src.clients.config_clients import get_config_client
+from src.core.history import ConfigHistory
+from src.mtx_manager import MtxConfigManager
+from src.utils.diff_utils import MODIFIED, Change
+
+
+def _data(streams: int = 500) -> dict:
+    paths = {
+        f"cam{i:04d}": {"source": f"rtsp://10.0.{i // 256}.{i % 256}/live"}
+        for i in range(streams)
+    }
+    return {
+        "paths.json": paths,
+        "paths.json_enabled": True,
+        "values_app.json": {"logLevel": "info"},
+        "values_app.json_enabled": False,
+    }
+
+
+class TestConfigHistory:
+    """Tests for ConfigHistory."""
+
+    def test_commit_checkout_roundtrip(self, tmp_path):
+        """A revision restores sections, enabled flags and the YAML text."""
+        history = ConfigHistory(tmp_path)
+        data = _data()
+        rev = history.commit(data, yaml_text="logLevel: info\npaths: {}\n")
+
+        assert ConfigHistory(tmp_path).checkout(rev) == data
+        assert history.yaml_text(rev) == "logLevel: info\npaths: {}\n"
+
+    def test_identical_commit_reuses_revision(self, tmp_path):
+        """Saving unchanged data does not add a revision."""
+        history = ConfigHistory(tmp_path)
+        assert history.commit(_data()) == history.commit(_data()) == 1
+        assert len(history.revisions()) == 1
+
+    def test_small_change_stores_few_objects(self, tmp_path):
+        """Editing one path adds a small fraction of the first revision."""
+        history = ConfigHistory(tmp_path)
+        data = _data(2000)
+        history.commit(data)
+        first_size = history.objects.size
+
+        data["paths.json"]["cam0042"]["source"] = "rtsp://changed/live"
+        history.commit(data)
+
+        assert history.objects.size - first_size < first_size / 10
+        assert history.changed_sections(1, 2) == ["paths.json"]
+
+    def test_diff_paths(self, tmp_path):
+        """diff_paths reports added, removed and modified path names."""
+        history = ConfigHistory(tmp_path)
+        data = _data()
+        history.commit(data)
+        data["paths.json"]["cam0001"]["source"] = "rtsp://changed"
+        del data["paths.json"]["cam0002"]
+        data["paths.json"]["new"] = {"source": "publisher"}
+        history.commit(data)
+
+        assert history.diff_paths(1, 2) == {
+            "added": ["new"],
+            "removed": ["cam0002"],
+            "modified": ["cam0001"],
+        }
+
+    def test_concurrent_commits(self, tmp_path):
+        """Commits from several threads get distinct, ordered revisions."""
+        history = ConfigHistory(tmp_path)
+        revs = []
+
+        def commit(i):
+            data = _data(10)
+            data["values_app.json"] = {"logLevel": f"level{i}"}
+            revs.append(history.commit(data))
+
+        class SlowClock(datetime):
+            """Widens the window between reading and appending revisions."""
+
+            @classmethod
+            def now(cls, tz=None):
+                time.sleep(0.01)
+                return datetime.now(tz)
+
+        with patch("src.core.history.datetime", SlowClock):
+            threads = [threading.Thread(target=commit, args=(i,)) for i in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert sorted(revs) == list(range(1, 9))
+        stored = [r["rev"] for r in ConfigHistory(tmp_path).revisions()]
+        assert stored == list(range(1, 9))
+
+
+def test_restore_revision_through_manager(tmp_path):
+    """Saves create revisions; restoring one brings the old sections back."""
+    json_dir = tmp_path / "json"
+    json_dir.mkdir()
+    (json_dir / "paths.json").write_text(json.dumps({"cam1": {"source": "rtsp://a"}}))
+
+    get_config_client.cache_clear()
+    mock_settings = MagicMock()
+    mock_settings.MTX_JSON_DIR = json_dir
+    with patch("src.clients.json_client.get_settings_func", return_value=mock_settings):
+        manager = MtxConfigManager(json_dir=json_dir)
+        manager.load_data()
+        mock_yaml = MagicMock()
+        mock_yaml.yaml_file = tmp_path / "mediamtx.yml"
+        with patch("src.mtx_manager.get_config_client", return_value=mock_yaml):
+            manager.save_data()
+            manager.data["paths.json"]["cam1"]["source"] = "rtsp://b"
+            manager.save_data()
+
+        assert [r["rev"] for r in manager.history.revisions()] == [1, 2]
+        assert manager.restore_revision(1) == ["paths.json"]
+        assert manager.data["paths.json"]["cam1"]["source"] == "rtsp://a"
+    get_config_client.cache_clear()
+
+
+def test_history_diff_fields(tmp_path):
+    """diff() reports field-level changes and enabled flag toggles."""
+    history = ConfigHistory(tmp_path)
+    data = _data()
+    history.commit(data)
+    data["paths.json"]["cam0001"]["source"] = "rtsp://changed"
+    data["values_app.json_enabled"] = True
+    history.commit(data)
+
+    assert history.diff(1, 2) == [
+        Change(
+            MODIFIED,
+            ("paths.json", "cam0001", "source"),
+            "rtsp://10.0.0.1/live",
+            "rtsp://changed",
+        ),
+        Change(MODIFIED, ("values_app.json_enabled",), False, True),
+    ]
@@ -0,0 +1,217 @@
+"""Tests for the write-ahead edit journal."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.clients.config_clients import get_config_client
+from src.core.journal import EditJournal
+from src.core.overlay import SharedBase
+from src.core.save_scheduler import get_save_lock
+from src.mtx_manager import MtxConfigManager
+from src.utils.json_utils import DELETE, SET, apply_edit
+
+
+@pytest.fixture
+def json_dir(tmp_path):
+    """Temporary section directory wired into JSONClient."""
+    json_dir = tmp_path / "json"
+    json_dir.mkdir()
+    (json_dir / "paths.json").write_text(json.dumps({"cam1": {"source": "rtsp://a"}}))
+    (json_dir / "auth.json").write_text(
+        json.dumps({"authInternalUsers": [{"user": "a"}, {"user": "b"}]})
+    )
+
+    get_config_client.cache_clear()
+    mock_settings = MagicMock()
+    mock_settings.MTX_JSON_DIR = json_dir
+    with patch("src.clients.json_client.get_settings_func", return_value=mock_settings):
+        yield json_dir
+    get_config_client.cache_clear()
+
+
+def _load(json_dir):
+    manager = MtxConfigManager(json_dir=json_dir)
+    manager.load_data()
+    return manager
+
+
+class TestApplyEdit:
+    """Tests for apply_edit."""
+
+    def test_set_and_delete_nested(self):
+        """SET creates missing dicts, DELETE returns the old value."""
+        data = {}
+        apply_edit(data, SET, ("paths.json", "cam1", "source"), "rtsp://x")
+        assert data == {"paths.json": {"cam1": {"source": "rtsp://x"}}}
+        assert apply_edit(data, DELETE, ("paths.json", "cam1")) == {
+            "source": "rtsp://x"
+        }
+
+    def test_list_append_and_delete(self):
+        """Setting index == len appends; DELETE removes by index."""
+        data = {"users": ["a"]}
+        apply_edit(data, SET, ("users", 1), "b")
+        apply_edit(data, DELETE, ("users", 0))
+        assert data == {"users": ["b"]}
+
+
+class TestEditJournal:
+    """Tests for EditJournal."""
+
+    def test_torn_line_is_skipped(self, tmp_path):
+        """A partially written last line does not break replay."""
+        journal = EditJournal(tmp_path / "json")
+        journal.append(SET, ("values_app.json", "logLevel"), "debug")
+        with open(journal.journal_file, "a") as f:
+            f.write('["set", ["values_app.json", "log')
+
+        data = {"values_app.json": {"logLevel": "info"}}
+        assert journal.replay(data) == 1
+        assert data["values_app.json"]["logLevel"] == "debug"
+
+    def test_truncate_keeps_later_entries(self, tmp_path):
+        """Entries appended after the truncation mark survive."""
+        journal = EditJournal(tmp_path / "json")
+        for level in ("a", "b", "c"):
+            journal.append(SET, ("values_app.json", "logLevel"), level)
+        journal.truncate(2)
+        assert journal.entries == 1
+        assert journal.read() == [("set", ["values_app.json", "logLevel"], "c")]
+
+    def test_truncate_counts_skipped_lines(self, tmp_path):
+        """Corrupt and inapplicable lines count towards the truncation mark."""
+        journal = EditJournal(tmp_path / "json")
+        journal.append(DELETE, ("values_app.json", "missing"))
+        with open(journal.journal_file, "a") as f:
+            f.write("not json\n")
+        journal.append(SET, ("values_app.json", "logLevel"), "debug")
+
+        assert journal.replay({"values_app.json": {}}) == 1
+        assert journal.entries == 3
+        journal.append(SET, ("values_app.json", "logLevel"), "warn")
+        journal.truncate(3)
+        assert journal.read() == [("set", ["values_app.json", "logLevel"], "warn")]
+
+
+class TestManagerJournal:
+    """Crash recovery and compaction through MtxConfigManager."""
+
+    def test_unsaved_edits_survive_restart(self, json_dir):
+        """Mutations are replayed by the next manager instance."""
+        manager = _load(json_dir)
+        manager.add_stream("cam2", "Source")
+        manager.remove_stream("cam1")
+        manager.data["auth.json"]["authInternalUsers"][0]["user"] = "root"
+        manager.record_edit(SET, ("auth.json", "authInternalUsers", 0, "user"), "root")
+        manager.journal.close()
+
+        recovered = _load(json_dir)
+        assert set(recovered.data["paths.json"]) == {"cam2"}
+        assert recovered.data["auth.json"]["authInternalUsers"][0]["user"] == "root"
+        assert recovered.is_section_dirty("paths.json")
+
+    def test_failed_save_keeps_journal(self, json_dir):
+        """Edits stay journaled and dirty when the section write fails."""
+        manager = _load(json_dir)
+        manager.add_stream("cam2", "Source")
+        manager.journal_compact_every = 1
+        with patch(
+            "src.clients.json_client.atomic_write_many", side_effect=OSError("full")
+        ):
+            with pytest.raises(OSError):
+                manager.save_data()
+            # A failed compaction keeps the journal too
+            manager.add_stream("cam3", "Source")
+        assert len(manager.journal.read()) == 2
+        assert manager.is_section_dirty("paths.json")
+        manager.journal.close()
+
+        recovered = _load(json_dir)
+        assert {"cam2", "cam3"} <= set(recovered.data["paths.json"])
+
+    def test_sessions_keep_each_others_edits(self, json_dir):
+        """A save of one session does not drop another's uncommitted edits."""
+        base = SharedBase(_load(json_dir).data)
+        a, b = MtxConfigManager(json_dir=json_dir), MtxConfigManager(json_dir=json_dir)
+        a.attach_session(base)
+        b.attach_session(base)
+        assert a.journal is not b.journal
+
+        b.add_stream("camB", "Source")
+        a.add_stream("camA", "Source")
+        a.save_data()
+        assert a.journal.read() == []
+        assert len(b.journal.read()) == 1
+        a.close_session()
+        b.close_session()
+        assert not a.journal.journal_file.exists()
+        assert b.journal.journal_file.exists()
+
+        recovered = _load(json_dir)
+        assert {"camA", "camB"} <= set(recovered.data["paths.json"])
+        assert not b.journal.journal_file.exists()
+
+    def test_sessions_do_not_compact(self, json_dir):
+        """Unsaved edits of a session reach neither the base nor the files."""
+        base = SharedBase(_load(json_dir).data)
+        a, b = MtxConfigManager(json_dir=json_dir), MtxConfigManager(json_dir=json_dir)
+        a.attach_session(base)
+        b.attach_session(base)
+        a.journal_compact_every = 1
+        a.add_stream("cam2", "Source")
+        a.add_stream("cam3", "Source")
+
+        assert len(a.journal.read()) == 2
+        assert "cam2" not in base.data["paths.json"]
+        assert "cam2" not in json.loads((json_dir / "paths.json").read_text())
+        assert b.pull_session() == []
+
+    def test_compaction_waits_for_running_save(self, json_dir):
+        """Compaction is skipped while a save holds the lock of json_dir."""
+        manager = _load(json_dir)
+        manager.journal_compact_every = 1
+        lock = get_save_lock(json_dir)
+        with lock:
+            manager.add_stream("cam2", "Source")
+        assert len(manager.journal.read()) == 1
+        manager.add_stream("cam3", "Source")
+        assert manager.journal.read() == []
+        assert {"cam2", "cam3"} <= set(
+            json.loads((json_dir / "paths.json").read_text())
+        )
+
+    def test_compaction_writes_sections(self, json_dir):
+        """Compaction persists journaled sections and keeps enabled flags."""
+        manager = _load(json_dir)
+        manager.journal_compact_every = 2
+        manager.data["paths.json_enabled"] = False
+        manager.record_edit(SET, ("paths.json_enabled",), False)
+        manager.data["paths.json"]["cam1"]["source"] = "rtsp://b"
+        manager.record_edit(SET, ("paths.json", "cam1", "source"), "rtsp://b")
+
+        on_disk = json.loads((json_dir / "paths.json").read_text())
+        assert on_disk["cam1"]["source"] == "rtsp://b"
+        assert manager.journal.read() == [("set", ["paths.json_enabled"], False)]
+
+        manager.journal.close()
+        assert _load(json_dir).data["paths.json_enabled"] is False
+
+    def test_batch_is_journaled_on_commit(self, json_dir):
+        """A batch is journaled in one write; a rolled back one not at all."""
+        manager = _load(json_dir)
+        with patch("src.core.journal.os.fsync") as fsync:
+            with manager.batch():
+                for i in range(10):
+                    manager.put_stream(f"new{i}", {"source": f"rtsp://n/{i}"})
+                assert manager.journal.read() == []
+        assert fsync.call_count == 1
+        assert len(manager.journal.read()) == 10
+
+        with pytest.raises(ValueError):
+            with manager.batch():
+                manager.put_stream("bad", {"source": "nope"})
+        assert len(manager.journal.read()) == 10
+        manager.journal.close()
+        assert "new9" in _load(json_dir).data["paths.json"]
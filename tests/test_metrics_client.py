@@ -0,0 +1,120 @@
+"""Tests for the Prometheus metrics parser and collector."""
+
+import asyncio
+
+from src.clients.metrics_client import (
+    MetricsCollector,
+    Sample,
+    collect_paths,
+    parse_metrics,
+    parse_sample,
+)
+from tests.mtx_stub import MtxStub
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def canned_metrics(count: int, tick: int) -> str:
+    """mediamtx /metrics body for count paths after tick intervals."""
+    lines = [
+        "# HELP paths_bytes_received Bytes received",
+        "# TYPE paths_bytes_received counter",
+    ]
+    for i in range(count):
+        labels = f'{{name="cam{i:05d}",state="ready"}}'
+        lines.append(f"paths{labels} 1")
+        lines.append(f"paths_bytes_received{labels} {tick * 1000 * (i % 10)}")
+        lines.append(f"paths_bytes_sent{labels} {tick * 500}")
+        lines.append(f"paths_readers{labels} {i % 3}")
+    lines.append("rtsp_sessions 12")
+    return "\n".join(lines) + "\n"
+
+
+class TestParser:
+    """Tests for parse_sample() and collect_paths()."""
+
+    def test_parse_sample(self):
+        assert parse_sample('paths{name="a\\"b",state="ready"} 12 1700000000') == (
+            Sample("paths", {"name": 'a"b', "state": "ready"}, 12.0)
+        )
+        assert parse_sample("rtsp_sessions 3") == Sample("rtsp_sessions", {}, 3.0)
+        assert parse_sample('x{name="a b"} NaN').labels == {"name": "a b"}
+        for line in ("", "# TYPE paths gauge", "broken{name=", "x{} notanumber"):
+            assert parse_sample(line) is None
+
+    def test_collect_paths(self):
+        paths = collect_paths(parse_metrics(canned_metrics(3, tick=2).splitlines()))
+        assert paths["cam00002"] == {
+            "bytes_received": 4000.0,
+            "bytes_sent": 1000.0,
+            "readers": 2.0,
+        }
+
+
+class TestMetricsCollector:
+    """Tests for MetricsCollector against a stub serving 10k paths."""
+
+    def test_ring_buffer_and_throughput(self):
+        """Each path keeps the last history points; rates come from counters."""
+        clock = FakeClock()
+
+        async def run(stub: MtxStub):
+            collector = MetricsCollector(
+                f"{stub.url}/metrics", history=3, interval=5.0, clock=clock
+            )
+            try:
+                for tick in range(5):
+                    stub.metrics = canned_metrics(10_000, tick)
+                    clock.now = tick * 5.0
+                    await collector.refresh()
+                # Within the interval no new scrape happens
+                await collector.refresh()
+                stub.metrics = canned_metrics(10, 5)
+                clock.now = 25.0
+                await collector.refresh()
+                return collector, len(collector.series)
+            finally:
+                await collector.aclose()
+
+        with MtxStub() as stub:
+            stub.metrics = canned_metrics(10_000, 0)
+            collector, remaining = asyncio.run(run(stub))
+            scrapes = sum(1 for _, path in stub.requests if path == "/metrics")
+
+        assert scrapes == 6
+        assert collector.version == 6
+        # Paths missing from the last scrape are dropped
+        assert remaining == 10
+        assert len(collector.series["cam00007"]) == 3
+        # 7000 bytes more every 5 seconds
+        assert collector.throughput("cam00007") == [1400.0, 1400.0]
+        assert collector.readers("cam00007") == 1
+        assert collector.throughput("unknown") == []
+
+    def test_failed_scrape_keeps_buffers(self):
+        clock = FakeClock()
+
+        async def run(stub: MtxStub):
+            collector = MetricsCollector(f"{stub.url}/metrics", clock=clock)
+            try:
+                await collector.refresh()
+                stub.fail_next = 1
+                clock.now = 10.0
+                await collector.refresh()
+                return collector
+            finally:
+                await collector.aclose()
+
+        with MtxStub() as stub:
+            stub.metrics = canned_metrics(5, 1)
+            collector = asyncio.run(run(stub))
+
+        assert collector.version == 1
+        assert len(collector.series) == 5
+        assert "503" in collector.error
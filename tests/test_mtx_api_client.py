@@ -0,0 +1,167 @@
+"""Tests for the mediamtx Control API client against a local stub server."""
+
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from src.clients.mtx_api_client import MtxApiClient
+from src.mtx_manager import MtxConfigManager
+from tests.mtx_stub import MtxStub
+
+
+def _deploy(stub: MtxStub, config: dict, **kwargs):
+    async def run():
+        async with MtxApiClient(stub.url, **kwargs) as client:
+            return await client.deploy(config)
+
+    return asyncio.run(run())
+
+
+class TestDeploy:
+    """Tests for MtxApiClient.deploy()."""
+
+    def test_applies_only_changed_paths(self):
+        """Unchanged paths are not touched; the rest is added/patched/deleted."""
+        with MtxStub() as stub:
+            stub.paths_config = {
+                "same": {"name": "same", "source": "rtsp://a", "record": False},
+                "edited": {"name": "edited", "source": "rtsp://b", "record": False},
+                "gone": {"name": "gone", "source": "rtsp://c", "record": False},
+            }
+            config = {
+                "logLevel": "debug",
+                "paths": {
+                    "same": {"source": "rtsp://a"},
+                    "edited": {"source": "rtsp://b", "record": True},
+                    "new/cam": {"source": "rtsp://d"},
+                },
+            }
+            result = _deploy(stub, config)
+
+            assert result.ok
+            assert result.added == ["new/cam"]
+            assert result.patched == ["edited"]
+            assert result.deleted == ["gone"]
+            assert result.sections == ["global"]
+            assert ("PATCH", "/v3/config/paths/patch/edited") in stub.requests
+            assert not any(path.endswith("/same") for _, path in stub.requests)
+            assert stub.paths_config["edited"]["record"] is True
+            assert stub.global_config["logLevel"] == "debug"
+
+    def test_pooled_connections_retries_and_errors(self):
+        """Requests share keep-alive connections; 5xx is retried, 4xx reported."""
+        with MtxStub() as stub:
+            stub.paths_config = {
+                f"cam{i}": {"name": f"cam{i}", "source": "rtsp://old"}
+                for i in range(50)
+            }
+            config = {"paths": {f"cam{i}": {"source": "rtsp://new"} for i in range(50)}}
+            stub.fail_next = 2
+            result = _deploy(stub, config, concurrency=4)
+
+            assert result.ok
+            assert len(result.patched) == 50
+            # 1 list + 2 failed + 50 patches over at most 4 connections
+            assert len(stub.requests) == 53
+            assert stub.connections <= 4
+
+    def test_client_errors_are_reported_not_retried(self):
+        """A 4xx answer is reported in the result and not retried."""
+        with MtxStub() as stub:
+            stub.paths_config = {"cam1": {"name": "cam1", "source": "rtsp://a"}}
+            original = stub._handle
+            patches = []
+
+            def reject_patch(method, url, body):
+                if "/patch/" in url:
+                    patches.append(url)
+                    return 400, {"error": "invalid source"}
+                return original(method, url, body)
+
+            stub._handle = reject_patch
+            result = _deploy(stub, {"paths": {"cam1": {"source": "x"}}}, retries=3)
+
+            assert result.errors == ["cam1: HTTP 400: invalid source"]
+            assert result.patched == []
+            assert len(patches) == 1
+
+    def test_retried_add_and_delete_that_took_effect(self):
+        """An add or delete applied before its answer was lost is not an error."""
+        with MtxStub() as stub:
+            stub.paths_config = {"gone": {"name": "gone", "source": "rtsp://a"}}
+            original = stub._handle
+            answered = set()
+
+            def lose_first_answer(method, url, body):
+                status, payload = original(method, url, body)
+                if method != "GET" and url not in answered:
+                    answered.add(url)
+                    return 503, {"error": "unavailable"}
+                return status, payload
+
+            stub._handle = lose_first_answer
+            result = _deploy(stub, {"paths": {"new": {"source": "rtsp://b"}}})
+
+            assert result.ok
+            assert result.added == ["new"] and result.deleted == ["gone"]
+            assert list(stub.paths_config) == ["new"]
+
+    def test_rejected_retry_is_an_error(self):
+        """A 400 on a retried add counts as success only if the path exists."""
+        with MtxStub() as stub:
+            original = stub._handle
+            adds = []
+
+            def fail_then_reject(method, url, body):
+                if "/add/" not in url:
+                    return original(method, url, body)
+                adds.append(url)
+                if len(adds) == 1:
+                    return 503, {"error": "unavailable"}
+                return 400, {"error": "invalid source"}
+
+            stub._handle = fail_then_reject
+            result = _deploy(stub, {"paths": {"new": {"source": "x"}}})
+
+            assert result.added == []
+            assert result.errors == ["new: HTTP 400: invalid source"]
+            assert ("GET", "/v3/config/paths/get/new") in stub.requests
+
+    def test_plain_post_is_not_retried(self):
+        """A POST without a known answer to its repetition is sent once."""
+        with MtxStub() as stub:
+            stub.fail_next = 1
+
+            async def run():
+                async with MtxApiClient(stub.url) as client:
+                    await client.request("POST", "/v3/config/paths/add/x", json={})
+
+            with pytest.raises(httpx.HTTPStatusError):
+                asyncio.run(run())
+            assert len(stub.requests) == 1
+
+
+def test_manager_deploys_last_saved_version(tmp_path):
+    """MtxConfigManager.deploy() pushes the sections of the saved version."""
+    manager = MtxConfigManager(json_dir=tmp_path)
+    manager.data = {
+        "paths.json": {"cam1": {"source": "rtsp://a"}},
+        "paths.json_enabled": True,
+        "values_app.json": {"logLevel": "warn"},
+        "values_app.json_enabled": True,
+    }
+    manager.last_saved = manager.snapshot()
+    manager.data["paths.json"]["cam2"] = {"source": "rtsp://unsaved"}
+
+    with MtxStub() as stub:
+
+        async def run():
+            async with MtxApiClient(stub.url) as client:
+                with patch("src.mtx_manager.get_mtx_api_client", return_value=client):
+                    return await manager.deploy()
+
+        result = asyncio.run(run())
+        assert result.added == ["cam1"]
+        assert stub.global_config["logLevel"] == "warn"
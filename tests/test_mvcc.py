@@ -0,0 +1,91 @@
+"""Tests for MVCC snapshots of the configuration data."""
+
+from unittest.mock import MagicMock, patch
+
+from src.core.mvcc import SnapshotPublisher
+from src.mtx_manager import MtxConfigManager
+from src.utils.json_utils import SET
+
+
+def _live() -> dict:
+    return {
+        "paths.json": {
+            "cam1": {"source": "rtsp://a", "runOnInit": ["a", "b"]},
+            "cam2": {"source": "rtsp://b"},
+        },
+        "values_app.json": {"logLevel": "info"},
+    }
+
+
+class TestSnapshotPublisher:
+    """Tests for SnapshotPublisher."""
+
+    def test_publish_without_changes_reuses_version(self):
+        publisher = SnapshotPublisher()
+        live = _live()
+        first = publisher.publish(live)
+        assert publisher.publish(live) is first
+        assert first.version == 1
+        assert first.data == live and first.data is not live
+
+    def test_pinned_snapshot_is_unaffected_by_edits(self):
+        """Readers keep their version; unchanged parts are shared by identity."""
+        publisher = SnapshotPublisher()
+        live = _live()
+        old = publisher.publish(live)
+
+        live["paths.json"]["cam1"]["source"] = "rtsp://x"
+        publisher.mark_dirty(("paths.json", "cam1", "source"))
+        new = publisher.publish(live)
+
+        assert new.version == 2
+        assert old.data["paths.json"]["cam1"]["source"] == "rtsp://a"
+        assert new.data["paths.json"]["cam1"]["source"] == "rtsp://x"
+        assert new.data["paths.json"]["cam2"] is old.data["paths.json"]["cam2"]
+        assert new.data["values_app.json"] is old.data["values_app.json"]
+        # The snapshot never aliases live containers
+        assert new.data["paths.json"]["cam1"] is not live["paths.json"]["cam1"]
+
+    def test_list_items_and_deletions(self):
+        """Edits inside lists copy the whole list; deleted keys disappear."""
+        publisher = SnapshotPublisher()
+        live = _live()
+        old = publisher.publish(live)
+
+        live["paths.json"]["cam1"]["runOnInit"].insert(0, "z")
+        publisher.mark_dirty(("paths.json", "cam1", "runOnInit", 0))
+        del live["paths.json"]["cam2"]
+        publisher.mark_dirty(("paths.json", "cam2"))
+        new = publisher.publish(live)
+
+        assert new.data == live
+        assert old.data["paths.json"]["cam1"]["runOnInit"] == ["a", "b"]
+        assert "cam2" in old.data["paths.json"]
+
+
+def test_manager_save_and_validate_report_version(tmp_path):
+    """Saving a pinned snapshot writes that version even if editing continues."""
+    manager = MtxConfigManager(json_dir=tmp_path)
+    manager.journal = None
+    manager.history = None
+    manager.data = _live()
+    manager._snapshots.reset()
+
+    snapshot = manager.prepare_save()
+    manager.data["paths.json"]["cam1"]["source"] = "rtsp://x"
+    manager.record_edit(SET, ("paths.json", "cam1", "source"), "rtsp://x")
+
+    mock_yaml = MagicMock()
+    with patch("src.mtx_manager.get_config_client", return_value=mock_yaml):
+        assert manager.save_data(snapshot) == snapshot.version
+    saved = mock_yaml.save_config.call_args[0][0]
+    assert saved["paths.json"]["cam1"]["source"] == "rtsp://a"
+    # The edit made during the save is still unsaved
+    assert manager.has_unsaved_changes()
+
+    latest = manager.snapshot()
+    assert latest.version == snapshot.version + 1
+    assert manager.validate_all(snapshot) == manager.validate_all(latest) == {}
+    manager.update_preview()
+    assert manager.preview_content["version"] == latest.version
+    assert "rtsp://x" in manager.preview_content["yaml"]
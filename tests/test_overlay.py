@@ -0,0 +1,117 @@
+"""Tests for copy-on-write session overlays."""
+
+from unittest.mock import MagicMock, patch
+
+from src.core.overlay import SessionOverlay, SharedBase
+from src.mtx_manager import MtxConfigManager
+from src.utils.json_utils import SET
+
+
+def _base() -> SharedBase:
+    return SharedBase(
+        {
+            "paths.json": {
+                "cam1": {"source": "rtsp://a", "sourceOnDemand": False},
+                "cam2": {"source": "rtsp://b"},
+            },
+            "values_app.json": {"logLevel": "info"},
+        }
+    )
+
+
+def _set(session: SessionOverlay, path: tuple, value) -> None:
+    """Edit a field the way a bound UI input does."""
+    session.own(path[:-1])[path[-1]] = value
+    session.record(path)
+
+
+class TestSessionOverlay:
+    """Tests for SessionOverlay and SharedBase."""
+
+    def test_writes_do_not_touch_base_or_other_sessions(self):
+        """Only containers on the edited path are copied."""
+        base = _base()
+        a, b = SessionOverlay(base), SessionOverlay(base)
+        _set(a, ("paths.json", "cam1", "source"), "rtsp://x")
+
+        assert base.data["paths.json"]["cam1"]["source"] == "rtsp://a"
+        assert b.data["paths.json"]["cam1"]["source"] == "rtsp://a"
+        assert a.data["paths.json"]["cam2"] is base.data["paths.json"]["cam2"]
+        assert a.data["values_app.json"] is base.data["values_app.json"]
+        assert a.changed == {("paths.json", "cam1", "source")}
+
+    def test_fields_of_one_stream_merge(self):
+        """Different fields of the same stream are merged without conflict."""
+        base = _base()
+        old_data = base.data
+        a, b = SessionOverlay(base), SessionOverlay(base)
+        _set(a, ("paths.json", "cam1", "source"), "rtsp://x")
+        _set(b, ("paths.json", "cam1", "sourceOnDemand"), True)
+
+        assert a.commit().conflicts == []
+        assert b.commit().conflicts == []
+        assert base.data["paths.json"]["cam1"] == {
+            "source": "rtsp://x",
+            "sourceOnDemand": True,
+        }
+        # Earlier versions are untouched snapshots
+        assert old_data["paths.json"]["cam1"]["source"] == "rtsp://a"
+        # b pulled a's change while committing
+        assert b.data["paths.json"]["cam1"]["source"] == "rtsp://x"
+
+    def test_same_field_conflicts(self):
+        """Concurrent edits of one field, or of a deleted stream, conflict."""
+        base = _base()
+        a, b = SessionOverlay(base), SessionOverlay(base)
+        _set(a, ("paths.json", "cam1", "source"), "rtsp://x")
+        _set(b, ("paths.json", "cam1", "source"), "rtsp://y")
+        del b.own(("paths.json",))["cam2"]
+        b.record(("paths.json", "cam2"))
+        _set(a, ("paths.json", "cam2", "source"), "rtsp://z")
+
+        a.commit()
+        result = b.commit()
+        assert sorted(result.conflicts) == [
+            ("paths.json", "cam1", "source"),
+            ("paths.json", "cam2"),
+        ]
+        assert b.commit(force=True).conflicts == []
+        assert base.data["paths.json"]["cam1"]["source"] == "rtsp://y"
+        assert "cam2" not in base.data["paths.json"]
+
+    def test_pull(self):
+        """Other sessions' commits are applied to the session view."""
+        base = _base()
+        a, b = SessionOverlay(base), SessionOverlay(base)
+        _set(a, ("values_app.json", "logLevel"), "debug")
+        a.commit()
+
+        assert b.pull() == [("values_app.json", "logLevel")]
+        assert b.data["values_app.json"]["logLevel"] == "debug"
+        assert b.changed == set()
+
+
+def test_sessions_through_manager(tmp_path):
+    """Managers attached to one base save each other's committed edits."""
+    base = _base()
+    managers = []
+    for _ in range(2):
+        manager = MtxConfigManager(json_dir=tmp_path / "json")
+        manager.attach_session(base)
+        managers.append(manager)
+    a, b = managers
+
+    a.own(("paths.json", "cam1"))["source"] = "rtsp://x"
+    a.record_edit(SET, ("paths.json", "cam1", "source"), "rtsp://x", "rtsp://a")
+    b.remove_stream("cam2")
+
+    mock_yaml = MagicMock()
+    with patch("src.mtx_manager.get_config_client", return_value=mock_yaml):
+        a.save_data()
+        b.save_data()
+
+    saved = mock_yaml.save_config.call_args.args[0]
+    assert saved["paths.json"] == {
+        "cam1": {"source": "rtsp://x", "sourceOnDemand": False}
+    }
+    assert b.data["paths.json"]["cam1"]["source"] == "rtsp://x"
@@ -0,0 +1,238 @@
+"""Tests for the REST API and its stream index."""
+
+import json
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.clients.config_clients import get_config_client
+from src.core.rest_api import ConfigApi, register_api_routes
+from src.core.save_scheduler import SaveScheduler
+from src.core.stream_index import StreamIndex
+from src.mtx_manager import MtxConfigManager
+
+
+def make_paths(count: int) -> dict:
+    paths = {}
+    for i in range(count):
+        if i % 4 == 0:
+            paths[f"cam{i:04d}"] = {
+                "runOnDemand": f"ffmpeg -i rtsp://10.0.0.{i % 10}/live -f rtsp "
+                "rtsp://localhost:8554/$MTX_PATH"
+            }
+        else:
+            paths[f"cam{i:04d}"] = {"source": f"rtsp://10.0.0.{i % 10}/ch{i}"}
+    return paths
+
+
+@pytest.fixture
+def api(tmp_path):
+    json_dir = tmp_path / "json"
+    json_dir.mkdir()
+    (json_dir / "paths.json").write_text(json.dumps(make_paths(250)))
+    (json_dir / "values_app.json").write_text(json.dumps({"logLevel": "info"}))
+    get_config_client.cache_clear()
+    manager = MtxConfigManager(json_dir=json_dir, render_yaml=False)
+    manager.load_data()
+    scheduler = SaveScheduler(manager.save_data, prepare=manager.prepare_save)
+    api = ConfigApi(manager, scheduler=scheduler)
+    app = FastAPI()
+    register_api_routes(app, api)
+    with TestClient(app) as client:
+        yield api, client
+    get_config_client.cache_clear()
+
+
+def _pages(client, **params) -> list[str]:
+    names, cursor = [], None
+    while True:
+        query = dict(params, limit=30, **({"cursor": cursor} if cursor else {}))
+        page = client.get("/api/streams", params=query).json()
+        names.extend(item["name"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return names
+
+
+class TestStreamIndex:
+    """Tests for StreamIndex."""
+
+    def test_query_filters_and_cursor(self):
+        index = StreamIndex(make_paths(100))
+        page = index.query(type="runOnDemand", limit=5)
+        assert page.names == ["cam0000", "cam0004", "cam0008", "cam0012", "cam0016"]
+        assert page.next_after == "cam0016"
+        assert index.query(host="10.0.0.3", after="cam0050", limit=2).names == [
+            "cam0053",
+            "cam0063",
+        ]
+        assert index.query(prefix="cam009", type="source").names == [
+            "cam0090",
+            "cam0091",
+            "cam0093",
+            "cam0094",
+            "cam0095",
+            "cam0097",
+            "cam0098",
+            "cam0099",
+        ]
+
+    def test_incremental_updates_match_rebuild(self):
+        paths = make_paths(100)
+        index = StreamIndex(paths)
+        paths["cam0001"] = {"source": "rtsp://other/x"}
+        paths["new"] = {"runOnInit": "ffmpeg -i rtsp://10.0.0.1/a"}
+        del paths["cam0002"]
+        for name in ("cam0001", "new", "cam0002"):
+            index.update(name, paths.get(name), name in paths)
+
+        rebuilt = StreamIndex(paths)
+        assert index.names == rebuilt.names
+        assert index.by_type == rebuilt.by_type
+        assert index.by_host == rebuilt.by_host
+
+    def test_bulk_update_matches_rebuild(self):
+        paths = make_paths(1000)
+        index = StreamIndex(paths)
+        changed = []
+        for i in range(0, 1000, 7):
+            name = f"cam{i:04d}"
+            if i % 2:
+                del paths[name]
+            else:
+                paths[name] = {"source": f"rtsp://moved{i % 3}/x"}
+            changed.append(name)
+        paths.update({f"added{i}": {"source": "rtsp://new/x"} for i in range(100)})
+        index.update_many(changed + [f"added{i}" for i in range(100)], paths)
+
+        rebuilt = StreamIndex(paths)
+        assert index.names == rebuilt.names
+        assert index.by_type == rebuilt.by_type
+        assert index.by_host == rebuilt.by_host
+
+
+class TestStreamsApi:
+    """Tests for /api/streams."""
+
+    def test_pagination_and_filters(self, api):
+        _, client = api
+        assert _pages(client) == sorted(make_paths(250))
+        assert _pages(client, type="runOnDemand", host="10.0.0.4") == [
+            f"cam{i:04d}" for i in range(4, 250, 20)
+        ]
+        assert _pages(client, prefix="cam01") == [
+            f"cam{i:04d}" for i in range(100, 200)
+        ]
+        assert client.get("/api/streams", params={"type": "bogus"}).status_code == 400
+        assert client.get("/api/streams", params={"cursor": "!!"}).status_code == 400
+
+    def test_conditional_get(self, api):
+        _, client = api
+        response = client.get("/api/streams/cam0001")
+        etag = response.headers["etag"]
+        assert response.json()["config"] == {"source": "rtsp://10.0.0.1/ch1"}
+        again = client.get("/api/streams/cam0001", headers={"If-None-Match": etag})
+        assert again.status_code == 304
+
+        # Changing another stream keeps this stream's tag
+        client.put("/api/streams/cam0002", json={"source": "rtsp://x/y"})
+        again = client.get("/api/streams/cam0001", headers={"If-None-Match": etag})
+        assert again.status_code == 304
+        listing = client.get("/api/streams", headers={"If-None-Match": etag})
+        assert listing.status_code == 200
+
+    def test_put_with_preconditions(self, api):
+        manager = api[0].manager
+        client = api[1]
+        etag = client.get("/api/streams/cam0001").headers["etag"]
+
+        response = client.put(
+            "/api/streams/cam0001",
+            json={"source": "rtsp://new/1"},
+            headers={"If-Match": etag},
+        )
+        assert response.status_code == 200
+        assert manager.data["paths.json"]["cam0001"] == {"source": "rtsp://new/1"}
+        # The old tag is stale now
+        stale = client.put(
+            "/api/streams/cam0001",
+            json={"source": "rtsp://x/1"},
+            headers={"If-Match": etag},
+        )
+        assert stale.status_code == 412
+        create_only = client.put(
+            "/api/streams/cam0001",
+            json={"source": "rtsp://x/1"},
+            headers={"If-None-Match": "*"},
+        )
+        assert create_only.status_code == 412
+
+        created = client.put("/api/streams/site/a/cam", json={"source": "rtsp://a/b"})
+        assert created.status_code == 201
+        assert client.get("/api/streams/site/a/cam").json()["host"] == "a"
+        invalid = client.put("/api/streams/bad", json={"source": "ftp://nope"})
+        assert invalid.status_code == 422
+        assert "bad" not in manager.data["paths.json"]
+        assert client.delete("/api/streams/site/a/cam").status_code == 204
+        assert client.get("/api/streams/site/a/cam").status_code == 404
+
+    def test_batch_upsert(self, api):
+        manager = api[0].manager
+        client = api[1]
+        body = {f"new{i}": {"source": f"rtsp://20.0.0.{i}/x"} for i in range(50)}
+        body["cam0001"] = None
+        response = client.patch("/api/streams", json=body)
+
+        assert response.json()["upserted"] == 50
+        assert response.json()["deleted"] == 1
+        assert "cam0001" not in manager.data["paths.json"]
+        assert _pages(client, host="20.0.0.7") == ["new7"]
+        # One undo step for the whole batch
+        manager.undo()
+        assert "cam0001" in manager.data["paths.json"]
+        assert _pages(client, prefix="new") == []
+
+        # All or nothing
+        bad = {"ok": {"source": "rtsp://a/b"}, "bad": {"source": "nope"}}
+        assert client.patch("/api/streams", json=bad).status_code == 422
+        assert "ok" not in manager.data["paths.json"]
+
+    def test_writes_are_saved(self, api, tmp_path):
+        client = api[1]
+        client.put("/api/streams/saved", json={"source": "rtsp://s/1"})
+        paths_file = tmp_path / "json" / "paths.json"
+        deadline = time.monotonic() + 5
+        while "saved" not in json.loads(paths_file.read_text()):
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+
+
+class TestSectionsApi:
+    """Tests for /api/sections."""
+
+    def test_read_and_replace(self, api):
+        manager = api[0].manager
+        client = api[1]
+        sections = client.get("/api/sections").json()
+        assert set(sections) == {"paths.json", "values_app.json"}
+
+        etag = sections["values_app.json"]["etag"]
+        assert client.get("/api/sections/values_app.json").json() == {
+            "logLevel": "info"
+        }
+        response = client.put(
+            "/api/sections/values_app.json",
+            json={"logLevel": "debug"},
+            headers={"If-Match": etag},
+        )
+        assert response.status_code == 200
+        assert manager.data["values_app.json"] == {"logLevel": "debug"}
+        assert response.json()["etag"] != etag
+        # paths.json is untouched, so its tag is too
+        assert (
+            client.get("/api/sections").json()["paths.json"]["etag"]
+            == sections["paths.json"]["etag"]
+        )
+        assert client.get("/api/sections/nope.json").status_code == 404
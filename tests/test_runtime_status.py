@@ -0,0 +1,105 @@
+"""Tests for the runtime path status poller against a local stub server."""
+
+import asyncio
+import json
+from functools import partial
+from pathlib import Path
+
+from src.clients.mtx_api_client import MtxApiClient
+from src.core.runtime_status import PathStatus, StatusPoller, diff_status
+from tests.mtx_stub import MtxStub
+
+# Recorded response of mediamtx /v3/paths/list
+RECORDED = json.loads((Path(__file__).parent / "data" / "paths_list.json").read_text())
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _list_requests(stub: MtxStub) -> int:
+    return sum(1 for _, path in stub.requests if path == "/v3/paths/list")
+
+
+class TestStatusPoller:
+    """Tests for StatusPoller with MtxApiClient.get_paths()."""
+
+    def test_pages_recorded_paths_and_caches_for_ttl(self):
+        """All pages are merged; polls within the TTL reuse one fetch."""
+        clock = FakeClock()
+
+        async def run(stub: MtxStub):
+            async with MtxApiClient(stub.url) as client:
+                # Two items per page: 3 recorded paths span 2 pages
+                fetch = partial(client.get_paths, page_size=2)
+                poller = StatusPoller(fetch, ttl=5.0, clock=clock)
+
+                first = await poller.get()
+                clock.now = 4.0
+                cached = await poller.get()
+                requests_cached = _list_requests(stub)
+                clock.now = 5.0
+                stub.paths[1] = {**stub.paths[1], "ready": True}
+                refreshed = await poller.get()
+                return first, cached, requests_cached, refreshed
+
+        with MtxStub() as stub:
+            stub.paths = list(RECORDED["items"])
+            first, cached, requests_cached, refreshed = asyncio.run(run(stub))
+
+            assert first == {
+                "cam01": PathStatus(True, 3, 184467221),
+                "cam02": PathStatus(False, 0, 0),
+                "transcode/hevc01": PathStatus(True, 0, 9823110),
+            }
+            assert cached is first
+            assert requests_cached == 2
+            assert refreshed["cam02"].ready is True
+            assert _list_requests(stub) == 4
+
+    def test_concurrent_sessions_share_one_fetch(self):
+        """Callers arriving while a fetch is in flight wait for it."""
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {item["name"]: item for item in RECORDED["items"]}
+
+        async def run():
+            poller = StatusPoller(fetch, ttl=1.0)
+            return await asyncio.gather(*(poller.get() for _ in range(20)))
+
+        results = asyncio.run(run())
+        assert len(calls) == 1
+        assert all(r == results[0] for r in results)
+
+    def test_failed_poll_keeps_last_status(self):
+        """A server error keeps the previous states and reports the error."""
+        clock = FakeClock()
+
+        async def run(stub: MtxStub):
+            async with MtxApiClient(stub.url, retries=0) as client:
+                poller = StatusPoller(client.get_paths, ttl=1.0, clock=clock)
+                before = await poller.get()
+                stub.fail_next = 1
+                clock.now = 2.0
+                after = await poller.get()
+                return before, after, poller.error
+
+        with MtxStub() as stub:
+            stub.paths = RECORDED["items"]
+            before, after, error = asyncio.run(run(stub))
+
+        assert after == before
+        assert "503" in error
+
+
+def test_diff_status_reports_changed_and_gone_paths():
+    old = {"a": PathStatus(True, 1, 10), "b": PathStatus(True, 0, 5)}
+    new = {"a": PathStatus(True, 1, 10), "c": PathStatus(False, 0, 0)}
+    assert diff_status(old, new) == {"c": PathStatus(False, 0, 0), "b": None}
@@ -0,0 +1,143 @@
+"""Tests for SaveScheduler."""
+
+import asyncio
+import threading
+
+from src.core.save_scheduler import SaveScheduler, get_save_lock
+
+
+class TestSaveScheduler:
+    """Tests for the coalescing save scheduler."""
+
+    def test_requests_during_save_are_coalesced(self):
+        """Requests made while a save runs collapse into one follow-up save."""
+        release = threading.Event()
+        calls = []
+        results = []
+
+        def slow_save():
+            calls.append(threading.current_thread().name)
+            release.wait(timeout=5)
+
+        scheduler = SaveScheduler(slow_save, on_done=results.append)
+
+        async def scenario():
+            first = asyncio.create_task(scheduler.request_save())
+            await asyncio.sleep(0.05)
+            assert scheduler.is_saving
+            for _ in range(4):
+                await scheduler.request_save()
+            release.set()
+            await first
+
+        asyncio.run(scenario())
+
+        assert len(calls) == 2
+        assert threading.main_thread().name not in calls
+        assert [r.coalesced for r in results] == [1, 4]
+        assert all(r.ok for r in results)
+
+    def test_error_is_reported(self):
+        """A failing save is reported to on_done instead of raising."""
+        results = []
+
+        def failing_save():
+            raise IOError("disk full")
+
+        scheduler = SaveScheduler(failing_save, on_done=results.append)
+        asyncio.run(scheduler.request_save())
+
+        assert results[0].ok is False
+        assert isinstance(results[0].error, IOError)
+        assert scheduler.last_result is results[0]
+
+    def test_autosave_after_quiet_period(self):
+        """Several touches result in one autosave once edits stop."""
+        calls = []
+        scheduler = SaveScheduler(lambda: calls.append(1), autosave_delay=0.05)
+
+        async def scenario():
+            for _ in range(3):
+                scheduler.touch()
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.2)
+
+        asyncio.run(scenario())
+        assert calls == [1]
+
+    def test_autosave_skipped_when_clean(self):
+        """Autosave does nothing if is_dirty reports no changes."""
+        calls = []
+        scheduler = SaveScheduler(
+            lambda: calls.append(1), autosave_delay=0.01, is_dirty=lambda: False
+        )
+
+        async def scenario():
+            scheduler.touch()
+            await asyncio.sleep(0.1)
+
+        asyncio.run(scenario())
+        assert calls == []
+
+    def test_prepare_runs_on_loop_and_result_is_saved(self):
+        """prepare() runs on the loop thread; save_func gets its result."""
+        threads = []
+
+        def prepare():
+            threads.append(threading.current_thread())
+            return 7
+
+        def save(snapshot):
+            threads.append(threading.current_thread())
+            return snapshot
+
+        results = []
+        scheduler = SaveScheduler(save, on_done=results.append, prepare=prepare)
+        asyncio.run(scheduler.request_save())
+
+        assert threads[0] is threading.main_thread()
+        assert threads[1] is not threading.main_thread()
+        assert results[0].revision == 7
+
+    def test_sessions_sharing_a_lock_never_overlap(self, tmp_path):
+        """Saves of two sessions on one json_dir run one after the other."""
+        lock = get_save_lock(tmp_path / "json")
+        assert lock is get_save_lock(tmp_path / "json" / ".." / "json")
+        log = []
+
+        def scheduler(name):
+            def prepare():
+                log.append(f"prepare {name}")
+                return name
+
+            def save(snapshot):
+                log.append(f"start {snapshot}")
+                threading.Event().wait(0.05)
+                log.append(f"end {snapshot}")
+
+            return SaveScheduler(save, prepare=prepare, lock=lock)
+
+        a, b = scheduler("a"), scheduler("b")
+
+        async def scenario():
+            await asyncio.gather(a.request_save(), b.request_save())
+            # A save cancelled while waiting for the lock does not keep it
+            holder = asyncio.create_task(b.request_save())
+            waiting = asyncio.create_task(a.request_save())
+            await asyncio.sleep(0.01)
+            waiting.cancel()
+            await holder
+            await asyncio.sleep(0.01)
+
+        asyncio.run(scenario())
+
+        assert log[:6] == [
+            "prepare a",
+            "start a",
+            "end a",
+            "prepare b",
+            "start b",
+            "end b",
+        ]
+        assert lock.acquire(blocking=False)
+        lock.release()
@@ -0,0 +1,110 @@
+"""Tests for the sharding planner."""
+
+import yaml
+
+from src.core.sharding import (
+    camera_host,
+    listen_ports,
+    moved_paths,
+    plan_shards,
+    port_step,
+    read_manifest,
+    write_shards,
+)
+
+
+def make_paths(cameras: int, streams: int = 2) -> dict:
+    """streams paths per camera; every fifth camera is transcoded."""
+    paths = {}
+    for cam in range(cameras):
+        for stream in range(streams):
+            url = f"rtsp://admin:pw@10.0.{cam // 250}.{cam % 250}:554/ch{stream}"
+            if cam % 5 == 0:
+                paths[f"cam{cam}_{stream}"] = {
+                    "runOnDemand": f"ffmpeg -i {url} -c:v libx264 -f rtsp "
+                    f"rtsp://localhost:$RTSP_PORT/$MTX_PATH"
+                }
+            else:
+                paths[f"cam{cam}_{stream}"] = {"source": url}
+    return paths
+
+
+SECTIONS = {
+    "values_app.json": {"logLevel": "info", "apiAddress": "127.0.0.1:9997"},
+    "values_rtsp.json": {
+        "rtspAddress": ":8554",
+        "rtpAddress": ":8000",
+        "rtcpAddress": ":8001",
+        "multicastRTPPort": 8002,
+    },
+    "values_hls.json": {"hlsAddress": ":8888"},
+    "values_webrtc.json": {"webrtcAddress": ":8889", "webrtcLocalTCPAddress": ""},
+    "values_pathDefaults.json": {"source": "publisher"},
+}
+
+
+def test_camera_host():
+    assert camera_host("a", {"source": "rtsp://u:p@cam1:554/x"}) == "cam1"
+    command = "ffmpeg -i rtsp://cam2/live -f rtsp rtsp://localhost:8554/a"
+    assert camera_host("a", {"runOnDemand": command}) == "cam2"
+    assert camera_host("a", {"source": "publisher"}) == "path:a"
+
+
+class TestPlanShards:
+    """Tests for plan_shards()."""
+
+    def test_camera_hosts_stay_together(self):
+        paths = make_paths(300)
+        plan = plan_shards(paths, 4)
+
+        assert plan.assignment.keys() == paths.keys()
+        for cam in range(300):
+            assert plan.assignment[f"cam{cam}_0"] == plan.assignment[f"cam{cam}_1"]
+
+    def test_loads_weighted_and_bounded(self):
+        plan = plan_shards(make_paths(1000), 4)
+
+        # 200 transcoded cameras * 2 paths * 10 + 800 * 2 * 1
+        assert sum(plan.loads.values()) == 5600
+        assert max(plan.loads.values()) <= 1.25 * 5600 / 4
+
+    def test_adding_instance_moves_few_paths(self):
+        paths = make_paths(1000)
+        old = plan_shards(paths, 4).assignment
+        new = plan_shards(paths, 5).assignment
+
+        moved = moved_paths(old, new)
+        # Ideally a fifth of the paths move to the new instance
+        assert len(moved) <= 0.3 * len(paths)
+        assert sum(new[name] == "shard-4" for name in moved) >= 0.8 * len(moved)
+
+    def test_deterministic(self):
+        paths = make_paths(50)
+        assert plan_shards(paths, 3) == plan_shards(dict(reversed(paths.items())), 3)
+
+
+def test_port_step_avoids_collisions():
+    assert port_step([8554, 8000, 8001], 3) == 10
+    # 8000 + 2 * 10 would hit 8020
+    assert port_step([8000, 8020], 3) == 12
+
+
+def test_write_shards(tmp_path):
+    sections = {**SECTIONS, "paths.json": make_paths(40)}
+    plan = plan_shards(sections["paths.json"], 3)
+    files = write_shards(sections, plan, tmp_path)
+
+    configs = {name: yaml.safe_load(f.read_text()) for name, f in files.items()}
+    assert {"rtspAddress", "hlsAddress", "webrtcAddress"} <= configs["shard-2"].keys()
+    ports = [
+        config[key]
+        for config in configs.values()
+        for key in ("rtspAddress", "rtpAddress", "rtcpAddress", "hlsAddress")
+        + ("webrtcAddress", "apiAddress", "multicastRTPPort")
+    ]
+    assert len(set(ports)) == len(ports) == 3 * len(listen_ports(sections))
+    assert configs["shard-1"]["rtspAddress"] == ":8564"
+    assert configs["shard-1"]["apiAddress"] == "127.0.0.1:10007"
+    assert configs["shard-0"]["webrtcLocalTCPAddress"] == ""
+    assert sum(len(c["paths"]) for c in configs.values()) == 80
+    assert read_manifest(tmp_path) == plan.assignment
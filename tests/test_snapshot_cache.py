@@ -0,0 +1,76 @@
+"""Tests for the on-disk snapshot cache used by MtxConfigManager.load_data."""
+
+import json
+import os
+
+import pytest
+
+from src.core.snapshot_cache import SnapshotCache
+from src.mtx_manager import MtxConfigManager
+
+
+@pytest.fixture
+def json_dir(tmp_path):
+    """Temporary section directory."""
+    json_dir = tmp_path / "json"
+    json_dir.mkdir()
+    (json_dir / "paths.json").write_text(
+        json.dumps({"cam1": {"source": "rtsp://a", "rtspTransport": "tcp"}})
+    )
+    (json_dir / "values_app.json").write_text(json.dumps({"logLevel": "info"}))
+    return json_dir
+
+
+def _load(json_dir):
+    manager = MtxConfigManager(json_dir=json_dir)
+    manager.load_data()
+    return manager
+
+
+class TestSnapshotCache:
+    """Tests for SnapshotCache."""
+
+    def test_cold_load_writes_cache(self, json_dir):
+        """First load decodes files and writes the snapshot."""
+        manager = _load(json_dir)
+        assert manager.data["values_app.json"] == {"logLevel": "info"}
+        assert manager.data["paths.json_enabled"] is True
+        assert set(SnapshotCache(json_dir).read()) == {"paths.json", "values_app.json"}
+
+    def test_warm_load_skips_decoding(self, json_dir, monkeypatch):
+        """Unchanged sections are restored without parsing or validating."""
+        cold = _load(json_dir)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("section decoded on warm start")
+
+        monkeypatch.setattr(MtxConfigManager, "_decode_section", fail)
+        warm = _load(json_dir)
+        assert warm.data == cold.data
+        assert warm.paths_config.get_stream("cam1").rtspTransport == "tcp"
+
+    def test_change_with_same_stat_invalidates(self, json_dir):
+        """A content change is detected even if mtime and size are unchanged."""
+        _load(json_dir)
+        app_file = json_dir / "values_app.json"
+        st = app_file.stat()
+        app_file.write_text(json.dumps({"logLevel": "warn"}))
+        os.utime(app_file, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+        manager = _load(json_dir)
+        assert manager.data["values_app.json"] == {"logLevel": "warn"}
+
+    def test_cached_validation_errors(self, json_dir, caplog):
+        """Validation errors are kept in the snapshot and reported on warm start."""
+        (json_dir / "paths.json").write_text(json.dumps({"bad": {"source": "x"}}))
+        _load(json_dir)
+        caplog.clear()
+        _load(json_dir)
+        assert "Validation error in paths.json" in caplog.text
+
+    def test_corrupt_cache_is_ignored(self, json_dir):
+        """An unreadable cache file falls back to a cold load."""
+        cache = SnapshotCache(json_dir)
+        cache.cache_file.write_bytes(b"not a pickle")
+        manager = _load(json_dir)
+        assert manager.data["values_app.json"] == {"logLevel": "info"}
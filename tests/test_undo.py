@@ -0,0 +1,117 @@
+"""Tests for the undo/redo stack."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.clients.config_clients import get_config_client
+from src.core.undo import UndoStack
+from src.mtx_manager import MtxConfigManager
+from src.utils.json_utils import DELETE, SET, apply_edit
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """Manager loaded from a temporary section directory."""
+    json_dir = tmp_path / "json"
+    json_dir.mkdir()
+    (json_dir / "paths.json").write_text(
+        json.dumps(
+            {
+                "cam1": {"source": "rtsp://a", "runOnDemand": "ffmpeg -i u:p@x"},
+                "cam2": {"source": "rtsp://b", "runOnDemand": "ffmpeg -i u:p@y"},
+            }
+        )
+    )
+    (json_dir / "auth.json").write_text(
+        json.dumps({"authInternalUsers": [{"user": "a"}, {"user": "b"}]})
+    )
+
+    get_config_client.cache_clear()
+    mock_settings = MagicMock()
+    mock_settings.MTX_JSON_DIR = json_dir
+    with patch("src.clients.json_client.get_settings_func", return_value=mock_settings):
+        manager = MtxConfigManager(json_dir=json_dir)
+        manager.load_data()
+        yield manager
+    get_config_client.cache_clear()
+
+
+def _ui_edit(manager, op, path, value=None):
+    """Apply an edit the way the UI does and report it to the manager."""
+    old_value = apply_edit(manager.data, op, path, value)
+    manager.record_edit(op, path, value, old_value)
+
+
+class TestUndoStack:
+    """Tests for UndoStack."""
+
+    def test_typing_is_merged(self):
+        """Consecutive SETs of one field are undone in one step."""
+        stack = UndoStack()
+        stack.record(SET, ("a.json", "x"), "ab", "a")
+        stack.record(SET, ("a.json", "x"), "abc", "ab")
+
+        assert [tuple(e) for e in stack.pop_undo()] == [
+            (SET, ("a.json", "x"), "a", "abc")
+        ]
+        assert not stack.can_undo
+
+    def test_depth_limit(self):
+        """Only the newest max_depth steps are kept."""
+        stack = UndoStack(max_depth=2)
+        for i in range(5):
+            stack.record(SET, ("a.json", f"k{i}"), i)
+
+        assert stack.pop_undo()[0].path == ("a.json", "k4")
+        assert stack.pop_undo()[0].path == ("a.json", "k3")
+        assert stack.pop_undo() is None
+
+
+class TestManagerUndo:
+    """Undo/redo through MtxConfigManager."""
+
+    def test_delete_stream(self, manager):
+        """A deleted stream comes back with the same object and redo removes it."""
+        stream = manager.data["paths.json"]["cam1"]
+        manager.remove_stream("cam1")
+
+        assert manager.undo() == ["paths.json"]
+        assert manager.data["paths.json"]["cam1"] is stream
+        manager.redo()
+        assert "cam1" not in manager.data["paths.json"]
+
+    def test_bulk_replacement_is_one_step(self, manager):
+        """Edits made in a group are reverted together."""
+        with manager.undo_stack.group():
+            for name in ("cam1", "cam2"):
+                path = ("paths.json", name, "runOnDemand")
+                value = manager.data["paths.json"][name]["runOnDemand"]
+                _ui_edit(manager, SET, path, value.replace("u:p", "v:q"))
+
+        manager.undo()
+        assert manager.data["paths.json"]["cam1"]["runOnDemand"] == "ffmpeg -i u:p@x"
+        assert manager.data["paths.json"]["cam2"]["runOnDemand"] == "ffmpeg -i u:p@y"
+        assert not manager.undo_stack.can_undo
+
+    def test_delete_user_restores_position(self, manager):
+        """Undoing a list deletion inserts the item back at its index."""
+        _ui_edit(manager, DELETE, ("auth.json", "authInternalUsers", 0))
+        manager.undo()
+
+        assert manager.data["auth.json"]["authInternalUsers"] == [
+            {"user": "a"},
+            {"user": "b"},
+        ]
+
+    def test_ui_echo_is_not_recorded(self, manager):
+        """A bound field reflecting an undo does not start a new step."""
+        _ui_edit(manager, SET, ("paths.json", "cam1", "source"), "rtsp://x")
+        manager.undo()
+        # The bound input reports the value written by the undo
+        manager.record_edit(SET, ("paths.json", "cam1", "source"), "rtsp://a", "x")
+
+        assert manager.undo_stack.can_redo
+        manager.redo()
+        assert manager.data["paths.json"]["cam1"]["source"] == "rtsp://x"
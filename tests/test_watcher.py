@@ -0,0 +1,174 @@
+"""Tests for JsonDirWatcher and incremental hot reload."""
+
+import json
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.clients.config_clients import get_config_client
+from src.core.watcher import JsonDirWatcher
+from src.mtx_manager import MtxConfigManager
+from src.utils.json_utils import SET
+
+
+def _touch(path, content):
+    """Write JSON and bump mtime so the change is visible to stat polling."""
+    path.write_text(json.dumps(content))
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """Manager loaded from a temporary JSON directory."""
+    json_dir = tmp_path / "json"
+    json_dir.mkdir()
+    (json_dir / "paths.json").write_text(json.dumps({"cam1": {"source": "rtsp://a"}}))
+    (json_dir / "values_app.json").write_text(json.dumps({"logLevel": "info"}))
+
+    get_config_client.cache_clear()
+    mock_settings = MagicMock()
+    mock_settings.MTX_JSON_DIR = json_dir
+    with patch("src.clients.json_client.get_settings_func", return_value=mock_settings):
+        manager = MtxConfigManager(json_dir=json_dir)
+        manager.load_data()
+        yield manager
+    get_config_client.cache_clear()
+
+
+class TestJsonDirWatcher:
+    """Tests for JsonDirWatcher."""
+
+    def test_no_changes(self, manager):
+        """Polling an unchanged directory reloads nothing."""
+        watcher = JsonDirWatcher(manager)
+        assert watcher.poll() == ([], [])
+
+    def test_reloads_only_changed_section(self, manager):
+        """Only the modified file is reloaded and observed."""
+        watcher = JsonDirWatcher(manager)
+        observer = MagicMock(__name__="observer")
+        manager.register_observer(observer)
+        app_section = manager.data["values_app.json"]
+
+        _touch(manager.json_dir / "values_app.json", {"logLevel": "debug"})
+        reloaded, conflicts = watcher.poll()
+
+        assert reloaded == ["values_app.json"]
+        assert conflicts == []
+        # Updated in place so UI bindings stay valid
+        assert app_section is manager.data["values_app.json"]
+        assert app_section == {"logLevel": "debug"}
+        observer.assert_called_once_with("values_app.json", {"logLevel": "debug"})
+
+    def test_reports_collision_with_unsaved_edits(self, manager):
+        """A stream edited locally and removed on disk is a conflict."""
+        watcher = JsonDirWatcher(manager)
+        manager.data["paths.json"]["cam1"]["source"] = "rtsp://local"
+
+        _touch(manager.json_dir / "paths.json", {"cam2": {"source": "rtsp://b"}})
+        reloaded, conflicts = watcher.poll()
+
+        assert reloaded == ["paths.json"]
+        assert conflicts == ["paths.json"]
+        # The local edit is kept until the conflict is resolved
+        assert manager.data["paths.json"]["cam1"]["source"] == "rtsp://local"
+        assert [c.path for c in manager.conflicts["paths.json"]] == [
+            ("paths.json", "cam1")
+        ]
+        assert manager.paths_config.get_stream("cam2") is not None
+
+    def test_merges_non_overlapping_changes(self, manager):
+        """Disk changes to other fields and streams merge into unsaved edits."""
+        watcher = JsonDirWatcher(manager)
+        stream = manager.data["paths.json"]["cam1"]
+        stream["source"] = "rtsp://local"
+        manager.record_edit(
+            SET, ("paths.json", "cam1", "source"), "rtsp://local", "rtsp://a"
+        )
+
+        _touch(
+            manager.json_dir / "paths.json",
+            {
+                "cam1": {"source": "rtsp://a", "sourceOnDemand": True},
+                "cam2": {"source": "rtsp://b"},
+            },
+        )
+        assert watcher.poll() == (["paths.json"], [])
+
+        assert manager.data["paths.json"] == {
+            "cam1": {"source": "rtsp://local", "sourceOnDemand": True},
+            "cam2": {"source": "rtsp://b"},
+        }
+        # Merged field by field: bindings and the local undo step survive
+        assert manager.data["paths.json"]["cam1"] is stream
+        assert manager.is_section_dirty("paths.json")
+        manager.undo()
+        assert stream["source"] == "rtsp://a"
+
+    def test_same_content_is_not_reloaded(self, manager):
+        """Rewriting identical content (e.g. our own save) is ignored."""
+        watcher = JsonDirWatcher(manager)
+        _touch(manager.json_dir / "values_app.json", {"logLevel": "info"})
+        assert watcher.poll() == ([], [])
+
+
+def _save(manager):
+    """Save with the JSON part of YAMLClient only."""
+    json_client = get_config_client("JSON")
+    mock_yaml = MagicMock()
+    mock_yaml.save_config.side_effect = json_client.save_config
+    clients = {"JSON": json_client, "YAML": mock_yaml}
+    with patch("src.mtx_manager.get_config_client", side_effect=clients.get):
+        manager.save_data()
+
+
+def _edit_source(manager, value):
+    old = manager.data["paths.json"]["cam1"]["source"]
+    manager.data["paths.json"]["cam1"]["source"] = value
+    manager.record_edit(SET, ("paths.json", "cam1", "source"), value, old)
+
+
+class TestMergeOnSave:
+    """Saving merges section files changed by other tools."""
+
+    def test_save_merges_only_changed_files(self, manager):
+        """Unchanged files are not re-read; external changes are kept."""
+        manager.history = None
+        _edit_source(manager, "rtsp://local")
+        _touch(
+            manager.json_dir / "paths.json",
+            {"cam1": {"source": "rtsp://a"}, "cam2": {"source": "rtsp://b"}},
+        )
+
+        json_client = get_config_client("JSON")
+        with patch.object(
+            json_client, "load_section", wraps=json_client.load_section
+        ) as load_section:
+            _save(manager)
+        assert [c.args[0] for c in load_section.call_args_list] == ["paths.json"]
+
+        assert json.loads((manager.json_dir / "paths.json").read_text()) == {
+            "cam1": {"source": "rtsp://local"},
+            "cam2": {"source": "rtsp://b"},
+        }
+        assert manager.last_merge == (["paths.json"], [])
+        assert not manager.has_unsaved_changes()
+
+    def test_conflicting_section_is_held_until_resolved(self, manager):
+        """A conflicting section keeps its disk content until resolved."""
+        manager.history = None
+        _edit_source(manager, "rtsp://local")
+        _touch(manager.json_dir / "paths.json", {"cam1": {"source": "rtsp://other"}})
+
+        _save(manager)
+        assert manager.last_merge == (["paths.json"], ["paths.json"])
+        disk = json.loads((manager.json_dir / "paths.json").read_text())
+        assert disk == {"cam1": {"source": "rtsp://other"}}
+
+        # Keep the local value
+        assert manager.resolve_conflicts() == []
+        _save(manager)
+        disk = json.loads((manager.json_dir / "paths.json").read_text())
+        assert disk == {"cam1": {"source": "rtsp://local"}}
@@ -0,0 +1,93 @@
+"""Tests for the multi-instance workspace."""
+
+import json
+import os
+
+import pytest
+import yaml
+
+from src.core.workspace import Workspace, merge_sections
+
+
+def _write(path, content) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(content), encoding="utf-8")
+
+
+def _bump(path) -> None:
+    """Change a file's mtime so stat-based change detection sees it."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    common = tmp_path / "common"
+    _write(common / "values_app.json", {"logLevel": "info", "api": True})
+    _write(common / "values_rtsp.json", {"rtspAddress": ":8554", "rtsp": True})
+    _write(common / "paths.json", {"shared": {"source": "rtsp://shared"}})
+    for i in range(3):
+        _write(
+            tmp_path / "instances" / f"edge{i}" / "values_rtsp.json",
+            {"rtspAddress": f":{8554 + i * 10}"},
+        )
+    _write(
+        tmp_path / "instances" / "edge1" / "paths.json",
+        {"cam1": {"source": "rtsp://cam1"}},
+    )
+    ws = Workspace(tmp_path, workers=2)
+    yield ws
+    ws.close()
+
+
+def _rendered(ws: Workspace, name: str) -> dict:
+    return yaml.safe_load(ws.output_file(name).read_text(encoding="utf-8"))
+
+
+def test_merge_sections_overlays_keys():
+    common = {"paths.json": {"a": {"source": "x"}}, "auth.json": [1]}
+    override = {"paths.json": {"b": {"source": "y"}}, "auth.json": [2]}
+    assert merge_sections(common, override) == {
+        "paths.json": {"a": {"source": "x"}, "b": {"source": "y"}},
+        "auth.json": [2],
+    }
+
+
+class TestWorkspaceRender:
+    """Tests for Workspace.render()."""
+
+    def test_renders_instances_with_overrides(self, workspace):
+        report = workspace.render()
+
+        assert report.rendered == ["edge0", "edge1", "edge2"]
+        assert not report.errors
+        edge1 = _rendered(workspace, "edge1")
+        assert edge1["rtspAddress"] == ":8564"
+        assert edge1["rtsp"] is True
+        assert edge1["logLevel"] == "info"
+        assert set(edge1["paths"]) == {"shared", "cam1"}
+        assert set(_rendered(workspace, "edge2")["paths"]) == {"shared"}
+        assert workspace.hashes.keys() == {"edge0", "edge1", "edge2"}
+
+    def test_rerenders_only_changed_instances(self, workspace, tmp_path):
+        workspace.render()
+        assert workspace.render().rendered == []
+
+        override = tmp_path / "instances" / "edge2" / "values_rtsp.json"
+        _write(override, {"rtspAddress": ":9999"})
+        _bump(override)
+        report = workspace.render()
+        assert report.rendered == ["edge2"]
+        assert report.unchanged == ["edge0", "edge1"]
+        assert _rendered(workspace, "edge2")["rtspAddress"] == ":9999"
+
+        # A common section is an input of every instance
+        _bump(tmp_path / "common" / "values_app.json")
+        assert workspace.render().rendered == ["edge0", "edge1", "edge2"]
+
+    def test_state_survives_restart(self, workspace, tmp_path):
+        workspace.render()
+        restarted = Workspace(tmp_path)
+        assert restarted.stale() == []
+        workspace.output_file("edge0").unlink()
+        assert restarted.stale() == ["edge0"]